@@ -1,4 +1,11 @@
+import time
+
+# time-to-ready 는 프로세스가 모듈을 불러오기 시작한 시점부터 잰다.
+STARTED_AT = time.monotonic()
+
 import asyncio
+import hashlib
+import json
 
 import discord
 from discord.ext import commands
@@ -7,10 +14,30 @@ from dotenv import load_dotenv
 import os
 import platform
 
+# core.config 는 import 시점에 환경변수를 읽으므로 core 보다 먼저 .env 를 불러온다.
+load_dotenv()
+
+from core.config import (
+    CLUSTER_ID,
+    CLUSTER_IPC_PATH,
+    LOOP_WATCHDOG,
+    LOOP_WATCHDOG_INTERVAL_MS,
+    LOOP_WATCHDOG_STACK_SAMPLE_RATE,
+    LOOP_WATCHDOG_THRESHOLD_MS,
+    METRICS_HOST,
+    METRICS_PORT,
+    SHARD_COUNT,
+    SHARD_IDS,
+)
+from core.cluster import ClusterClient, IpcError
 from core.local import LocalCore
-from core.network.youtube.youtube_service import YoutubeService
+from core.local.meta import MetaDataSource
+from core.metrics import LoopWatchdog, MetricsServer, ShardMetrics, metrics, tracer
+from core.network.resolver_cassette import get_resolver_cassette
+from core.util import logger, parse_shard_ids
+
+IMPORTED_AT = time.monotonic()
 
-load_dotenv()
 description = '''made 바비호바#6800'''
 
 intents = discord.Intents.default()
@@ -24,26 +51,153 @@ intents.voice_states = True
 if platform.system() == "Darwin":
     discord.opus.load_opus(os.environ.get('OPUS_PATH'))
 
-bot = commands.Bot(command_prefix='-', description=description, intents=intents)
+SHARDED = SHARD_COUNT != ""
+
+# 개발용 길드. 전역 명령어를 복사해 두어 sync 후 바로 보이게 한다.
+DEV_GUILD_ID = 1074259285825032213
+COMMAND_TREE_HASH_KEY = "command_tree_hash"
+
+STARTUP_SECONDS = metrics.gauge("startup_seconds", "Seconds from process start to each startup phase", ("phase",))
+COG_RELOAD_SECONDS = metrics.histogram("cog_reload_seconds", "Extension (re)load duration", ("cog",))
+
+
+class MusicBot(commands.AutoShardedBot if SHARDED else commands.Bot):
+    metrics_server = None
+    # Music cog 가 처음 로드될 때 만들어지고(core.audio.get_audio_service) reload 후에도 유지된다.
+    audio_service = None
+    # 길드별 진행 중인 플레이리스트/곡 목록 추가 작업과 큐 세대. Music cog 가 만들고 reload 후에도 유지된다.
+    playlist_imports = None
+    queue_generations = None
+    ready_at = None
+    tree_synced = False
+    shard_metrics = ShardMetrics(metrics) if SHARDED else None
+    # cluster.py 가 띄운 worker 일 때만 supervisor 와 연결한다.
+    cluster = ClusterClient(CLUSTER_IPC_PATH, int(CLUSTER_ID)) if CLUSTER_ID else None
+    loop_watchdog = LoopWatchdog(
+        metrics,
+        interval=LOOP_WATCHDOG_INTERVAL_MS / 1000,
+        threshold=LOOP_WATCHDOG_THRESHOLD_MS / 1000,
+        stack_sample_rate=LOOP_WATCHDOG_STACK_SAMPLE_RATE,
+    )
+
+    async def setup_hook(self):
+        if METRICS_PORT:
+            self.metrics_server = MetricsServer(metrics, METRICS_HOST, METRICS_PORT)
+            await self.metrics_server.start()
+        if LOOP_WATCHDOG:
+            self.loop_watchdog.start()
+        if self.shard_metrics is not None:
+            self.shard_metrics.install(self)
+        if self.cluster is not None:
+            self.cluster.handlers["stats"] = self.cluster_stats
+            await self.cluster.connect()
+
+        # setup_hook 은 로그인 직후 한 번만 불린다. on_ready 는 재연결 때마다 다시 불리므로
+        # 테이블 생성, cog 로드, 명령어 sync 는 여기서 한다.
+        await LocalCore.init_table()
+        await self.load_cogs()
+        STARTUP_SECONDS.labels("cogs_loaded").set(time.monotonic() - STARTED_AT)
+        # 클러스터에서는 같은 명령어 트리를 worker 마다 sync 할 필요가 없으므로 0번만 한다.
+        if self.cluster is None or self.cluster.cluster_id == 0:
+            self.tree_synced = await self.sync_command_tree()
+
+    async def load_cogs(self):
+        for cog in sorted(os.listdir("./cogs")):
+            if cog.endswith(".py"):
+                if cog == "__init__.py":
+                    continue
+                try:
+                    await self.load_extension(f'cogs.{cog.lower()[:-3]}')
+                    print(f'{cog} cog loaded.')
+                except Exception as e:
+                    print(f'Failed to load {cog} cog: {e}')
+
+    def command_tree_hash(self) -> str:
+        payload = [command.to_dict(self.tree) for command in self.tree.get_commands()]
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    async def sync_command_tree(self, force: bool = False) -> bool:
+        """명령어 정의가 마지막 sync 때와 같으면 sync 를 건너뜁니다. sync 는 rate limit 이 빡빡하다."""
+        self.tree.copy_global_to(guild=discord.Object(id=DEV_GUILD_ID))
+        digest = self.command_tree_hash()
+        if not force and await MetaDataSource.get(COMMAND_TREE_HASH_KEY) == digest:
+            logger.info("command_tree_sync_skipped", hash=digest[:12])
+            return False
+        await self.tree.sync()
+        await MetaDataSource.set(COMMAND_TREE_HASH_KEY, digest)
+        logger.info("command_tree_synced", hash=digest[:12], commands=len(self.tree.get_commands()))
+        return True
+
+    async def cluster_stats(self, _=None):
+        music = self.get_cog("Music")
+        audio_service = music.audio_service if music else None
+        latency = self.latency
+        return {
+            "pid": os.getpid(),
+            "guilds": len(self.guilds),
+            "latency_ms": round(latency * 1000, 1) if latency == latency and latency != float("inf") else None,
+            "active_guilds": audio_service.active_guild_count() if audio_service else 0,
+            "playing": audio_service.playing_guild_count() if audio_service else 0,
+            "queued_tracks": audio_service.queued_track_count() if audio_service else 0,
+            "loop_lag_p99_ms": round(self.loop_watchdog.lag_percentiles()[2] * 1000, 1),
+        }
+
+    async def close(self):
+        await self.loop_watchdog.stop()
+        if self.cluster is not None:
+            await self.cluster.close()
+        if self.metrics_server is not None:
+            await self.metrics_server.close()
+        # write-behind 큐에 남은 로컬 DB 쓰기를 커밋한 뒤 종료한다.
+        await LocalCore.close()
+        # record 모드에서 아직 저장하지 않은 녹화 항목을 남긴다.
+        await get_resolver_cassette().close()
+        await super().close()
+
+
+shard_options = {}
+if SHARDED:
+    shard_options["shard_count"] = None if SHARD_COUNT == "auto" else int(SHARD_COUNT)
+    shard_options["shard_ids"] = parse_shard_ids(SHARD_IDS)
+
+bot = MusicBot(command_prefix='-', description=description, intents=intents, **shard_options)
 
 @bot.event
 async def on_ready():
-    await LocalCore.init_table()
-    for cog in os.listdir("./cogs"):
-        if cog.endswith(".py"):
-            if cog == "__init__.py":
-                continue
-            try:
-                await bot.load_extension(f'cogs.{cog.lower()[:-3]}')
-                print(f'{cog} cog loaded.')
-            except Exception as e:
-                print(f'Failed to load {cog} cog: {e}')
-
-    bot.tree.copy_global_to(guild=discord.Object(id=1074259285825032213))
-    await bot.tree.sync()
+    if bot.ready_at is None:
+        bot.ready_at = time.monotonic()
+        STARTUP_SECONDS.labels("imports").set(IMPORTED_AT - STARTED_AT)
+        STARTUP_SECONDS.labels("ready").set(bot.ready_at - STARTED_AT)
+        logger.info(
+            "startup_ready",
+            time_to_ready_ms=round((bot.ready_at - STARTED_AT) * 1000, 1),
+            imports_ms=round((IMPORTED_AT - STARTED_AT) * 1000, 1),
+            tree_synced=bot.tree_synced,
+            guilds=len(bot.guilds),
+        )
+    else:
+        logger.info("gateway_ready_again", guilds=len(bot.guilds))
     print(f'Logged in as {bot.user} (ID: {bot.user.id})')
     print('------')
 
+async def reload_extension(name: str):
+    """
+    확장을 (다시) 불러오고 걸린 시간과 그동안 끝난 검색 수를 돌려줍니다.
+    AudioService 는 봇에 붙어 있으므로 reload 는 큐와 재생을 건드리지 않고 검색도 일으키지 않아야 한다.
+    같은 구간에 다른 요청의 검색이 끝나면 함께 세어진다.
+    """
+    resolutions_before = metrics.total("resolve_seconds")
+    started = time.perf_counter()
+    if name in bot.extensions:
+        await bot.reload_extension(name)
+    else:
+        await bot.load_extension(name)
+    elapsed = time.perf_counter() - started
+    resolutions = int(metrics.total("resolve_seconds") - resolutions_before)
+    COG_RELOAD_SECONDS.labels(name).observe(elapsed)
+    logger.info("cog_reload", cog=name, elapsed_ms=round(elapsed * 1000, 1), resolutions=resolutions)
+    return elapsed, resolutions
+
 @bot.command("reload")
 @commands.is_owner()
 async def reload_cog(ctx, cog: str = "all"):
@@ -55,11 +209,8 @@ async def reload_cog(ctx, cog: str = "all"):
                 continue
             name = f'cogs.{filename.lower()[:-3]}'
             try:
-                if name in bot.extensions:
-                    await bot.reload_extension(name)
-                else:
-                    await bot.load_extension(name)
-                loaded.append(filename)
+                elapsed, resolutions = await reload_extension(name)
+                loaded.append(f"{filename} ({elapsed * 1000:.1f}ms, resolutions={resolutions})")
             except Exception as exc:
                 failed.append((filename, str(exc)))
         await ctx.send(f"reloaded: {', '.join(loaded) if loaded else 'none'}")
@@ -69,14 +220,103 @@ async def reload_cog(ctx, cog: str = "all"):
 
     name = f'cogs.{cog.lower()}'
     try:
-        if name in bot.extensions:
-            await bot.reload_extension(name)
-        else:
-            await bot.load_extension(name)
-        await ctx.send(f"reloaded: {cog}")
+        elapsed, resolutions = await reload_extension(name)
+        await ctx.send(f"reloaded: {cog} ({elapsed * 1000:.1f}ms, resolutions={resolutions})")
     except Exception as exc:
         await ctx.send(f"reload failed: {cog} ({exc})")
 
+@bot.command("sync")
+@commands.is_owner()
+async def sync_tree(ctx, force: str = ""):
+    synced = await bot.sync_command_tree(force=force == "force")
+    await ctx.send("command tree synced" if synced else "command tree unchanged (use `-sync force`)")
+
+@bot.command("metrics")
+@commands.is_owner()
+async def metrics_summary(ctx):
+    summary = metrics.summary()
+    # 디스코드 메시지 길이 제한(2000자)에 맞춰 자른다.
+    if len(summary) > 1900:
+        summary = summary[:1900] + "\n..."
+    await ctx.send(f"```\n{summary}\n```")
+
+@bot.command("watchdog")
+@commands.is_owner()
+async def loop_watchdog(ctx, action: str = "status", threshold_ms: float = None):
+    watchdog = bot.loop_watchdog
+    if action == "on":
+        if threshold_ms is not None:
+            await watchdog.stop()
+            watchdog.threshold = threshold_ms / 1000
+        watchdog.start()
+    elif action == "off":
+        await watchdog.stop()
+    elif action != "status":
+        return await ctx.send("usage: -watchdog [on|off|status] [threshold_ms]")
+    await ctx.send(f"```\n{watchdog.status()[:1900]}\n```")
+
+@bot.command("trace")
+@commands.is_owner()
+async def trace_waterfall(ctx, trace_id: str = "slowest"):
+    if trace_id == "list":
+        lines = [
+            f"#{trace.trace_id} {trace.name} {trace.duration * 1000:.1f}ms spans={len(trace.spans)}"
+            for trace in tracer.slowest(15)
+        ]
+        return await ctx.send("```\n" + ("\n".join(lines) or "no traces") + "\n```")
+
+    if trace_id == "slowest":
+        slowest = tracer.slowest(1)
+        trace = slowest[0] if slowest else None
+    else:
+        trace = tracer.get(int(trace_id)) if trace_id.isdigit() else None
+    if trace is None:
+        return await ctx.send("usage: -trace [slowest|list|<trace_id>]")
+    await ctx.send(f"```\n{tracer.waterfall(trace)[:1900]}\n```")
+
+@bot.command("shards")
+@commands.is_owner()
+async def shard_status(ctx):
+    if bot.shard_metrics is None:
+        return await ctx.send("sharding is off (SHARD_COUNT is empty)")
+    music = bot.get_cog("Music")
+    active_players = {}
+    partitions = getattr(music.audio_service, "partitions", {}) if music else {}
+    for shard_id, partition in partitions.items():
+        active_players[shard_id] = partition.playing_guild_count()
+    await ctx.send(f"```\n{bot.shard_metrics.status(bot, active_players)[:1900]}\n```")
+
+@bot.command("cluster")
+@commands.is_owner()
+async def cluster_status(ctx, action: str = "status", cluster_id: int = None):
+    if bot.cluster is None:
+        return await ctx.send("cluster mode is off (run with `python cluster.py`)")
+    try:
+        if action == "restart" and cluster_id is not None:
+            return await ctx.send(await bot.cluster.request("restart", {"cluster_id": cluster_id}))
+        if action != "status":
+            return await ctx.send("usage: -cluster [status|restart <cluster_id>]")
+        workers = await bot.cluster.request("cluster_stats")
+    except (IpcError, asyncio.TimeoutError) as exc:
+        return await ctx.send(f"cluster request failed: {exc!r}")
+
+    lines = []
+    for worker in workers:
+        head = f"#{worker['cluster_id']} shards={worker['shards']} up={worker['uptime_s']:.0f}s restarts={worker['restarts']}"
+        if "error" in worker:
+            lines.append(f"{head} error={worker['error']}")
+            continue
+        lines.append(
+            f"{head} pid={worker['pid']} guilds={worker['guilds']} playing={worker['playing']} "
+            f"queued={worker['queued_tracks']} latency={worker['latency_ms']}ms lag_p99={worker['loop_lag_p99_ms']}ms"
+        )
+    healthy = [worker for worker in workers if "error" not in worker]
+    lines.append(
+        f"total workers={len(workers)} guilds={sum(w['guilds'] for w in healthy)} "
+        f"playing={sum(w['playing'] for w in healthy)} (this is #{bot.cluster.cluster_id})"
+    )
+    await ctx.send("```\n" + "\n".join(lines)[:1900] + "\n```")
+
 @bot.event
 async def on_command_error(ctx, error):
     if isinstance(error, commands.CommandNotFound):
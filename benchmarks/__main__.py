@@ -0,0 +1,35 @@
+import os
+
+# 오프라인 벤치마크는 항상 yt-dlp 검색 경로(가짜 YoutubeService)를 사용한다.
+os.environ["AUDIO_BACKEND"] = "ffmpeg"
+
+import argparse
+import asyncio
+import json
+
+from benchmarks.harness import format_results, run_scenario
+from benchmarks.scenarios import SCENARIOS
+
+
+async def main(args: argparse.Namespace) -> None:
+    names = args.scenarios or list(SCENARIOS)
+    results = []
+    for name in names:
+        results.append(await run_scenario(SCENARIOS[name], scale=args.scale, track_memory=args.memory))
+    print(format_results(results))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([result.to_dict() for result in results], f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="오프라인 Music cog / AudioService 벤치마크")
+    parser.add_argument("scenarios", nargs="*", help=f"실행할 시나리오 (기본: 전체) {', '.join(SCENARIOS)}")
+    parser.add_argument("--scale", type=float, default=1.0, help="길드 수 배율")
+    parser.add_argument("--memory", action="store_true", help="tracemalloc 으로 최대 메모리 측정 (느려짐)")
+    parser.add_argument("--json", help="결과를 JSON 으로 저장할 경로")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+    asyncio.run(main(args))
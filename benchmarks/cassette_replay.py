@@ -0,0 +1,82 @@
+import os
+
+os.environ["AUDIO_BACKEND"] = "ffmpeg"
+
+import argparse
+import asyncio
+import time
+from collections import defaultdict
+from contextlib import redirect_stdout
+from typing import Dict, List
+
+from benchmarks.harness import build_music_bench, drain, percentile
+from core.config import RESOLVER_CASSETTE_PATH
+from core.model.music_application import MusicApplication
+from core.model.requester import requester_of
+from core.network import YoutubePlaylist
+from core.network.resolver_cassette import LatencyModel, ResolverCassette, set_resolver_cassette
+from core.network.youtube.youtube_service import YoutubeService
+from core.util import logger
+
+
+async def replay_key(bench, key: str):
+    """녹화된 키를 원래 호출(YoutubeService / _search_tracks_lavalink)로 되돌려 실행한다."""
+    source, _, rest = key.partition(":")
+    if source == "lavalink":
+        query = rest[len("ytsearch:"):] if rest.startswith("ytsearch:") else rest
+        tracks, _, _ = await bench.cog._search_tracks_lavalink(query, bench.guilds[0].member)
+        return "lavalink", [track.youtube_search for track in tracks]
+
+    kind, _, query = rest.partition(":")
+    if kind == "search":
+        result = await YoutubeService.title_search(query[len("ytsearch:"):])
+    elif kind == "playlist":
+        result = await YoutubeService.playlist_search(query)
+    else:
+        result = await YoutubeService.url_search(query)
+    if result is None:
+        return kind, []
+    return kind, list(result.songs) if isinstance(result, YoutubePlaylist) else [result]
+
+
+async def main(args: argparse.Namespace) -> None:
+    cassette = ResolverCassette("replay", args.path, LatencyModel(args.latency))
+    set_resolver_cassette(cassette)
+    bench = await build_music_bench(1)
+    fixture = bench.guilds[0]
+    samples: Dict[str, List[float]] = defaultdict(list)
+    enqueue_ms: List[float] = []
+    track_count = 0
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for _ in range(args.rounds):
+            for key in cassette.keys():
+                start = time.perf_counter()
+                kind, songs = await replay_key(bench, key)
+                samples[kind].append((time.perf_counter() - start) * 1000)
+                if not songs:
+                    continue
+                requester = requester_of(fixture.member)
+                tracks = [MusicApplication(youtube_search=song, requester=requester) for song in songs]
+                track_count += len(tracks)
+                start = time.perf_counter()
+                await bench.cog.audio_service.enqueue_and_play(fixture.guild.id, fixture.voice_channel, tracks)
+                enqueue_ms.append((time.perf_counter() - start) * 1000)
+        await drain()
+        logger.flush()
+
+    print(f"cassette={args.path} entries={len(cassette)} rounds={args.rounds} latency={args.latency}")
+    for kind, values in sorted(samples.items()):
+        print(f"{kind:<10} calls={len(values):>6} p50={percentile(values, 50):.3f}ms p99={percentile(values, 99):.3f}ms")
+    print(
+        f"enqueue    calls={len(enqueue_ms):>6} p50={percentile(enqueue_ms, 50):.3f}ms "
+        f"p99={percentile(enqueue_ms, 99):.3f}ms tracks={track_count} misses={cassette.misses}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="녹화된 해석 결과로 매핑/큐 비용을 오프라인 측정")
+    parser.add_argument("--path", default=RESOLVER_CASSETTE_PATH)
+    parser.add_argument("--latency", default="none", help="recorded | none | fixed:<ms> | uniform:a,b | lognormal:median,sigma")
+    parser.add_argument("--rounds", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
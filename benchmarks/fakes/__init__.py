@@ -0,0 +1,15 @@
+from .backend import InMemoryBackend
+from .discord_objects import (
+    FakeAttachment,
+    FakeBot,
+    FakeGuild,
+    FakeInteraction,
+    FakeMessage,
+    FakeTextChannel,
+    FakeUser,
+    FakeVoiceChannel,
+    FakeVoiceState,
+    GuildFixture,
+    build_guilds,
+)
+from .youtube import FakeYoutubeService, fake_video_id, fake_youtube_search
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+
+import discord
+
+from core.audio.backend import AudioBackend, OnTrackEnd
+from core.model.music_application import MusicApplication
+from core.network.youtube.track_table import stream_expires_at, track_table
+
+# 만료/거부된 스트림 URL 로 띄운 FFmpeg 가 종료되기까지의 시간
+EARLY_EXIT_SECONDS = 0.005
+
+
+@dataclass
+class _FakePlayer:
+    channel_id: int
+    current: Optional[MusicApplication] = None
+    paused: bool = False
+    on_end: Optional[OnTrackEnd] = None
+    end_handle: Optional[asyncio.TimerHandle] = None
+
+
+class InMemoryBackend(AudioBackend):
+    """
+    음성 연결 없이 재생 상태만 흉내 내는 백엔드입니다.
+    track_seconds 가 None 이면 곡은 skip/stop 으로만 끝납니다.
+    connect_latency 는 ensure_player 마다 기다리는 시간(음성 연결 흉내)입니다.
+    스트림 URL 의 expire 가 지났거나 rejected_urls 에 있으면(403 흉내) FFmpeg 처럼 곧바로 곡이 끝납니다.
+    """
+
+    def __init__(self, *, track_seconds: Optional[float] = None, connect_latency: float = 0.0) -> None:
+        self._players: Dict[int, _FakePlayer] = {}
+        self._track_seconds = track_seconds
+        self.connect_latency = connect_latency
+        self.play_calls = 0
+        self.rejected_urls: Set[str] = set()
+        # 정상 URL 로 재생을 시작한 횟수 / 바로 끝난 횟수
+        self.good_plays = 0
+        self.early_exits = 0
+
+    async def connect(self, bot: discord.Client) -> None:
+        return None
+
+    async def ensure_player(self, guild_id: int, voice_channel: discord.VoiceChannel) -> None:
+        if self.connect_latency > 0:
+            await asyncio.sleep(self.connect_latency)
+        player = self._players.get(guild_id)
+        if player is None:
+            self._players[guild_id] = _FakePlayer(channel_id=voice_channel.id)
+        else:
+            player.channel_id = voice_channel.id
+
+    async def play(self, guild_id: int, track: MusicApplication, on_end: OnTrackEnd) -> None:
+        player = self._players.get(guild_id)
+        if player is None:
+            raise RuntimeError("Voice client is not connected.")
+        self.play_calls += 1
+        player.current = track
+        player.paused = False
+        player.on_end = on_end
+        url = track_table.stream_url(track.youtube_search)
+        expires_at = stream_expires_at(url)
+        if url in self.rejected_urls or (expires_at is not None and expires_at <= time.time()):
+            self.early_exits += 1
+            player.end_handle = asyncio.get_running_loop().call_later(EARLY_EXIT_SECONDS, self._finish, guild_id)
+            return
+        self.good_plays += 1
+        if self._track_seconds is not None:
+            player.end_handle = asyncio.get_running_loop().call_later(
+                self._track_seconds, self._finish, guild_id
+            )
+
+    def _finish(self, guild_id: int) -> None:
+        player = self._players.get(guild_id)
+        if player is None or player.current is None:
+            return
+        on_end = player.on_end
+        if player.end_handle is not None:
+            player.end_handle.cancel()
+        player.current = None
+        player.paused = False
+        player.on_end = None
+        player.end_handle = None
+        if on_end is not None:
+            on_end(None)
+
+    async def stop(self, guild_id: int) -> None:
+        self._finish(guild_id)
+
+    async def pause(self, guild_id: int) -> None:
+        player = self._players.get(guild_id)
+        if player is not None:
+            player.paused = True
+
+    async def resume(self, guild_id: int) -> None:
+        player = self._players.get(guild_id)
+        if player is not None:
+            player.paused = False
+
+    async def skip(self, guild_id: int) -> None:
+        await self.stop(guild_id)
+
+    async def set_volume(self, guild_id: int, volume: int) -> None:
+        return None
+
+    async def is_playing(self, guild_id: int) -> bool:
+        player = self._players.get(guild_id)
+        return bool(player and player.current is not None and not player.paused)
+
+    async def disconnect(self, guild_id: int) -> None:
+        self._finish(guild_id)
+        self._players.pop(guild_id, None)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+_message_ids = itertools.count(10_000_000_000)
+
+
+async def _rest_call(latency: float) -> None:
+    if latency > 0:
+        await asyncio.sleep(latency)
+
+
+@dataclass
+class FakeGuild:
+    id: int
+
+
+@dataclass
+class FakeVoiceChannel:
+    id: int
+    guild: FakeGuild
+    members: List[Any] = field(default_factory=list)
+
+
+@dataclass
+class FakeVoiceState:
+    channel: FakeVoiceChannel
+
+
+class FakeUser:
+    def __init__(self, id: int, name: str, *, bot: bool = False, voice: Optional[FakeVoiceState] = None) -> None:
+        self.id = id
+        self.name = name
+        self.bot = bot
+        self.voice = voice
+        self.display_avatar = SimpleNamespace(url=f"https://cdn.discordapp.com/avatars/{id}/a_{id:x}.png?size=1024")
+
+
+class FakeAttachment:
+    def __init__(self, filename: str, data: bytes, content_type: Optional[str] = None) -> None:
+        self.filename = filename
+        self.content_type = content_type
+        self.data = data
+        self.size = len(data)
+
+    async def read(self) -> bytes:
+        return self.data
+
+
+class FakeMessage:
+    def __init__(
+        self,
+        channel: "FakeTextChannel",
+        author: Optional[FakeUser],
+        content: str = "",
+        attachments: Optional[List[FakeAttachment]] = None,
+    ) -> None:
+        self.id = next(_message_ids)
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.content = content
+        self.attachments = attachments or []
+        self.edit_count = 0
+        self.last_edit: Dict[str, Any] = {}
+
+    async def edit(self, **kwargs) -> "FakeMessage":
+        await _rest_call(self.channel.rest_latency)
+        self.edit_count += 1
+        self.last_edit = kwargs
+        return self
+
+    async def delete(self, *, delay: Optional[float] = None) -> None:
+        return None
+
+
+class FakeTextChannel:
+    def __init__(self, id: int, guild: FakeGuild, *, rest_latency: float = 0.0) -> None:
+        self.id = id
+        self.guild = guild
+        self.rest_latency = rest_latency
+        self.sent_count = 0
+        # 음악 임베드 메시지만 보관한다. 안내 메시지는 개수만 센다.
+        self.messages: Dict[int, FakeMessage] = {}
+
+    async def send(self, content: Optional[str] = None, **kwargs) -> FakeMessage:
+        await _rest_call(self.rest_latency)
+        self.sent_count += 1
+        return FakeMessage(self, None, content or "")
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        await _rest_call(self.rest_latency)
+        return self.messages[message_id]
+
+
+class FakeResponse:
+    def __init__(self) -> None:
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def send_message(self, content: str, **kwargs) -> None:
+        self._done = True
+
+    async def defer(self, **kwargs) -> None:
+        self._done = True
+
+
+class FakeInteraction:
+    """
+    버튼 클릭 컨텍스트. discord.Interaction 이 아니므로 cog 는 ctx.send 경로로 응답한다.
+    """
+
+    def __init__(self, guild: FakeGuild, user: FakeUser) -> None:
+        self.guild = guild
+        self.guild_id = guild.id
+        self.user = user
+        self.author = user
+        self.response = FakeResponse()
+        self.sent: List[str] = []
+
+    async def send(self, content: str, **kwargs) -> None:
+        self.sent.append(content)
+
+
+class FakeBot:
+    def __init__(self, loop: asyncio.AbstractEventLoop, *, rest_latency: float = 0.0) -> None:
+        self.loop = loop
+        self.rest_latency = rest_latency
+        self.user = FakeUser(1, "music-bot", bot=True)
+        self.channels: Dict[int, FakeTextChannel] = {}
+        self.persistent_views: List[Any] = []
+
+    def add_view(self, view) -> None:
+        self.persistent_views.append(view)
+
+    async def process_commands(self, message) -> None:
+        return None
+
+    async def fetch_channel(self, channel_id: int) -> FakeTextChannel:
+        await _rest_call(self.rest_latency)
+        return self.channels[channel_id]
+
+
+@dataclass
+class GuildFixture:
+    guild: FakeGuild
+    text_channel: FakeTextChannel
+    voice_channel: FakeVoiceChannel
+    member: FakeUser
+    music_message: FakeMessage
+
+    def message(self, content: str, attachments: Optional[List[FakeAttachment]] = None) -> FakeMessage:
+        return FakeMessage(self.text_channel, self.member, content, attachments)
+
+    def interaction(self) -> FakeInteraction:
+        return FakeInteraction(self.guild, self.member)
+
+
+def build_guilds(bot: FakeBot, count: int) -> List[GuildFixture]:
+    fixtures = []
+    for index in range(count):
+        guild = FakeGuild(id=100_000 + index)
+        text_channel = FakeTextChannel(1_000_000 + index, guild, rest_latency=bot.rest_latency)
+        voice_channel = FakeVoiceChannel(2_000_000 + index, guild)
+        member = FakeUser(3_000_000 + index, f"user{index}")
+        member.voice = FakeVoiceState(voice_channel)
+        voice_channel.members.extend([member, bot.user])
+        music_message = FakeMessage(text_channel, bot.user)
+        text_channel.messages[music_message.id] = music_message
+        bot.channels[text_channel.id] = text_channel
+        fixtures.append(GuildFixture(guild, text_channel, voice_channel, member, music_message))
+    return fixtures
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple, Union
+
+from core.network import YoutubePlaylist, YoutubeSearch
+from core.network.youtube.internal.youtube_utile import is_playlist_url, is_youtube_url
+from core.network.youtube.track_table import track_table
+from core.network.youtube.youtube_service import YoutubeService
+
+STREAM_TTL_SECONDS = 6 * 60 * 60
+
+
+def fake_video_id(index: int) -> str:
+    return f"v{index:010d}"
+
+
+def fake_youtube_search(index: int) -> YoutubeSearch:
+    # yt-dlp 결과와 같은 모양/길이의 문자열을 만든다.
+    video_id = fake_video_id(index)
+    expire = int(time.time()) + STREAM_TTL_SECONDS
+    channel_index = index % 500
+    return YoutubeSearch(
+        audio_source=(
+            f"https://rr1---sn-fake{index % 50:02d}.googlevideo.com/videoplayback"
+            f"?expire={expire}&id=o-{video_id}&itag=251&source=youtube&mime=audio%2Fwebm"
+        ),
+        title=f"Fake Track {index} (Official Audio)",
+        thumbnail_url=f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+        duration=180 + index % 120,
+        duration_string=f"{3 + (index % 120) // 60}:{(index % 60):02d}",
+        video_id=video_id,
+        video_url=f"https://www.youtube.com/watch?v={video_id}",
+        channel_id=f"@fakechannel{channel_index}",
+        channel_url=f"https://www.youtube.com/@fakechannel{channel_index}",
+        channel_name=f"Fake Channel {channel_index}",
+    )
+
+
+class FakeYoutubeService:
+    """
+    네트워크 없이 YoutubeService 를 대체합니다. latency 는 (최소, 최대) 초 구간에서 균등 분포로 뽑습니다.
+    entry_latency 는 flat 플레이리스트 항목 하나를 해석하는 시간입니다.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: tuple = (0.0, 0.0),
+        playlist_size: int = 100,
+        entry_latency: tuple = (0.0, 0.0),
+    ) -> None:
+        self.latency = latency
+        self.playlist_size = playlist_size
+        self.entry_latency = entry_latency
+        self.calls = 0
+        self._next_index = 0
+
+    async def _wait(self, latency: Optional[tuple] = None) -> None:
+        low, high = latency or self.latency
+        if high > 0:
+            await asyncio.sleep(random.uniform(low, high))
+
+    def _take_index(self) -> int:
+        index = self._next_index
+        self._next_index += 1
+        return index
+
+    async def search(self, query: str) -> Union[Optional[YoutubeSearch], Optional[YoutubePlaylist]]:
+        if is_youtube_url(query) and is_playlist_url(query):
+            return await self.playlist_search(query)
+        return await self.url_search(query)
+
+    async def url_search(self, url: str) -> Optional[YoutubeSearch]:
+        self.calls += 1
+        await self._wait()
+        return track_table.intern(fake_youtube_search(self._take_index()))
+
+    async def title_search(self, title: str) -> Optional[YoutubeSearch]:
+        return await self.url_search(title)
+
+    async def playlist_search(self, playlist_url: str) -> Optional[YoutubePlaylist]:
+        self.calls += 1
+        await self._wait()
+        songs = [track_table.intern(fake_youtube_search(self._take_index())) for _ in range(self.playlist_size)]
+        return YoutubePlaylist(title="Fake Playlist", song_cnt=len(songs), songs=songs)
+
+    async def playlist_entries(self, playlist_url: str) -> Optional[Tuple[str, List[dict]]]:
+        self.calls += 1
+        await self._wait()
+        entries = []
+        for _ in range(self.playlist_size):
+            video_id = fake_video_id(self._take_index())
+            entries.append({
+                "_type": "url",
+                "id": video_id,
+                "url": f"https://www.youtube.com/watch?v={video_id}",
+                "title": f"Fake Track {video_id}",
+            })
+        return "Fake Playlist", entries
+
+    async def entry_search(self, entry: dict) -> Optional[YoutubeSearch]:
+        self.calls += 1
+        await self._wait(self.entry_latency)
+        return track_table.intern(fake_youtube_search(int(entry["id"][1:])))
+
+    @contextmanager
+    def installed(self) -> Iterator["FakeYoutubeService"]:
+        names = ("search", "url_search", "title_search", "playlist_search", "playlist_entries", "entry_search")
+        originals = {name: YoutubeService.__dict__[name] for name in names}
+        try:
+            for name in names:
+                setattr(YoutubeService, name, staticmethod(getattr(self, name)))
+            yield self
+        finally:
+            for name, original in originals.items():
+                setattr(YoutubeService, name, original)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import os
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from benchmarks.fakes import FakeBot, FakeYoutubeService, GuildFixture, InMemoryBackend, build_guilds, fake_youtube_search
+from cogs.music import Music
+from core.audio import AudioService
+from core.local.music import MusicChannelRepository
+from core.local.music.model import MusicModel
+from core.model.music_application import MusicApplication
+from core.model.requester import requester_of
+from core.network.resolve_scheduler import ResolveScheduler
+from core.util import logger
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    ops: int
+    elapsed: float
+    latencies_ms: List[float]
+    peak_memory_bytes: Optional[int] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        return self.ops / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def p50_ms(self) -> float:
+        return percentile(self.latencies_ms, 50)
+
+    @property
+    def p99_ms(self) -> float:
+        return percentile(self.latencies_ms, 99)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "ops": self.ops,
+            "elapsed_s": round(self.elapsed, 4),
+            "throughput_ops_s": round(self.throughput, 1),
+            "p50_ms": round(self.p50_ms, 3),
+            "p99_ms": round(self.p99_ms, 3),
+            "peak_memory_bytes": self.peak_memory_bytes,
+            "extra": self.extra,
+        }
+
+
+class LatencyRecorder:
+    def __init__(self) -> None:
+        self.samples: List[float] = []
+
+    async def measure(self, awaitable: Awaitable[Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.samples.append((time.perf_counter() - start) * 1000)
+
+
+@dataclass
+class MusicBench:
+    bot: FakeBot
+    backend: InMemoryBackend
+    youtube: FakeYoutubeService
+    guilds: List[GuildFixture]
+    cog: Music
+    finished_tracks: int = 0
+
+    def fake_tracks(self, fixture: GuildFixture, count: int, start: int = 0) -> List[MusicApplication]:
+        requester = requester_of(fixture.member)
+        return [
+            MusicApplication(youtube_search=fake_youtube_search(start + index), requester=requester)
+            for index in range(count)
+        ]
+
+    def edit_count(self) -> int:
+        return sum(fixture.music_message.edit_count for fixture in self.guilds)
+
+
+async def build_music_bench(
+    guild_count: int,
+    *,
+    backend: Optional[InMemoryBackend] = None,
+    youtube: Optional[FakeYoutubeService] = None,
+    rest_latency: float = 0.0,
+    scheduler: Optional[ResolveScheduler] = None,
+) -> MusicBench:
+    loop = asyncio.get_running_loop()
+    bot = FakeBot(loop, rest_latency=rest_latency)
+    backend = backend or InMemoryBackend()
+    guilds = build_guilds(bot, guild_count)
+    music_channels = MusicChannelRepository()
+    music_channels.seed(
+        MusicModel(guild_id=fixture.guild.id, channel_id=fixture.text_channel.id, message_id=fixture.music_message.id)
+        for fixture in guilds
+    )
+    # 실제 봇처럼 서비스는 봇에 붙여 두고 cog 는 get_audio_service 로 가져간다(reload 시나리오).
+    bot.audio_service = AudioService(backend, loop)
+    cog = Music(
+        bot,
+        music_channels=music_channels,
+        scheduler=scheduler or ResolveScheduler(),
+    )
+    await cog.cog_load()
+    bench = MusicBench(bot=bot, backend=backend, youtube=youtube or FakeYoutubeService(), guilds=guilds, cog=cog)
+
+    def _count_finished(*_: Any) -> None:
+        bench.finished_tracks += 1
+
+    # 재생 기록은 DB 에 쓰지 않고 개수만 센다.
+    cog.audio_service.on_track_finish = _count_finished
+    await drain()
+    return bench
+
+
+async def drain(max_rounds: int = 1000) -> None:
+    """run_coroutine_threadsafe 로 예약된 play_next 등 남은 태스크가 끝날 때까지 기다립니다."""
+    current = asyncio.current_task()
+    for _ in range(max_rounds):
+        pending = [task for task in asyncio.all_tasks() if task is not current and not task.done()]
+        if not pending:
+            await asyncio.sleep(0)
+            if not [task for task in asyncio.all_tasks() if task is not current and not task.done()]:
+                return
+            continue
+        await asyncio.wait(pending, timeout=1)
+
+
+Scenario = Callable[[float], Awaitable[ScenarioResult]]
+
+
+async def run_scenario(scenario: Scenario, *, scale: float, track_memory: bool) -> ScenarioResult:
+    gc.collect()
+    if track_memory:
+        tracemalloc.start()
+    try:
+        # 로그 비용은 그대로 두고 화면 출력만 버린다. writer 스레드가 남은 레코드를 쓸 때까지 리다이렉트를 유지한다.
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            result = await scenario(scale)
+            logger.flush()
+        if track_memory:
+            result.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+    return result
+
+
+def format_results(results: List[ScenarioResult]) -> str:
+    header = f"{'scenario':<18}{'ops':>9}{'elapsed s':>11}{'ops/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'peak MB':>10}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        peak = "-" if result.peak_memory_bytes is None else f"{result.peak_memory_bytes / 1024 / 1024:.1f}"
+        lines.append(
+            f"{result.name:<18}{result.ops:>9}{result.elapsed:>11.3f}{result.throughput:>12.1f}"
+            f"{result.p50_ms:>10.3f}{result.p99_ms:>10.3f}{peak:>10}"
+        )
+        if result.extra:
+            lines.append("    " + " ".join(f"{key}={value}" for key, value in result.extra.items()))
+    return "\n".join(lines)
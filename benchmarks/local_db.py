@@ -0,0 +1,69 @@
+import asyncio
+import os
+import tempfile
+import time
+
+import aiosqlite
+
+from core.local.database import LocalDatabase
+
+OPS = 2_000
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS tbl_music (
+        guild_id INTEGER PRIMARY KEY,
+        channel_id INTEGER,
+        message_id INTEGER
+    )
+"""
+UPSERT = (
+    "INSERT INTO tbl_music (guild_id, channel_id, message_id) VALUES (?, ?, ?) "
+    "ON CONFLICT(guild_id) DO UPDATE SET channel_id = excluded.channel_id, message_id = excluded.message_id"
+)
+SELECT = "SELECT * FROM tbl_music WHERE guild_id = ?"
+
+
+async def bench_per_call_connection(path: str) -> float:
+    # 기존 MusicDataSource 방식: 호출마다 연결을 열고 get -> update/insert 후 커밋한다.
+    async with aiosqlite.connect(path) as db:
+        await db.execute(CREATE_TABLE)
+        await db.commit()
+
+    start = time.perf_counter()
+    for i in range(OPS):
+        async with aiosqlite.connect(path) as db:
+            cursor = await db.execute(SELECT, (i,))
+            exists = await cursor.fetchone() is not None
+        async with aiosqlite.connect(path) as db:
+            if exists:
+                await db.execute("UPDATE tbl_music SET channel_id = ?, message_id = ? WHERE guild_id = ?", (i, i, i))
+            else:
+                await db.execute("INSERT INTO tbl_music VALUES (?, ?, ?)", (i, i, i))
+            await db.commit()
+    return OPS / (time.perf_counter() - start)
+
+
+async def bench_shared_connection(path: str) -> float:
+    database = LocalDatabase(path)
+    await database.execute(CREATE_TABLE)
+
+    start = time.perf_counter()
+    for i in range(OPS):
+        await database.write(UPSERT, (i, i, i))
+    await database.flush()
+    elapsed = time.perf_counter() - start
+    await database.close()
+    return OPS / elapsed
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = await bench_per_call_connection(os.path.join(tmp, "legacy.sqlite"))
+        shared = await bench_shared_connection(os.path.join(tmp, "shared.sqlite"))
+    print(f"ops={OPS}")
+    print(f"per-call connection  : {legacy:,.0f} ops/s")
+    print(f"shared WAL + batching: {shared:,.0f} ops/s ({shared / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
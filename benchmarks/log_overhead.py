@@ -0,0 +1,75 @@
+import argparse
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Any, Callable, List, Optional
+
+from benchmarks.harness import percentile
+from core.util.structured_log import DEBUG, INFO, StructuredLogger
+
+
+def legacy_log_event(user_input: Optional[Any]) -> None:
+    """구조화 로그 도입 전 core.util.log_event 구현"""
+    timestamp = datetime.now().isoformat(timespec="seconds")
+    func_name = sys._getframe(1).f_code.co_name
+    log_input = "-" if user_input is None else str(user_input)
+    print(f"{timestamp} [{func_name}] : {log_input}")
+
+
+def measure(call: Callable[[int], None], calls: int, repeat: int) -> List[float]:
+    """호출 스레드에서 걸린 시간만 잰다. 결과는 호출당 ns."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for index in range(calls):
+            call(index)
+        samples.append((time.perf_counter_ns() - start) / calls)
+    return samples
+
+
+def main(args: argparse.Namespace) -> None:
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        structured = StructuredLogger(stream=devnull, max_queue=args.calls * args.repeat)
+        sampled = StructuredLogger(stream=devnull, sample_rates={"control": 0.01})
+        filtered = StructuredLogger(stream=devnull, level=INFO)
+        legacy_shim = StructuredLogger(stream=devnull, max_queue=args.calls * args.repeat)
+
+        def shim_log_event(user_input: Optional[Any]) -> None:
+            func_name = sys._getframe(1).f_code.co_name
+            legacy_shim.log(INFO, func_name, {"msg": user_input}, func_name)
+
+        cases = {
+            "legacy print": lambda i: legacy_log_event(f"control custom_id=skip guild_id={i}"),
+            "log_event shim": lambda i: shim_log_event(f"control custom_id=skip guild_id={i}"),
+            "structured info": lambda i: structured.info("control", custom_id="skip", guild_id=i),
+            "sampled 1%": lambda i: sampled.info("control", custom_id="skip", guild_id=i),
+            "below level": lambda i: filtered.log(DEBUG, "control", {"guild_id": i}),
+        }
+        results = {}
+        with redirect_stdout(devnull):
+            for name, call in cases.items():
+                results[name] = measure(call, args.calls, args.repeat)
+                structured.flush()
+                legacy_shim.flush()
+        writer_start = time.perf_counter()
+        for index in range(args.calls):
+            structured.info("control", custom_id="skip", guild_id=index)
+        structured.flush()
+        writer_elapsed = time.perf_counter() - writer_start
+
+    print(f"calls={args.calls} repeat={args.repeat} (ns/call on the calling thread)")
+    for name, samples in results.items():
+        print(f"{name:<16} p50={percentile(samples, 50):>8.0f}ns min={min(samples):>8.0f}ns")
+    print(
+        f"writer thread drained {args.calls} records in {writer_elapsed * 1000:.1f}ms "
+        f"dropped={structured.dropped + legacy_shim.dropped}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="log_event(print) 와 구조화 로그의 호출당 비용 비교")
+    parser.add_argument("--calls", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
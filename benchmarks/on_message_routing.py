@@ -0,0 +1,65 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from cogs.music import Music
+from core.local.music import MusicChannelRepository
+from core.local.music.model import MusicModel
+
+GUILD_COUNT = 10_000
+ITERATIONS = 50_000
+
+
+class _FakeBot:
+    async def process_commands(self, message) -> None:
+        return None
+
+
+def build_cog(guild_count: int) -> Music:
+    # __init__ 은 오디오 서비스와 DB 로딩을 시작하므로 라우팅에 필요한 상태만 구성한다.
+    cog = Music.__new__(Music)
+    cog.bot = _FakeBot()
+    cog.music_channels = MusicChannelRepository()
+    cog.music_channels.seed(
+        MusicModel(guild_id=guild_id, channel_id=1_000_000 + guild_id, message_id=guild_id)
+        for guild_id in range(guild_count)
+    )
+    return cog
+
+
+def build_message(channel_id: int):
+    return SimpleNamespace(
+        author=SimpleNamespace(bot=False, voice=None),
+        channel=SimpleNamespace(id=channel_id),
+        guild=SimpleNamespace(id=0),
+        content="hello",
+    )
+
+
+async def bench_on_message(cog: Music, message) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await cog.on_message(message)
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+def bench_legacy_scan(cog: Music, message) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        message.channel.id not in [model.channel_id for model in cog.music_channels.all()]
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+async def main():
+    cog = build_cog(GUILD_COUNT)
+    # 음악 채널이 아닌 일반 채팅 메시지가 대부분의 트래픽이다.
+    message = build_message(channel_id=42)
+    dispatch_us = await bench_on_message(cog, message)
+    legacy_us = bench_legacy_scan(cog, message)
+    print(f"guilds={GUILD_COUNT} iterations={ITERATIONS}")
+    print(f"on_message dispatch (index)      : {dispatch_us:.3f} us/msg")
+    print(f"channel lookup (legacy list scan): {legacy_us:.3f} us/msg")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,536 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import random
+import re
+import time
+from typing import Dict
+
+from benchmarks.fakes import FakeAttachment, FakeYoutubeService, fake_video_id, fake_youtube_search
+from benchmarks.harness import (
+    LatencyRecorder,
+    MusicBench,
+    Scenario,
+    ScenarioResult,
+    build_music_bench,
+    drain,
+    percentile,
+)
+from core.metrics import metrics
+from core.model.music_application import MusicApplication
+from core.model.requester import requester_of
+from core.network.resolve_scheduler import ResolveScheduler
+from core.network.youtube import youtube_service
+from core.network.youtube.track_table import track_table
+from core.network.youtube.youtube_service import YoutubeService
+
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PLfakefakefakefakefake"
+RATE_LIMITED_MESSAGE = "요청이 너무 많아"
+
+
+async def _prime_playing(bench: MusicBench, queue_size: int) -> None:
+    for fixture in bench.guilds:
+        tracks = bench.fake_tracks(fixture, queue_size + 1)
+        await bench.cog.audio_service.enqueue_and_play(fixture.guild.id, fixture.voice_channel, tracks)
+    await drain()
+
+
+async def enqueue_guilds(scale: float) -> ScenarioResult:
+    """길드마다 음악 채널에 곡 제목 하나를 동시에 보낸다."""
+    guild_count = max(1, int(5_000 * scale))
+    bench = await build_music_bench(guild_count)
+    recorder = LatencyRecorder()
+    with bench.youtube.installed():
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            recorder.measure(bench.cog.on_message(fixture.message(f"fake song {index}")))
+            for index, fixture in enumerate(bench.guilds)
+        ))
+        await drain()
+        elapsed = time.perf_counter() - start
+    return ScenarioResult(
+        name="enqueue_guilds",
+        ops=guild_count,
+        elapsed=elapsed,
+        latencies_ms=recorder.samples,
+        extra={
+            "guilds": guild_count,
+            "resolutions": bench.youtube.calls,
+            "plays": bench.backend.play_calls,
+            "embed_edits": bench.edit_count(),
+        },
+    )
+
+
+async def skip_storm(scale: float) -> ScenarioResult:
+    """재생 중인 길드마다 스킵 버튼을 한꺼번에 연타한다."""
+    guild_count = max(1, int(100 * scale))
+    clicks_per_guild = 30
+    bench = await build_music_bench(guild_count)
+    await _prime_playing(bench, queue_size=50)
+    recorder = LatencyRecorder()
+    interactions = []
+
+    async def click(fixture) -> None:
+        interaction = fixture.interaction()
+        interactions.append(interaction)
+        await recorder.measure(bench.cog.on_music_control(interaction, "skip"))
+
+    plays_before = bench.backend.play_calls
+    start = time.perf_counter()
+    await asyncio.gather(*(click(fixture) for fixture in bench.guilds for _ in range(clicks_per_guild)))
+    await drain()
+    elapsed = time.perf_counter() - start
+    rejected = sum(1 for i in interactions if any(RATE_LIMITED_MESSAGE in sent for sent in i.sent))
+    return ScenarioResult(
+        name="skip_storm",
+        ops=len(interactions),
+        elapsed=elapsed,
+        latencies_ms=recorder.samples,
+        extra={
+            "guilds": guild_count,
+            "rejected": rejected,
+            "plays": bench.backend.play_calls - plays_before,
+            "finished_tracks": bench.finished_tracks,
+        },
+    )
+
+
+async def playlist_10k(scale: float) -> ScenarioResult:
+    """여러 길드가 차례로 10,000곡 플레이리스트를 추가한다."""
+    guild_count = max(1, int(5 * scale))
+    bench = await build_music_bench(guild_count, youtube=FakeYoutubeService(playlist_size=10_000))
+    recorder = LatencyRecorder()
+    with bench.youtube.installed():
+        start = time.perf_counter()
+        for fixture in bench.guilds:
+            await recorder.measure(bench.cog.on_message(fixture.message(PLAYLIST_URL)))
+        await drain()
+        elapsed = time.perf_counter() - start
+    queued = sum(len(state.queue) for state in bench.cog.audio_service.states.values())
+    return ScenarioResult(
+        name="playlist_10k",
+        ops=guild_count,
+        elapsed=elapsed,
+        latencies_ms=recorder.samples,
+        extra={"guilds": guild_count, "queued_tracks": queued},
+    )
+
+
+async def button_spam(scale: float) -> ScenarioResult:
+    """재생 중인 길드들에서 일시정지/재개/반복/셔플 버튼을 무작위로 누른다."""
+    guild_count = max(1, int(500 * scale))
+    clicks_per_guild = 20
+    bench = await build_music_bench(guild_count)
+    await _prime_playing(bench, queue_size=10)
+    recorder = LatencyRecorder()
+    rng = random.Random(31)
+
+    async def spam(fixture) -> None:
+        for _ in range(clicks_per_guild):
+            custom_id = rng.choice(("pause", "resume", "loop", "shuffle"))
+            await recorder.measure(bench.cog.on_music_control(fixture.interaction(), custom_id))
+
+    edits_before = bench.edit_count()
+    start = time.perf_counter()
+    await asyncio.gather(*(spam(fixture) for fixture in bench.guilds))
+    await drain()
+    elapsed = time.perf_counter() - start
+    return ScenarioResult(
+        name="button_spam",
+        ops=guild_count * clicks_per_guild,
+        elapsed=elapsed,
+        latencies_ms=recorder.samples,
+        extra={"guilds": guild_count, "embed_edits": bench.edit_count() - edits_before},
+    )
+
+
+async def controls_during_connect(scale: float) -> ScenarioResult:
+    """음성 연결이 200ms 걸리는 동안 같은 길드에서 일시정지/재개 버튼을 누른다."""
+    guild_count = max(1, int(50 * scale))
+    bench = await build_music_bench(guild_count)
+    await _prime_playing(bench, queue_size=1)
+    bench.backend.connect_latency = 0.2
+    recorder = LatencyRecorder()
+
+    async def collide(index: int, fixture) -> None:
+        search = asyncio.ensure_future(bench.cog.on_message(fixture.message(f"fake song {index}")))
+        # on_message 의 두 번째 ensure_player(enqueue_and_play 안) 가 진행 중인 시점
+        await asyncio.sleep(0.3)
+        for custom_id in ("pause", "resume"):
+            await recorder.measure(bench.cog.on_music_control(fixture.interaction(), custom_id))
+        await search
+
+    with bench.youtube.installed():
+        start = time.perf_counter()
+        await asyncio.gather(*(collide(index, fixture) for index, fixture in enumerate(bench.guilds)))
+        await drain()
+        elapsed = time.perf_counter() - start
+    return ScenarioResult(
+        name="controls_during_connect",
+        ops=guild_count * 2,
+        elapsed=elapsed,
+        latencies_ms=recorder.samples,
+        extra={"guilds": guild_count, "plays": bench.backend.play_calls},
+    )
+
+
+async def noisy_neighbor(scale: float) -> ScenarioResult:
+    """한 길드가 링크 20개(플레이리스트 5개 포함)를 붙여 넣는 동안 다른 길드들이 곡 하나씩 검색한다."""
+    guild_count = max(2, int(20 * scale) + 1)
+    scheduler = ResolveScheduler()
+    bench = await build_music_bench(
+        guild_count, youtube=FakeYoutubeService(latency=(0.02, 0.04)), scheduler=scheduler
+    )
+    noisy, quiet = bench.guilds[0], bench.guilds[1:]
+    noisy_recorder = LatencyRecorder()
+    quiet_recorder = LatencyRecorder()
+    noisy_messages = [PLAYLIST_URL] * 5 + [f"noisy song {index}" for index in range(15)]
+    with bench.youtube.installed():
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(noisy_recorder.measure(bench.cog.on_message(noisy.message(content))) for content in noisy_messages),
+            *(
+                quiet_recorder.measure(bench.cog.on_message(fixture.message(f"quiet song {index}")))
+                for index, fixture in enumerate(quiet)
+            ),
+        )
+        await drain()
+        elapsed = time.perf_counter() - start
+    return ScenarioResult(
+        name="noisy_neighbor",
+        ops=len(noisy_messages) + len(quiet),
+        elapsed=elapsed,
+        latencies_ms=quiet_recorder.samples,
+        extra={
+            "guilds": guild_count,
+            "noisy_p99_ms": round(percentile(noisy_recorder.samples, 99), 2),
+            "rejected": scheduler.rejected,
+            "resolutions": bench.youtube.calls,
+        },
+    )
+
+
+async def hot_reload(scale: float) -> ScenarioResult:
+    """재생 중인 길드들을 둔 채로 Music cog 를 여러 번 reload 하고, 큐/재생이 그대로인지와 검색 수를 본다."""
+    guild_count = max(1, int(500 * scale))
+    reloads = 20
+    bench = await build_music_bench(guild_count)
+    await _prime_playing(bench, queue_size=20)
+    service = bench.cog.audio_service
+    # 새 cog 는 재생 기록 콜백을 DB 쓰기로 되돌리므로 harness 의 카운터를 다시 단다.
+    count_finished = service.on_track_finish
+    queued_before = service.queued_track_count()
+    playing_before = service.playing_guild_count()
+    plays_before = bench.backend.play_calls
+    resolutions_before = metrics.total("resolve_seconds")
+    recorder = LatencyRecorder()
+
+    async def reload_music() -> None:
+        # bot.reload_extension 과 같이 모듈을 새로 실행하고 새 cog 를 만든다.
+        module = importlib.reload(importlib.import_module("cogs.music"))
+        bench.cog = module.Music(bench.bot, music_channels=bench.cog.music_channels, scheduler=bench.cog.resolve_scheduler)
+        await bench.cog.cog_load()
+        service.on_track_finish = count_finished
+
+    with bench.youtube.installed():
+        start = time.perf_counter()
+        for _ in range(reloads):
+            await recorder.measure(reload_music())
+        await drain()
+        elapsed = time.perf_counter() - start
+        queued_after = service.queued_track_count()
+        playing_after = service.playing_guild_count()
+        # reload 뒤에도 새 cog 가 같은 큐를 이어서 재생한다.
+        await asyncio.gather(*(bench.cog.on_music_control(fixture.interaction(), "skip") for fixture in bench.guilds))
+        await drain()
+    return ScenarioResult(
+        name="hot_reload",
+        ops=reloads,
+        elapsed=elapsed,
+        latencies_ms=recorder.samples,
+        extra={
+            "guilds": guild_count,
+            "same_service": bench.cog.audio_service is service,
+            "queued_before": queued_before,
+            "queued_after": queued_after,
+            "playing_after": f"{playing_after}/{playing_before}",
+            "resolutions": int(metrics.total("resolve_seconds") - resolutions_before) + bench.youtube.calls,
+            "plays_after_skip": bench.backend.play_calls - plays_before,
+        },
+    )
+
+
+async def stale_streams(scale: float) -> ScenarioResult:
+    """
+    대기열의 30% 는 expire 가 지난 스트림 URL, 10% 는 만료 전이지만 403 으로 거부되는 URL 로 두고 스킵으로 끝까지 넘긴다.
+    스트림 재해석이 없을 때와 있을 때 정상 재생된 곡 수와 FFmpeg 실행 횟수를 비교한다.
+    """
+    guild_count = max(1, int(200 * scale))
+    queue_size = 10
+
+    async def run(refresh: bool, offset: int):
+        bench = await build_music_bench(guild_count)
+        service = bench.cog.audio_service
+        refreshed = 0
+        recorder = LatencyRecorder()
+
+        async def refresher(guild_id: int, track) -> bool:
+            nonlocal refreshed
+            start = time.perf_counter()
+            await asyncio.sleep(0.02)
+            refreshed += 1
+            video_id = track.youtube_search.video_id
+            track_table.refresh_stream(
+                video_id,
+                f"https://rr1---sn-fresh.googlevideo.com/videoplayback?expire={int(time.time()) + 21600}&id=o-{video_id}",
+            )
+            recorder.samples.append((time.perf_counter() - start) * 1000)
+            return True
+
+        service.stream_refresher = refresher if refresh else None
+        keep = []
+        for guild_index, fixture in enumerate(bench.guilds):
+            tracks = bench.fake_tracks(fixture, queue_size, start=offset + guild_index * queue_size)
+            for index, track in enumerate(tracks):
+                search = track_table.intern(track.youtube_search)
+                keep.append(search)
+                if index % 10 in (1, 4, 7):
+                    expired = re.sub(r"expire=\d+", f"expire={int(time.time()) - 60}", search.audio_source)
+                    track_table.refresh_stream(search.video_id, expired)
+                elif index % 10 == 9:
+                    bench.backend.rejected_urls.add(track_table.stream_url(search))
+            await service.enqueue_and_play(fixture.guild.id, fixture.voice_channel, tracks)
+        await drain()
+        start = time.perf_counter()
+        for _ in range(queue_size):
+            await asyncio.gather(*(service.skip(fixture.guild.id) for fixture in bench.guilds))
+            await drain()
+            # drain 은 타이머를 기다리지 않으므로 조기 종료(EARLY_EXIT_SECONDS)와 재시도가 끝날 때까지 둔다.
+            await asyncio.sleep(0.05)
+            await drain()
+        elapsed = time.perf_counter() - start
+        return bench, refreshed, recorder, elapsed
+
+    before, _, _, _ = await run(refresh=False, offset=0)
+    after, refreshed, recorder, elapsed = await run(refresh=True, offset=guild_count * queue_size)
+    total = guild_count * queue_size
+    return ScenarioResult(
+        name="stale_streams",
+        ops=total,
+        elapsed=elapsed,
+        latencies_ms=recorder.samples,
+        extra={
+            "guilds": guild_count,
+            "lost_before": total - before.backend.good_plays,
+            "spawns_before": before.backend.play_calls,
+            "lost": total - after.backend.good_plays,
+            "spawns": after.backend.play_calls,
+            "early_exits": after.backend.early_exits,
+            "refreshed": refreshed,
+        },
+    )
+
+
+async def slow_tail(scale: float) -> ScenarioResult:
+    """yt-dlp 해석의 3% 가 2초 걸릴 때 hedge 없이/있게 단일 곡 해석 지연을 비교한다. 20개씩 동시에 보낸다."""
+    request_count = max(20, int(400 * scale))
+    rng = random.Random(48)
+
+    async def fake_fetch(kind: str, query: str):
+        await asyncio.sleep(2.0 if rng.random() < 0.03 else rng.uniform(0.02, 0.06))
+        index = int(query.rsplit("=", 1)[1])
+        search = fake_youtube_search(index)
+        return {
+            "title": search.title,
+            "url": search.audio_source,
+            "thumbnail": search.thumbnail_url,
+            "duration": search.duration,
+            "duration_string": search.duration_string,
+            "display_id": search.video_id,
+            "webpage_url": search.video_url,
+            "uploader_id": search.channel_id,
+            "uploader": search.channel_name,
+            "uploader_url": search.channel_url,
+        }
+
+    async def run(hedge: bool, offset: int):
+        youtube_service.RESOLVE_HEDGE = hedge
+        recorder = LatencyRecorder()
+        semaphore = asyncio.Semaphore(20)
+
+        async def one(index: int) -> None:
+            async with semaphore:
+                await recorder.measure(YoutubeService.url_search(f"https://www.youtube.com/watch?v={offset + index}"))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(index) for index in range(request_count)))
+        return recorder, time.perf_counter() - start
+
+    originals = {name: YoutubeService.__dict__[name] for name in ("_fetch_info", "_fetch_local")}
+    hedge_setting = youtube_service.RESOLVE_HEDGE
+    hedges = metrics.get("resolve_hedge_total")
+    launched_before = hedges.labels("url", "launched").value
+    won_before = hedges.labels("url", "hedge_won").value
+    try:
+        YoutubeService._fetch_info = staticmethod(fake_fetch)
+        YoutubeService._fetch_local = staticmethod(lambda query: fake_fetch("url", query))
+        before, _ = await run(hedge=False, offset=0)
+        after, elapsed = await run(hedge=True, offset=request_count)
+    finally:
+        youtube_service.RESOLVE_HEDGE = hedge_setting
+        for name, original in originals.items():
+            setattr(YoutubeService, name, original)
+    return ScenarioResult(
+        name="slow_tail",
+        ops=request_count,
+        elapsed=elapsed,
+        latencies_ms=after.samples,
+        extra={
+            "p99_ms_before": round(percentile(before.samples, 99), 1),
+            "p50_ms_before": round(percentile(before.samples, 50), 1),
+            "hedges": int(hedges.labels("url", "launched").value - launched_before),
+            "hedge_won": int(hedges.labels("url", "hedge_won").value - won_before),
+        },
+    )
+
+
+async def playlist_stream(scale: float) -> ScenarioResult:
+    """
+    플레이리스트 곡 해석에 곡당 10~30ms 가 걸릴 때 첫 곡 재생까지의 시간을 비교한다.
+    예전 방식은 yt-dlp 한 번의 extract_info 처럼 전부 차례로 해석한 뒤 한꺼번에 넣고,
+    지금은 항목을 동시에 해석하면서 첫 곡부터 바로 넣는다.
+    """
+    guild_count = max(1, int(2 * scale))
+    youtube = FakeYoutubeService(playlist_size=100, entry_latency=(0.01, 0.03))
+    bench = await build_music_bench(guild_count, youtube=youtube)
+    first_play: Dict[int, float] = {}
+    backend_play = bench.backend.play
+
+    async def play(guild_id, track, on_end) -> None:
+        first_play.setdefault(guild_id, time.perf_counter())
+        await backend_play(guild_id, track, on_end)
+
+    async def legacy_import(fixture) -> float:
+        start = time.perf_counter()
+        _, entries = await youtube.playlist_entries(PLAYLIST_URL)
+        songs = [await youtube.entry_search(entry) for entry in entries]
+        requester = requester_of(fixture.member)
+        tracks = [MusicApplication(youtube_search=song, requester=requester) for song in songs]
+        await bench.cog.audio_service.enqueue_and_play(fixture.guild.id, fixture.voice_channel, tracks)
+        return start
+
+    async def streamed_import(fixture) -> float:
+        start = time.perf_counter()
+        await bench.cog.on_message(fixture.message(PLAYLIST_URL))
+        return start
+
+    async def run(importer) -> tuple:
+        first_play.clear()
+        start = time.perf_counter()
+        starts = await asyncio.gather(*(importer(fixture) for fixture in bench.guilds))
+        elapsed = time.perf_counter() - start
+        first_ms = [
+            (first_play[fixture.guild.id] - started) * 1000 for fixture, started in zip(bench.guilds, starts)
+        ]
+        for fixture in bench.guilds:
+            await bench.cog.audio_service.stop(fixture.guild.id)
+        await drain()
+        return first_ms, elapsed
+
+    bench.backend.play = play
+    with youtube.installed():
+        before, before_elapsed = await run(legacy_import)
+        after, elapsed = await run(streamed_import)
+    return ScenarioResult(
+        name="playlist_stream",
+        ops=guild_count,
+        elapsed=elapsed,
+        latencies_ms=after,
+        extra={
+            "first_track_p50_ms_before": round(percentile(before, 50), 1),
+            "import_ms_before": round(before_elapsed * 1000, 1),
+            "import_ms": round(elapsed * 1000, 1),
+        },
+    )
+
+
+async def track_list(scale: float) -> ScenarioResult:
+    """
+    링크 60줄(그중 10줄은 중복)을 한 줄씩 메시지로 보낼 때와 .txt 첨부 하나로 보낼 때
+    해석 횟수, 안내 메시지 수, 임베드 수정 수, 걸린 시간을 비교한다. 해석은 10~30ms 걸린다.
+    """
+    guild_count = max(1, int(10 * scale))
+    youtube = FakeYoutubeService(latency=(0.01, 0.03))
+    bench = await build_music_bench(guild_count * 2, youtube=youtube)
+    line_count, duplicate_count = 60, 10
+
+    def links(offset: int) -> list:
+        unique = [f"https://www.youtube.com/watch?v={fake_video_id(offset + index)}" for index in range(line_count - duplicate_count)]
+        return unique + unique[:duplicate_count]
+
+    def counts() -> tuple:
+        sent = sum(fixture.text_channel.sent_count for fixture in bench.guilds)
+        return youtube.calls, sent, bench.edit_count()
+
+    async def one_by_one(index: int, fixture) -> None:
+        for link in links(900_000 + index * 100):
+            await bench.cog.on_message(fixture.message(link))
+
+    async def attached(index: int, fixture) -> None:
+        data = "\n".join(links(950_000 + index * 100)).encode()
+        await recorder.measure(bench.cog.on_message(fixture.message("", [FakeAttachment("songs.txt", data, "text/plain")])))
+
+    recorder = LatencyRecorder()
+    before_guilds, after_guilds = bench.guilds[:guild_count], bench.guilds[guild_count:]
+    with youtube.installed():
+        start_counts = counts()
+        start = time.perf_counter()
+        await asyncio.gather(*(one_by_one(index, fixture) for index, fixture in enumerate(before_guilds)))
+        before_elapsed = time.perf_counter() - start
+        await drain()
+        middle_counts = counts()
+        start = time.perf_counter()
+        await asyncio.gather(*(attached(index, fixture) for index, fixture in enumerate(after_guilds)))
+        elapsed = time.perf_counter() - start
+        await drain()
+        end_counts = counts()
+    before = [after - before for before, after in zip(start_counts, middle_counts)]
+    after = [after - before for before, after in zip(middle_counts, end_counts)]
+    queued = [
+        len(bench.cog.audio_service.states[fixture.guild.id].queue) + 1 for fixture in (before_guilds[0], after_guilds[0])
+    ]
+    return ScenarioResult(
+        name="track_list",
+        ops=guild_count,
+        elapsed=elapsed,
+        latencies_ms=recorder.samples,
+        extra={
+            "guilds": guild_count,
+            "ms_before": round(before_elapsed * 1000, 1),
+            "resolutions_before": before[0],
+            "messages_before": before[1],
+            "embed_edits_before": before[2],
+            "resolutions": after[0],
+            "messages": after[1],
+            "embed_edits": after[2],
+            "tracks_per_guild_before": queued[0],
+            "tracks_per_guild": queued[1],
+        },
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "enqueue_guilds": enqueue_guilds,
+    "skip_storm": skip_storm,
+    "playlist_10k": playlist_10k,
+    "button_spam": button_spam,
+    "noisy_neighbor": noisy_neighbor,
+    "controls_during_connect": controls_during_connect,
+    "hot_reload": hot_reload,
+    "stale_streams": stale_streams,
+    "slow_tail": slow_tail,
+    "playlist_stream": playlist_stream,
+    "track_list": track_list,
+}
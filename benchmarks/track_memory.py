@@ -0,0 +1,117 @@
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List
+
+from core.model.music_application import MusicApplication
+from core.model.requester import get_requester
+from core.network.youtube.mapper.youtube_search_mapper import dict_to_youtube_search
+
+
+@dataclass
+class LegacyYoutubeSearch:
+    audio_source: str
+    title: str
+    thumbnail_url: str
+    duration: int
+    duration_string: str
+    video_id: str
+    video_url: str
+    channel_id: str
+    channel_url: str
+    channel_name: str
+
+
+@dataclass
+class LegacyMusicApplication:
+    youtube_search: LegacyYoutubeSearch
+    user_name: str
+    user_icon: str
+    user_id: int
+
+
+def ytdlp_entry(index: int) -> dict:
+    # json 파싱 결과처럼 곡마다 새 문자열 객체를 만든다.
+    video_id = f"v{index:010d}"
+    channel = index % 500
+    return {
+        "title": f"Fake Track {index} (Official Audio)",
+        "url": f"https://rr1---sn-fake{index % 50:02d}.googlevideo.com/videoplayback?expire=1700000000&id=o-{video_id}&itag=251",
+        "thumbnail": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+        "duration": 180 + index % 120,
+        "duration_string": f"{3 + (index % 120) // 60}:{index % 60:02d}",
+        "display_id": video_id,
+        "webpage_url": f"https://www.youtube.com/watch?v={video_id}",
+        "uploader_id": f"@fakechannel{channel}",
+        "uploader": f"Fake Channel {channel}",
+        "uploader_url": f"https://www.youtube.com/@fakechannel{channel}",
+    }
+
+
+def avatar_url(user_id: int) -> str:
+    # display_avatar.url 은 호출할 때마다 새 문자열을 만든다.
+    return f"https://cdn.discordapp.com/avatars/{user_id}/a_{user_id:x}0123456789abcdef.png?size=1024"
+
+
+def build_legacy(playlists: int, playlist_size: int, distinct: int) -> List[LegacyMusicApplication]:
+    tracks = []
+    for playlist in range(playlists):
+        user_id = 10_000 + playlist
+        for index in range(playlist_size):
+            entry = ytdlp_entry((playlist % distinct) * playlist_size + index)
+            search = LegacyYoutubeSearch(
+                title=entry["title"],
+                audio_source=entry["url"],
+                thumbnail_url=entry["thumbnail"],
+                duration=entry["duration"],
+                duration_string=entry["duration_string"],
+                video_id=entry["display_id"],
+                video_url=entry["webpage_url"],
+                channel_id=entry["uploader_id"],
+                channel_name=entry["uploader"],
+                channel_url=entry["uploader_url"],
+            )
+            tracks.append(LegacyMusicApplication(search, f"user{user_id}", avatar_url(user_id), user_id))
+    return tracks
+
+
+def build_compact(playlists: int, playlist_size: int, distinct: int) -> List[MusicApplication]:
+    tracks = []
+    for playlist in range(playlists):
+        user_id = 10_000 + playlist
+        requester = get_requester(user_id, f"user{user_id}", avatar_url(user_id))
+        for index in range(playlist_size):
+            search = dict_to_youtube_search(ytdlp_entry((playlist % distinct) * playlist_size + index))
+            tracks.append(MusicApplication(youtube_search=search, requester=requester))
+    return tracks
+
+
+def measure(name: str, build: Callable[[int, int, int], list], playlists: int, playlist_size: int, distinct: int) -> None:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    tracks = build(playlists, playlist_size, distinct)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<8} tracks={len(tracks)} retained={current / 1024 / 1024:7.1f}MB "
+        f"per_track={current / len(tracks):6.0f}B build={elapsed:.2f}s"
+    )
+    del tracks
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="대기열 곡 표현의 메모리 사용량 비교 (기본 100k 곡)")
+    parser.add_argument("--playlists", type=int, default=20)
+    parser.add_argument("--playlist-size", type=int, default=5_000)
+    parser.add_argument(
+        "--distinct", type=int, default=0,
+        help="서로 다른 플레이리스트 수 (기본: playlists). 작게 주면 같은 곡이 여러 길드에 쌓인다",
+    )
+    args = parser.parse_args()
+    distinct = args.distinct or args.playlists
+    measure("legacy", build_legacy, args.playlists, args.playlist_size, distinct)
+    measure("compact", build_compact, args.playlists, args.playlist_size, distinct)
@@ -0,0 +1,33 @@
+import asyncio
+import os
+import sys
+
+from dotenv import load_dotenv
+
+# core.config 는 import 시점에 환경변수를 읽으므로 core 보다 먼저 .env 를 불러온다.
+load_dotenv()
+
+from core.cluster import ClusterSupervisor, fetch_recommended_shards
+from core.config import CLUSTER_IPC_PATH, CLUSTER_WORKERS, METRICS_PORT, SHARD_COUNT
+from core.util import logger
+
+
+async def main():
+    if SHARD_COUNT in ("", "auto"):
+        shard_count = await fetch_recommended_shards(os.environ["BOT_TOKEN"])
+    else:
+        shard_count = int(SHARD_COUNT)
+    # worker 하나가 최소 샤드 하나는 맡아야 한다.
+    workers = min(CLUSTER_WORKERS, shard_count)
+    supervisor = ClusterSupervisor(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")],
+        shard_count=shard_count,
+        workers=workers,
+        ipc_path=os.path.abspath(CLUSTER_IPC_PATH),
+        metrics_port=METRICS_PORT,
+    )
+    await supervisor.run()
+    logger.flush()
+
+
+asyncio.run(main())
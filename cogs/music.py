@@ -1,6 +1,8 @@
 import asyncio
 import time
-from typing import Dict, List, Optional, Sequence, Union
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import discord
 from discord.ext import commands
@@ -9,29 +11,136 @@ from discord.ext.commands import CommandError
 from discord.ui import View
 from discord.utils import MISSING
 
-from core.audio import create_audio_service
-from core.util import log_event
-from core.local.music import MusicDataSource
-from core.local.music.model import MusicModel
+from core.audio import AudioService, ShardedAudioService, get_audio_service
+from core.config import (
+    INTERACTION_ACK_SLO_MS,
+    PLAYLIST_PROGRESS_INTERVAL,
+    PLAYLIST_RESOLVE_WORKERS,
+    TRACK_LIST_MAX_TRACKS,
+)
+from core.util import log_event, logger, parse_track_list
+from core.local import LocalCore
+from core.metrics import metrics, tracer
+from core.local.music import MusicChannelRepository
 from core.model.music_application import MusicApplication
+from core.model.requester import requester_of
 from core.network import YoutubePlaylist, YoutubeSearch
+from core.network.resolve_deadline import ResolveTimeout, with_deadline
+from core.network.resolve_guard import ResolveCircuitOpen
+from core.network.resolve_pipeline import resolve_in_order
+from core.network.resolve_scheduler import BULK, INTERACTIVE, ResolveQueueFull, ResolveScheduler, resolve_scheduler
+from core.network.resolver_cassette import get_resolver_cassette
+from core.network.youtube.track_table import track_table
 from core.network.youtube.youtube_service import YoutubeService
 from embeds.music_embed import music_play_embed, music_pause_embed, music_stop_embed
-from views import get_music_view
+from views import get_music_view, register_music_views
 MAX_GUILD_ACTION_PENDING = 5
 
+RESOLVE_SECONDS = metrics.histogram("resolve_seconds", "Track resolution latency", ("source", "kind"))
+EMBED_EDIT_SECONDS = metrics.histogram("embed_edit_seconds", "Now-playing message edit latency")
+EMBED_EDIT_TOTAL = metrics.counter("embed_edit_total", "Now-playing message edits", ("result",))
+CONTROL_ACTIONS_TOTAL = metrics.counter("control_actions_total", "Music control button clicks", ("action",))
+INTERACTION_ACK_SECONDS = metrics.histogram(
+    "interaction_ack_seconds", "Time from a control click reaching the cog to its first response", ("action",)
+)
+INTERACTION_ACK_SLO_TOTAL = metrics.counter(
+    "interaction_ack_slo_total", "Control click acknowledgements within / over INTERACTION_ACK_SLO_MS", ("action", "result")
+)
+
+PLAYLIST_FIRST_TRACK_SECONDS = metrics.histogram(
+    "playlist_first_track_seconds", "Time from a playlist message to its first resolved track being queued"
+)
+PLAYLIST_IMPORT_SECONDS = metrics.histogram("playlist_import_seconds", "Time to resolve and queue a whole playlist")
+# 해석된 플레이리스트 곡을 큐에 넣는 단위. 진행률 갱신 간격 전이라도 이만큼 모이면 넣는다.
+PLAYLIST_BATCH_SIZE = 50
+TRACK_LIST_LINES_TOTAL = metrics.counter(
+    "track_list_lines_total", "Lines of pasted or attached track lists", ("result",)
+)
+TRACK_LIST_IMPORT_SECONDS = metrics.histogram(
+    "track_list_import_seconds", "Time to resolve and queue a pasted or attached track list"
+)
+# 곡 목록으로 읽는 첨부 파일 (확장자 또는 content type) 과 최대 크기
+TRACK_LIST_EXTENSIONS = (".txt", ".csv")
+TRACK_LIST_CONTENT_TYPES = ("text/plain", "text/csv")
+TRACK_LIST_MAX_BYTES = 256 * 1024
+
+
+@dataclass
+class PlaylistImport:
+    """길드에서 진행 중인 플레이리스트 추가 작업 하나 (임베드 진행률 표시용)"""
+    title: str
+    total: int
+    # 시작할 때의 큐 세대. 정지/퇴장으로 값이 바뀌면 남은 항목을 버린다.
+    generation: int
+    added: int = 0
+    failed: int = 0
+
+
+# 처리 중인 컨트롤 클릭의 (custom_id, 시작 시각). 첫 응답을 보낼 때 한 번만 기록하고 비운다.
+_pending_ack: ContextVar[Optional[Tuple[str, float]]] = ContextVar("pending_ack", default=None)
+
+
+def _mark_acknowledged() -> None:
+    pending = _pending_ack.get()
+    if pending is None:
+        return
+    _pending_ack.set(None)
+    action, started_at = pending
+    elapsed = time.monotonic() - started_at
+    INTERACTION_ACK_SECONDS.labels(action).observe(elapsed)
+    INTERACTION_ACK_SLO_TOTAL.labels(action, "ok" if elapsed * 1000 <= INTERACTION_ACK_SLO_MS else "breach").inc()
+
+
+def _bot_state(bot: commands.Bot, name: str) -> dict:
+    """cog reload 뒤에도 남아야 하는 길드별 상태를 봇에서 가져옵니다. 없으면 만들어 둔다."""
+    state = getattr(bot, name, None)
+    if state is None:
+        state = {}
+        setattr(bot, name, state)
+    return state
+
+
 class Music(commands.Cog):
-    def __init__(self, bot: commands.Bot):
+    def __init__(
+        self,
+        bot: commands.Bot,
+        *,
+        audio_service: Optional[Union[AudioService, ShardedAudioService]] = None,
+        music_channels: Optional[MusicChannelRepository] = None,
+        scheduler: Optional[ResolveScheduler] = None,
+    ):
         self.bot = bot
-        # key: guild_id, Value: channel_id
-        self.guild_channel: Dict[int, MusicModel] = {}
+        # 검색/해석 작업의 전역 동시 실행 제한 + 길드 간 공평 분배
+        self.resolve_scheduler = scheduler if scheduler is not None else resolve_scheduler
+        # 길드별 음악 채널 설정 (메모리 캐시 + SQLite write-through)
+        self.music_channels = music_channels if music_channels is not None else LocalCore.music_channels
         # Key: guild_id, Value: {"lock": asyncio.Lock, "pending": int}
         self.guild_action_state: Dict[int, Dict[str, object]] = {}
-        self.audio_service = create_audio_service(bot)
+        # 서비스처럼 봇에 둔다. reload 전의 cog 가 진행 중인 추가 작업도 새 cog 의 정지/퇴장을 보고 멈추고,
+        # 진행률도 새 cog 의 임베드에 나온다.
+        # Key: guild_id, Value: 진행 중인 플레이리스트 추가 작업
+        self.playlist_imports: Dict[int, List[PlaylistImport]] = _bot_state(bot, "playlist_imports")
+        # Key: guild_id, Value: 큐를 비울 때(정지/퇴장)마다 1씩 늘어나는 세대
+        self.queue_generations: Dict[int, int] = _bot_state(bot, "queue_generations")
+        # 서비스는 cog 보다 오래 산다. reload 된 cog 는 콜백만 자기 메서드로 바꿔 단다.
+        self.audio_service = audio_service if audio_service is not None else get_audio_service(bot)
         self.audio_service.on_track_start = self._on_track_start
         self.audio_service.on_queue_empty = self._on_queue_empty
+        self.audio_service.on_track_finish = LocalCore.play_history.record_track
+        # Key: button custom_id, Value: 컨트롤 핸들러
+        self.control_handlers: Dict[str, Callable[[Interaction], Awaitable[None]]] = {
+            "stop": self._on_stop_control,
+            "pause": self._on_pause_control,
+            "resume": self._on_resume_control,
+            "skip": self._on_skip_control,
+            "loop": self._on_loop_control,
+            "shuffle": self._on_shuffle_control,
+        }
         asyncio.run_coroutine_threadsafe(self.load_local_guild_channel(), self.bot.loop)
 
+    async def cog_load(self) -> None:
+        register_music_views(self.bot, self.on_music_control)
+
     def build_queue_preview(self, queue: List[MusicApplication], max_items: int = 5) -> Optional[str]:
         if not queue:
             return None
@@ -40,18 +149,21 @@ class Music(commands.Cog):
             lines.append(f"... 외 {len(queue) - max_items}곡")
         return "\n".join(lines)
 
+    def build_playlist_progress(self, guild_id: int) -> Optional[str]:
+        jobs = self.playlist_imports.get(guild_id)
+        if not jobs:
+            return None
+        return "\n".join(f"{job.title} ({job.added + job.failed}/{job.total})" for job in jobs)
+
     async def _search_tracks_ytdlp(self, query: str, requester: discord.abc.User):
         search_result = await YoutubeService.search(query)
         if search_result is None:
             return [], None, None
 
+        track_requester = requester_of(requester)
+
         def to_app(item: YoutubeSearch) -> MusicApplication:
-            return MusicApplication(
-                youtube_search=item,
-                user_id=requester.id,
-                user_name=requester.name,
-                user_icon=requester.display_avatar.url,
-            )
+            return MusicApplication(youtube_search=item, requester=track_requester)
 
         if isinstance(search_result, YoutubePlaylist):
             tracks = [to_app(x) for x in search_result.songs]
@@ -63,30 +175,38 @@ class Music(commands.Cog):
         self, query: str, requester: discord.abc.User, limit: Optional[int] = None
     ):
         backend = self.audio_service.backend
-        if not hasattr(backend, "_node") or backend._node is None:
-            log_event("lavalink search skipped: backend._node is None")
+        node = getattr(backend, "_node", None)
+        cassette = get_resolver_cassette()
+        if node is None and not cassette.replaying:
+            logger.warning("lavalink_search_skipped", reason="no_node")
             return [], None, None
 
-        from core.network.youtube.internal.youtube_utile import is_youtube_url
+        from core.network.youtube.internal.youtube_utile import is_playlist_url, is_youtube_url
 
         lavalink_query = query if is_youtube_url(query) else f"ytsearch:{query}"
-        log_event(f"lavalink search query={lavalink_query}")
+        # 마감 시간만 종류별로 다르다. 지연 메트릭은 예전처럼 search 하나로 남긴다.
+        deadline_kind = "playlist" if is_youtube_url(query) and is_playlist_url(query) else "search"
         start_time = time.monotonic()
-        results = await backend._node.get_tracks(query=lavalink_query)
+        with tracer.span("lavalink.search"):
+            results = await with_deadline(
+                cassette.lavalink(lavalink_query, lambda: node.get_tracks(query=lavalink_query)),
+                "lavalink",
+                deadline_kind,
+            )
+        RESOLVE_SECONDS.labels("lavalink", "search").observe(time.monotonic() - start_time)
         elapsed_ms = (time.monotonic() - start_time) * 1000
-        log_event(f"lavalink_search elapsed_ms={elapsed_ms:.1f}")
         if results is None:
-            log_event("lavalink search result: None")
+            logger.info("lavalink_search", query=lavalink_query, elapsed_ms=round(elapsed_ms, 1), result="none")
             return [], None, None
 
         playlist_title = None
         playlist_count = None
         if isinstance(results, list):
             tracks = results
-            log_event(f"lavalink search result: list size={len(tracks)}")
+            result_type = "list"
         elif hasattr(results, "tracks"):
             tracks = list(results.tracks)
-            log_event(f"lavalink search result: tracks size={len(tracks)}")
+            result_type = "playlist"
             playlist_info = getattr(results, "playlist_info", None)
             if playlist_info is not None:
                 playlist_title = getattr(playlist_info, "name", None) or getattr(playlist_info, "title", None)
@@ -94,10 +214,16 @@ class Music(commands.Cog):
             playlist_count = len(tracks)
         else:
             tracks = [results]
-            log_event("lavalink search result: single track object")
-
+            result_type = "track"
+
+        logger.info(
+            "lavalink_search",
+            query=lavalink_query,
+            elapsed_ms=round(elapsed_ms, 1),
+            result=result_type,
+            size=len(tracks),
+        )
         if not tracks:
-            log_event("lavalink search result: empty tracks")
             return [], None, None
         if limit is not None and limit > 0:
             tracks = tracks[:limit]
@@ -106,31 +232,34 @@ class Music(commands.Cog):
             title = getattr(track, "title", "Unknown")
             uri = getattr(track, "uri", "") or ""
             identifier = getattr(track, "identifier", "") or ""
-            duration = getattr(track, "length", 0) or 0
+            # Lavalink 는 길이를 ms 로 준다. yt-dlp 결과와 같은 초 단위로 맞춘다.
+            duration = (getattr(track, "length", 0) or 0) // 1000
+            minutes, seconds = divmod(duration, 60)
+            hours, minutes = divmod(minutes, 60)
+            duration_string = f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
             author = getattr(track, "author", "") or ""
             thumbnail = getattr(track, "thumbnail", None)
             if not thumbnail and identifier:
                 thumbnail = f"https://i.ytimg.com/vi/{identifier}/hqdefault.jpg"
             video_url = uri or (f"https://www.youtube.com/watch?v={identifier}" if identifier else "")
-            return YoutubeSearch(
+            return track_table.intern(YoutubeSearch(
                 audio_source=uri or video_url,
                 title=title,
                 thumbnail_url=thumbnail or "",
                 duration=duration,
-                duration_string="",
+                duration_string=duration_string,
                 video_id=identifier,
                 video_url=video_url,
                 channel_id="",
                 channel_url="",
                 channel_name=author,
-            )
+            ))
 
-        tracks_app = [MusicApplication(
-            youtube_search=to_youtube_search(t),
-            user_id=requester.id,
-            user_name=requester.name,
-            user_icon=requester.display_avatar.url,
-        ) for t in tracks]
+        track_requester = requester_of(requester)
+        tracks_app = [
+            MusicApplication(youtube_search=to_youtube_search(t), requester=track_requester)
+            for t in tracks
+        ]
 
         return tracks_app, playlist_title, playlist_count
 
@@ -156,14 +285,9 @@ class Music(commands.Cog):
         if resolved is None:
             return [], None, None
         total_ms = (time.monotonic() - total_start) * 1000
-        log_event(f"hybrid_resolve elapsed_ms={total_ms:.1f}")
+        logger.info("hybrid_resolve", elapsed_ms=round(total_ms, 1))
 
-        app = MusicApplication(
-            youtube_search=resolved,
-            user_id=requester.id,
-            user_name=requester.name,
-            user_icon=requester.display_avatar.url,
-        )
+        app = MusicApplication(youtube_search=resolved, requester=requester_of(requester))
         return [app], None, None
 
     async def _search_tracks(self, query: str, requester: discord.abc.User, limit: Optional[int] = None):
@@ -176,6 +300,10 @@ class Music(commands.Cog):
         return await self._search_tracks_ytdlp(query, requester)
 
     async def refresh_now_playing_embed(self, guild_id: int, *, is_paused: bool = False):
+        with tracer.span("refresh_now_playing_embed"):
+            await self._refresh_now_playing_embed(guild_id, is_paused=is_paused)
+
+    async def _refresh_now_playing_embed(self, guild_id: int, *, is_paused: bool):
         status = await self.audio_service.get_status(guild_id)
         if status is None or status.now_playing is None:
             return
@@ -201,6 +329,9 @@ class Music(commands.Cog):
         queue_preview = self.build_queue_preview(status.queue)
         if queue_preview:
             embed.add_field(name="대기열", value=queue_preview, inline=False)
+        playlist_progress = self.build_playlist_progress(guild_id)
+        if playlist_progress:
+            embed.add_field(name="플레이리스트 추가 중", value=playlist_progress, inline=False)
         await self.music_message_edit(
             guild_id=guild_id,
             embed=embed,
@@ -218,14 +349,12 @@ class Music(commands.Cog):
         )
 
     async def load_local_guild_channel(self):
-        local_default_channels = await MusicDataSource.get_all()
-        for i in local_default_channels:
-            self.guild_channel[i.guild_id] = i
+        await self.music_channels.load()
         log_event("로컬에서 Music 채널 불러옴.")
-        log_event(f"guild_channel={self.guild_channel}")
+        log_event(f"guild_channel_count={len(self.music_channels)}")
 
     def guild_channel_ids(self) -> List[int]:
-        return [model.channel_id for model in self.guild_channel.values()]
+        return self.music_channels.channel_ids()
 
     def _get_action_state(self, guild_id: int) -> Dict[str, object]:
         state = self.guild_action_state.get(guild_id)
@@ -257,6 +386,7 @@ class Music(commands.Cog):
                 await ctx.response.send_message(content, delete_after=delete_after, ephemeral=ephemeral)
         else:
             await ctx.send(content, delete_after=delete_after)
+        _mark_acknowledged()
 
     async def _run_serialized_action(
         self,
@@ -277,6 +407,7 @@ class Music(commands.Cog):
 
         if isinstance(ctx, Interaction) and not ctx.response.is_done() and pending:
             await ctx.response.defer()
+            _mark_acknowledged()
 
         state["pending"] = pending + 1 if isinstance(pending, int) else 1
         try:
@@ -284,9 +415,12 @@ class Music(commands.Cog):
             if not isinstance(lock, asyncio.Lock):
                 lock = asyncio.Lock()
                 state["lock"] = lock
-            async with lock:
-                await action_coro()
-            await self._send_action_message(ctx, success_message)
+            with tracer.span("serialized_action") as span:
+                span.set("pending", state["pending"])
+                async with lock:
+                    await action_coro()
+            with tracer.span("send_action_message"):
+                await self._send_action_message(ctx, success_message)
         except CommandError as exc:
             await self._send_action_message(
                 ctx,
@@ -303,7 +437,7 @@ class Music(commands.Cog):
         )
 
     async def get_channel_message(self, guild_id: int) -> Optional[discord.Message]:
-        music_model = self.guild_channel.get(guild_id, None)
+        music_model = self.music_channels.get(guild_id)
         if music_model is None:
             return None
         
@@ -352,11 +486,13 @@ class Music(commands.Cog):
     async def loop(self, ctx: commands.Context):
         message = await self._loop(ctx)
         await ctx.send(message)
+        await self.refresh_current_embed(ctx.guild.id)
 
     @commands.command("셔플", aliases=["shuffle"])
     async def shuffle(self, ctx: commands.Context):
         message = await self._shuffle(ctx)
         await ctx.send(message)
+        await self.refresh_current_embed(ctx.guild.id)
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member: discord.Member, before: VoiceState, after: VoiceState):
@@ -396,6 +532,8 @@ class Music(commands.Cog):
         await self.audio_service.play_next(guild_id, beforeMusic)
 
     async def clear_guild_queue(self, guild_id: int):
+        # 진행 중인 플레이리스트 추가가 비운 큐를 다시 채우지 않게 한다.
+        self.queue_generations[guild_id] = self.queue_generations.get(guild_id, 0) + 1
         await self.audio_service.stop(guild_id)
         await self.audio_service.disconnect(guild_id)
         await self.music_message_edit(
@@ -417,24 +555,28 @@ class Music(commands.Cog):
         allowed_mentions: Optional[AllowedMentions] = MISSING,
         view: Optional[View] = MISSING,
     ):
+        start_time = time.monotonic()
+        result = "edited"
         try:
             message = await self.get_channel_message(guild_id)
             if message is None:
+                result = "skipped"
                 log_event("music_message_edit aborted: channel/message fetch failed")
                 return
-            await message.edit(
-                content=content,
-                embed=embed,
-                embeds=embeds,
-                attachments=attachments,
-                suppress=suppress,
-                delete_after=delete_after,
-                allowed_mentions=allowed_mentions,
-                view=view
-            )
+            with tracer.span("message.edit"):
+                await message.edit(
+                    content=content,
+                    embed=embed,
+                    embeds=embeds,
+                    attachments=attachments,
+                    suppress=suppress,
+                    delete_after=delete_after,
+                    allowed_mentions=allowed_mentions,
+                    view=view
+                )
         except discord.NotFound:
             try:
-                channel = await self.bot.fetch_channel(self.guild_channel[guild_id].channel_id)
+                channel = await self.bot.fetch_channel(self.music_channels.get(guild_id).channel_id)
                 new_message = await channel.send(
                     content=content,
                     embed=embed,
@@ -445,14 +587,24 @@ class Music(commands.Cog):
                     allowed_mentions=allowed_mentions,
                     view=view
                 )
-                self.guild_channel[guild_id].message_id = new_message.id
-                await MusicDataSource.update_message_id(
+                result = "recreated"
+                await self.music_channels.update_message_id(
                     guild_id=guild_id,
                     message_id=new_message.id,
                 )
             except:
-                del self.guild_channel[guild_id]
-                await MusicDataSource.delete(guild_id)
+                result = "failed"
+                await self.music_channels.delete(guild_id)
+        finally:
+            EMBED_EDIT_SECONDS.observe(time.monotonic() - start_time)
+            EMBED_EDIT_TOTAL.labels(result).inc()
+
+    async def refresh_current_embed(self, guild_id: int):
+        """
+        loop/shuffle 이후 호출합니다. 응답(ack)을 먼저 보낸 뒤 현재 상태로 임베드를 고칩니다.
+        """
+        status = await self.audio_service.get_status(guild_id)
+        await self.refresh_now_playing_embed(guild_id, is_paused=status.is_paused if status else False)
 
     async def _pause(self, ctx: commands.Context | Interaction):
         self.check_voice_play(ctx)
@@ -461,12 +613,10 @@ class Music(commands.Cog):
             raise CommandError("??? ??????????? ??? ?????")
 
         await self.audio_service.pause(ctx.guild.id)
-        await self.refresh_now_playing_embed(ctx.guild.id, is_paused=True)
 
     async def _resume(self, ctx: commands.Context | Interaction):
         self.check_voice_play(ctx)
         await self.audio_service.resume(ctx.guild.id)
-        await self.refresh_now_playing_embed(ctx.guild.id, is_paused=False)
 
     async def _stop(self, ctx: commands.Context | Interaction):
         self.check_voice_play(ctx)
@@ -479,12 +629,6 @@ class Music(commands.Cog):
     async def _loop(self, ctx: commands.Context | Interaction) -> str:
         self.check_voice_play(ctx)
         loop_enabled = await self.audio_service.toggle_loop(ctx.guild.id)
-        status = await self.audio_service.get_status(ctx.guild.id)
-        is_paused = status.is_paused if status else False
-        await self.refresh_now_playing_embed(
-            ctx.guild.id,
-            is_paused=is_paused
-        )
         state = "???" if loop_enabled else "???"
         return f"?????{state}??? ????????"
 
@@ -494,30 +638,13 @@ class Music(commands.Cog):
         if status is None or len(status.queue) < 2:
             raise CommandError("???????? ???????")
         await self.audio_service.shuffle(ctx.guild.id)
-        await self.refresh_now_playing_embed(
-            ctx.guild.id,
-            is_paused=status.is_paused
-        )
         return "?????????????."
 
     @app_commands.command(name="채널설정")
     async def set_channel(self, interaction: Interaction, channel: discord.TextChannel):
         message = await channel.send(embed=music_stop_embed())
 
-        if await MusicDataSource.get(interaction.guild_id) is not None:
-            await MusicDataSource.update(
-                guild_id=interaction.guild.id,
-                message_id=message.id,
-                channel_id=channel.id,
-            )
-        else:
-            await MusicDataSource.insert(
-                guild_id=interaction.guild.id,
-                channel_id=channel.id,
-                message_id=message.id
-            )
-
-        self.guild_channel[interaction.guild.id] = MusicModel(
+        await self.music_channels.set_channel(
             guild_id=interaction.guild.id,
             channel_id=channel.id,
             message_id=message.id,
@@ -525,71 +652,79 @@ class Music(commands.Cog):
         await interaction.response.send_message(f"성공적으로 채널을 설정하였습니다!")
 
 
-    @commands.Cog.listener()
-    async def on_interaction(self, interaction: Interaction):
-        try:
-            if (interaction.client.user.id != self.bot.user.id 
-                or interaction.type != discord.InteractionType.component 
-                or interaction.data.get("custom_id", None) is None):
-                return
-            log_event(interaction.message)
+    async def _on_stop_control(self, interaction: Interaction) -> None:
+        self.check_voice_play(interaction)
+        # 정지는 백엔드 정지, 음성 연결 해제, 메인 메시지 수정(REST 조회와 재시도 대기 포함)까지 기다려야 하므로
+        # 클릭부터 먼저 확인해 두고 나머지는 그 뒤에 처리한다.
+        if not interaction.response.is_done():
+            await interaction.response.defer()
+            _mark_acknowledged()
+        await self._run_serialized_action(
+            interaction,
+            lambda: self.clear_guild_queue(interaction.guild.id),
+            success_message="음악 재생을 초기화했어요",
+        )
 
-            custom_id = interaction.data["custom_id"]
-            if custom_id == "stop":
-                return await self._run_serialized_action(
-                    interaction,
-                    lambda: self._stop(interaction),
-                    success_message="음악 재생을 초기화했어요",
-                )
-            elif custom_id == "pause":
-                await self._pause(interaction)
-                return await self._send_action_message(
-                    interaction,
-                    "음악 재생을 일시정지 했어요",
-                )
-            elif custom_id == "resume":
-                await self._resume(interaction)
-                return await self._send_action_message(
-                    interaction,
-                    "음악 재생을 재개 했어요",
-                )
-            elif custom_id == "skip":
-                return await self._run_serialized_action(
-                    interaction,
-                    lambda: self._skip(interaction),
-                    success_message="음악 재생을 넘겼어요",
-                )
-            elif custom_id == "loop":
-                message = await self._loop(interaction)
-                return await self._send_action_message(interaction, message)
-            elif custom_id == "shuffle":
-                message = await self._shuffle(interaction)
-                return await self._send_action_message(interaction, message)
+    async def _on_pause_control(self, interaction: Interaction) -> None:
+        await self._pause(interaction)
+        await self._send_action_message(interaction, "음악 재생을 일시정지 했어요")
+        await self.refresh_now_playing_embed(interaction.guild.id, is_paused=True)
+
+    async def _on_resume_control(self, interaction: Interaction) -> None:
+        await self._resume(interaction)
+        await self._send_action_message(interaction, "음악 재생을 재개 했어요")
+        await self.refresh_now_playing_embed(interaction.guild.id, is_paused=False)
+
+    async def _on_skip_control(self, interaction: Interaction) -> None:
+        await self._run_serialized_action(
+            interaction,
+            lambda: self._skip(interaction),
+            success_message="음악 재생을 넘겼어요",
+        )
 
+    async def _on_loop_control(self, interaction: Interaction) -> None:
+        message = await self._loop(interaction)
+        await self._send_action_message(interaction, message)
+        await self.refresh_current_embed(interaction.guild.id)
 
+    async def _on_shuffle_control(self, interaction: Interaction) -> None:
+        message = await self._shuffle(interaction)
+        await self._send_action_message(interaction, message)
+        await self.refresh_current_embed(interaction.guild.id)
 
-            await self._send_action_message(
-                interaction,
-                f"{interaction.data['custom_id']} 버튼이 클릭되었습니다!",
-            )
-        except Exception as exception:
-            if isinstance(exception, CommandError):
-                return await self._send_action_message(
+    async def on_music_control(self, interaction: Interaction, custom_id: str) -> None:
+        """
+        persistent music view 의 버튼 콜백에서 호출됩니다. custom_id 로 핸들러를 바로 찾습니다.
+        """
+        handler = self.control_handlers.get(custom_id)
+        if handler is None:
+            return
+        CONTROL_ACTIONS_TOTAL.labels(custom_id).inc()
+        logger.info("control", custom_id=custom_id, guild_id=interaction.guild_id)
+        token = _pending_ack.set((custom_id, time.monotonic()))
+        with tracer.start_trace(f"control:{custom_id}", guild_id=interaction.guild_id):
+            try:
+                await handler(interaction)
+            except CommandError as exception:
+                await self._send_action_message(
                     interaction,
                     f"{exception.args[0]}",
                     ephemeral=True,
                 )
-            raise exception
+            finally:
+                _pending_ack.reset(token)
 
     @commands.command("일시정지")
     async def pause(self, ctx: commands.Context):
         await self._pause(ctx)
         await ctx.send("음악 재생을 일시정지 했어요")
+        await self.refresh_now_playing_embed(ctx.guild.id, is_paused=True)
 
     @commands.command("재개")
     async def resume(self, ctx: commands.Context):
         await self._resume(ctx)
         await ctx.send("음악 재생을 재개 했어요")
+        await self.refresh_now_playing_embed(ctx.guild.id, is_paused=False)
 
     @commands.command("정지")
     async def stop(self, ctx: commands.Context):
@@ -613,7 +748,7 @@ class Music(commands.Cog):
         if (
                 message.author.bot or
                 isinstance(message.channel, discord.channel.DMChannel) or
-                message.channel.id not in self.guild_channel_ids()
+                not self.music_channels.is_music_channel(message.channel.id)
         ): return
 
         if message.author.voice is None:
@@ -623,6 +758,10 @@ class Music(commands.Cog):
         if existing_state is not None and message.author.voice.channel.id != existing_state.voice_channel_id:
             return
 
+        with tracer.start_trace("on_message", guild_id=message.guild.id):
+            await self._handle_music_message(message)
+
+    async def _handle_music_message(self, message: discord.Message):
         await self.ensure_voice_model(message)
 
         async def delete_message():
@@ -633,22 +772,50 @@ class Music(commands.Cog):
 
         await delete_message()
 
-        tracks, playlist_title, playlist_count = await self._search_tracks(message.content, message.author, limit=1)
-
         async def send_and_delete_message(content: str):
             await message.channel.send(content, delete_after=5)
 
+        try:
+            track_list = await self._read_track_list(message)
+        except CommandError as exc:
+            await send_and_delete_message(exc.args[0])
+            return
+        if track_list is not None:
+            await self._import_track_list(message, track_list, send_and_delete_message)
+            return
+
+        from core.network.youtube.internal.youtube_utile import is_playlist_url, is_youtube_url
+
+        from core.config import AUDIO_BACKEND
+
+        query = message.content
+        # 플레이리스트 확장은 단일 곡 검색보다 뒤로 미룬다.
+        priority = BULK if is_youtube_url(query) and is_playlist_url(query) else INTERACTIVE
+        if priority == BULK and AUDIO_BACKEND != "lavalink":
+            # Lavalink 는 플레이리스트 전체를 loadtracks 한 번으로 돌려주므로 기존 경로를 쓴다.
+            await self._import_playlist(message, query, send_and_delete_message)
+            return
+        try:
+            async with self.resolve_scheduler.slot(message.guild.id, priority):
+                with tracer.span("search_tracks") as span:
+                    tracks, playlist_title, playlist_count = await self._search_tracks(query, message.author, limit=1)
+                    span.set("tracks", len(tracks))
+        except (ResolveQueueFull, ResolveTimeout, ResolveCircuitOpen) as exc:
+            await send_and_delete_message(self._resolve_failure_message(exc))
+            return
+
         if not tracks:
             await send_and_delete_message("노래를 찾지 못했어요..")
             return
 
         await self.audio_service.enqueue_and_play(message.guild.id, message.author.voice.channel, tracks)
 
-        if playlist_title:
-            count_text = playlist_count if playlist_count is not None else len(tracks)
-            await send_and_delete_message(f"{playlist_title} 플레이 리스트를 추가했어요!\n추가된 곡 수: {count_text}")
-        else:
-            await send_and_delete_message(f"{tracks[0].youtube_search.title} 곡을 추가했어요!")
+        with tracer.span("send_added_message"):
+            if playlist_title:
+                count_text = playlist_count if playlist_count is not None else len(tracks)
+                await send_and_delete_message(f"{playlist_title} 플레이 리스트를 추가했어요!\n추가된 곡 수: {count_text}")
+            else:
+                await send_and_delete_message(f"{tracks[0].youtube_search.title} 곡을 추가했어요!")
 
         status = await self.audio_service.get_status(message.guild.id)
         if status:
@@ -658,14 +825,275 @@ class Music(commands.Cog):
             )
 
 
+    @staticmethod
+    def _resolve_failure_message(exc: Exception) -> str:
+        if isinstance(exc, ResolveQueueFull):
+            return "검색 요청이 너무 많아요. 잠시 후 다시 시도해 주세요."
+        if isinstance(exc, ResolveTimeout):
+            return "검색이 너무 오래 걸려서 멈췄어요. 잠시 후 다시 시도해 주세요."
+        return f"유튜브가 요청을 제한하고 있어요. {max(1, round(exc.retry_after))}초 후에 다시 시도해 주세요."
 
+    def _bulk_resolve_slot(self, guild_id: int):
+        # 플레이리스트 항목과 곡 목록의 한 줄은 길드 대기열이 차 있어도 거절하지 않고 순서대로 기다린다.
+        # 대기열 길이에도 세지 않으므로 그 길드의 단일 곡 검색이 거절되지 않고 먼저 들어간다.
+        return self.resolve_scheduler.slot(guild_id, BULK, limit_queue=False)
+
+    async def _import_playlist(
+        self,
+        message: discord.Message,
+        query: str,
+        send_and_delete_message: Callable[[str], Awaitable[None]],
+    ) -> None:
+        """
+        플레이리스트는 항목 목록만 먼저 받고, 항목은 PLAYLIST_RESOLVE_WORKERS 개씩 동시에 해석합니다.
+        첫 곡은 해석되는 즉시 재생하고 나머지는 도착하는 대로 순서를 지켜 큐 뒤에 붙인다.
+        진행률은 PLAYLIST_PROGRESS_INTERVAL 초마다 임베드에 반영하고, 정지/퇴장으로 큐가 비면 남은 항목은 버린다.
+        """
+        guild_id = message.guild.id
+        started_at = time.monotonic()
+        try:
+            async with self.resolve_scheduler.slot(guild_id, BULK):
+                with tracer.span("playlist.list") as span:
+                    listing = await YoutubeService.playlist_entries(query)
+                    span.set("entries", len(listing[1]) if listing else 0)
+        except (ResolveQueueFull, ResolveTimeout, ResolveCircuitOpen) as exc:
+            await send_and_delete_message(self._resolve_failure_message(exc))
+            return
+        if listing is None:
+            await send_and_delete_message("노래를 찾지 못했어요..")
+            return
 
+        title, entries = listing
+        job = PlaylistImport(title=title, total=len(entries), generation=self.queue_generations.get(guild_id, 0))
+        self.playlist_imports.setdefault(guild_id, []).append(job)
+        voice_channel = message.author.voice.channel
+        track_requester = requester_of(message.author)
+        batch: List[MusicApplication] = []
+        failure: Optional[str] = None
+        first_track_ms: Optional[float] = None
+
+        def stopped() -> bool:
+            return self.queue_generations.get(guild_id, 0) != job.generation
+
+        async def flush() -> None:
+            nonlocal first_track_ms
+            if not batch or stopped():
+                return
+            tracks = list(batch)
+            batch.clear()
+            first = job.added == 0
+            # 첫 곡 재생 시작(on_track_start)의 임베드가 진행률을 바로 보여 주도록 먼저 센다.
+            job.added += len(tracks)
+            await self.audio_service.enqueue_and_play(guild_id, voice_channel, tracks)
+            if first:
+                elapsed = time.monotonic() - started_at
+                first_track_ms = round(elapsed * 1000, 1)
+                PLAYLIST_FIRST_TRACK_SECONDS.observe(elapsed)
+
+        stream = YoutubeService.playlist_stream(
+            entries,
+            workers=PLAYLIST_RESOLVE_WORKERS,
+            slot=lambda: self._bulk_resolve_slot(guild_id),
+        )
+        last_progress = time.monotonic()
+        try:
+            with tracer.span("playlist.resolve") as span:
+                async for search in stream:
+                    if stopped():
+                        break
+                    if search is None:
+                        job.failed += 1
+                        continue
+                    batch.append(MusicApplication(youtube_search=search, requester=track_requester))
+                    if job.added == 0 or len(batch) >= PLAYLIST_BATCH_SIZE:
+                        await flush()
+                    if time.monotonic() - last_progress >= PLAYLIST_PROGRESS_INTERVAL:
+                        await flush()
+                        await self.refresh_current_embed(guild_id)
+                        last_progress = time.monotonic()
+                await flush()
+                span.set("added", job.added)
+                span.set("failed", job.failed)
+        except ResolveCircuitOpen as exc:
+            # 이미 해석한 곡은 넣고, 남은 항목은 차단기가 닫힌 뒤 다시 요청하게 한다.
+            await flush()
+            failure = self._resolve_failure_message(exc)
+        finally:
+            await stream.aclose()
+            jobs = self.playlist_imports.get(guild_id)
+            if jobs is not None:
+                jobs.remove(job)
+                if not jobs:
+                    self.playlist_imports.pop(guild_id, None)
+
+        elapsed = time.monotonic() - started_at
+        PLAYLIST_IMPORT_SECONDS.observe(elapsed)
+        logger.info(
+            "playlist_import",
+            guild_id=guild_id,
+            entries=job.total,
+            added=job.added,
+            failed=job.failed,
+            stopped=stopped(),
+            first_track_ms=first_track_ms,
+            elapsed_ms=round(elapsed * 1000, 1),
+        )
 
+        with tracer.span("send_added_message"):
+            if stopped():
+                await send_and_delete_message(f"{title} 플레이 리스트 추가를 멈췄어요.")
+                return
+            if job.added == 0:
+                await send_and_delete_message(failure or "노래를 찾지 못했어요..")
+                return
+            content = f"{title} 플레이 리스트를 추가했어요!\n추가된 곡 수: {job.added}"
+            if job.failed:
+                content += f"\n추가하지 못한 곡 수: {job.failed}"
+            if failure:
+                content += f"\n{failure}"
+            await send_and_delete_message(content)
 
+        await self.refresh_current_embed(guild_id)
 
+    async def _read_track_list(self, message: discord.Message) -> Optional[List[str]]:
+        """
+        첨부한 .txt/.csv 파일이나 여러 줄 메시지를 곡 목록으로 읽습니다. 한 곡짜리 메시지면 None 이다.
+        :raise CommandError: 파일이 너무 크거나 읽을 수 없을 때
+        """
+        queries = parse_track_list(message.content)
+        attachments = [
+            attachment for attachment in message.attachments
+            if attachment.filename.lower().endswith(TRACK_LIST_EXTENSIONS)
+            or (attachment.content_type or "").startswith(TRACK_LIST_CONTENT_TYPES)
+        ]
+        for attachment in attachments:
+            if attachment.size > TRACK_LIST_MAX_BYTES:
+                raise CommandError(f"곡 목록 파일은 {TRACK_LIST_MAX_BYTES // 1024}KB 까지만 읽을 수 있어요.")
+            try:
+                data = await attachment.read()
+            except discord.HTTPException:
+                raise CommandError("곡 목록 파일을 읽지 못했어요. 잠시 후 다시 시도해 주세요.")
+            csv_format = attachment.filename.lower().endswith(".csv") or (
+                (attachment.content_type or "").startswith("text/csv")
+            )
+            queries.extend(parse_track_list(data.decode("utf-8-sig", errors="replace"), csv_format=csv_format))
+        if not attachments and len(queries) < 2:
+            return None
+        return queries
 
+    async def _import_track_list(
+        self,
+        message: discord.Message,
+        queries: List[str],
+        send_and_delete_message: Callable[[str], Awaitable[None]],
+    ) -> None:
+        """
+        곡 목록을 작업 하나로 처리합니다. 같은 곡(같은 video id, 같은 검색어)은 한 번만 넣고,
+        이미 해석된 영상은 track_table 에서 바로 가져오며, 나머지는 PLAYLIST_RESOLVE_WORKERS 개씩 동시에 해석한다.
+        모두 끝나면 목록 순서대로 한 번에 큐에 넣고, 안내 메시지와 임베드 갱신도 한 번씩만 한다.
+        """
+        from core.network.youtube.internal.youtube_utile import get_video_id
+
+        guild_id = message.guild.id
+        started_at = time.monotonic()
+        generation = self.queue_generations.get(guild_id, 0)
+        seen = set()
+        unique: List[str] = []
+        for query in queries:
+            key = get_video_id(query) or " ".join(query.casefold().split())
+            if key not in seen:
+                seen.add(key)
+                unique.append(query)
+        duplicates = len(queries) - len(unique)
+        truncated = max(0, len(unique) - TRACK_LIST_MAX_TRACKS)
+        unique = unique[:TRACK_LIST_MAX_TRACKS]
+        if duplicates:
+            TRACK_LIST_LINES_TOTAL.labels("duplicate").inc(duplicates)
+        if truncated:
+            TRACK_LIST_LINES_TOTAL.labels("truncated").inc(truncated)
+        if not unique:
+            await send_and_delete_message("노래를 찾지 못했어요..")
+            return
 
+        track_requester = requester_of(message.author)
+
+        async def resolve(query: str) -> List[MusicApplication]:
+            video_id = get_video_id(query)
+            cached = track_table.get(video_id) if video_id else None
+            if cached is not None:
+                # 만료된 스트림 URL 은 재생 직전에 다시 해석되므로 메타데이터만 있으면 된다.
+                TRACK_LIST_LINES_TOTAL.labels("cached").inc()
+                return [MusicApplication(youtube_search=cached, requester=track_requester)]
+            async with self._bulk_resolve_slot(guild_id):
+                try:
+                    found, _, _ = await self._search_tracks(query, message.author, limit=1)
+                except ResolveTimeout:
+                    found = []
+            TRACK_LIST_LINES_TOTAL.labels("ok" if found else "failed").inc()
+            return found
+
+        tracks: List[MusicApplication] = []
+        failed = 0
+        failure: Optional[str] = None
+        stream = resolve_in_order(unique, resolve, workers=PLAYLIST_RESOLVE_WORKERS)
+        try:
+            with tracer.span("track_list.resolve") as span:
+                span.set("lines", len(unique))
+                async for found in stream:
+                    if self.queue_generations.get(guild_id, 0) != generation:
+                        break
+                    if found:
+                        tracks.extend(found)
+                    else:
+                        failed += 1
+        except ResolveCircuitOpen as exc:
+            # 이미 해석한 곡은 넣고, 남은 줄은 차단기가 닫힌 뒤 다시 요청하게 한다.
+            failure = self._resolve_failure_message(exc)
+        finally:
+            await stream.aclose()
+
+        stopped = self.queue_generations.get(guild_id, 0) != generation
+        was_idle = True
+        if tracks and not stopped:
+            status = await self.audio_service.get_status(guild_id)
+            was_idle = status is None or status.now_playing is None
+            await self.audio_service.enqueue_and_play(guild_id, message.author.voice.channel, tracks)
+
+        elapsed = time.monotonic() - started_at
+        TRACK_LIST_IMPORT_SECONDS.observe(elapsed)
+        logger.info(
+            "track_list_import",
+            guild_id=guild_id,
+            lines=len(queries),
+            duplicates=duplicates,
+            truncated=truncated,
+            added=len(tracks),
+            failed=failed,
+            stopped=stopped,
+            elapsed_ms=round(elapsed * 1000, 1),
+        )
 
+        with tracer.span("send_added_message"):
+            if stopped:
+                await send_and_delete_message("곡 목록 추가를 멈췄어요.")
+                return
+            if not tracks:
+                await send_and_delete_message(failure or "노래를 찾지 못했어요..")
+                return
+            content = f"곡 목록을 추가했어요!\n추가된 곡 수: {len(tracks)}"
+            if failed:
+                content += f"\n찾지 못한 곡 수: {failed}"
+            if duplicates:
+                content += f"\n중복이라 뺀 곡 수: {duplicates}"
+            if truncated:
+                content += f"\n한 번에 {TRACK_LIST_MAX_TRACKS}곡까지만 추가해서 뺀 곡 수: {truncated}"
+            if failure:
+                content += f"\n{failure}"
+            await send_and_delete_message(content)
+
+        # 쉬고 있던 길드는 첫 곡 재생(on_track_start)이 임베드를 이미 갱신했다.
+        if not was_idle:
+            await self.refresh_current_embed(guild_id)
 
 
 async def setup(bot):
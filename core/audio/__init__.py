@@ -1,2 +1,3 @@
-from .factory import create_audio_service
+from .factory import create_audio_service, get_audio_service
 from .service import AudioService
+from .sharded import ShardedAudioService
\ No newline at end of file
@@ -1,18 +1,30 @@
 from __future__ import annotations
 
 import asyncio
+from typing import Union
 
 import discord
 
-from core.audio.ffmpeg_backend import FFmpegBackend
-from core.audio.lavalink_backend import LavalinkBackend
-from core.audio.hybrid_backend import HybridBackend
 from core.audio.service import AudioService
+from core.audio.sharded import ShardedAudioService
 from core.config import AUDIO_BACKEND, LAVALINK_HOST, LAVALINK_IDENTIFIER, LAVALINK_PASSWORD, LAVALINK_PORT
+from core.model.music_application import MusicApplication
+from core.network.resolve_scheduler import INTERACTIVE, resolve_scheduler
+from core.network.youtube.youtube_service import YoutubeService
 
 
-def create_audio_service(bot: discord.Client) -> AudioService:
+async def refresh_track_stream(guild_id: int, track: MusicApplication) -> bool:
+    # 재생이 멈춘 길드를 기다리게 하는 요청이므로 단일 곡 검색과 같은 우선순위로 줄을 선다.
+    # 플레이리스트/곡 목록 추가로 길드 대기열이 차 있어도 거절되면 곡을 건너뛰게 되므로 상한을 적용하지 않는다.
+    async with resolve_scheduler.slot(guild_id, INTERACTIVE, limit_queue=False):
+        return await YoutubeService.refresh_stream(track.youtube_search)
+
+
+def create_audio_service(bot: discord.Client) -> Union[AudioService, ShardedAudioService]:
+    # 선택한 백엔드 모듈만 불러온다.
     if AUDIO_BACKEND == "lavalink":
+        from core.audio.lavalink_backend import LavalinkBackend
+
         backend = LavalinkBackend(
             host=LAVALINK_HOST,
             port=LAVALINK_PORT,
@@ -20,6 +32,8 @@ def create_audio_service(bot: discord.Client) -> AudioService:
             identifier=LAVALINK_IDENTIFIER,
         )
     elif AUDIO_BACKEND == "hybrid":
+        from core.audio.hybrid_backend import HybridBackend
+
         backend = HybridBackend(
             host=LAVALINK_HOST,
             port=LAVALINK_PORT,
@@ -27,8 +41,29 @@ def create_audio_service(bot: discord.Client) -> AudioService:
             identifier=LAVALINK_IDENTIFIER,
         )
     else:
+        from core.audio.ffmpeg_backend import FFmpegBackend
+
         backend = FFmpegBackend()
 
-    service = AudioService(backend, bot.loop)
+    if isinstance(bot, discord.AutoShardedClient):
+        service = ShardedAudioService(backend, bot.loop, lambda: bot.shard_count or 1)
+    else:
+        service = AudioService(backend, bot.loop)
+    # Lavalink 는 재생할 때 video_url 로 직접 해석하므로 FFmpeg 로 재생할 때만 스트림 URL 을 검사한다.
+    if AUDIO_BACKEND != "lavalink":
+        service.stream_refresher = refresh_track_stream
     asyncio.run_coroutine_threadsafe(service.connect(bot), bot.loop)
     return service
+
+
+
+def get_audio_service(bot: discord.Client) -> Union[AudioService, ShardedAudioService]:
+    """
+    봇마다 하나만 만들어 bot.audio_service 에 둡니다. Music cog 를 reload 해도 같은 서비스를 다시 쓰므로
+    큐, 재생 중인 곡, 음성 연결이 그대로 남고 다시 검색하지 않습니다.
+    """
+    service = getattr(bot, "audio_service", None)
+    if service is None:
+        service = create_audio_service(bot)
+        bot.audio_service = service
+    return service
\ No newline at end of file
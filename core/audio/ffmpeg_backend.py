@@ -5,7 +5,9 @@ from typing import Dict
 import discord
 
 from core.audio.backend import AudioBackend, OnTrackEnd
+from core.metrics import tracer
 from core.model.music_application import MusicApplication
+from core.network.youtube.track_table import track_table
 
 FFMPEG_OPTIONS = {
     "before_options": "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5",
@@ -39,8 +41,11 @@ class FFmpegBackend(AudioBackend):
         if player is None or not player.is_connected():
             raise RuntimeError("Voice client is not connected.")
 
-        source = discord.FFmpegPCMAudio(track.youtube_search.audio_source, **FFMPEG_OPTIONS)
-        player.play(source, after=on_end)
+        # FFmpeg 프로세스 생성은 이벤트 루프 스레드에서 동기로 일어난다.
+        with tracer.span("ffmpeg.spawn"):
+            # 스트림 URL 은 길드 간에 공유되는 track_table 에서 가장 최근 값을 읽는다.
+            source = discord.FFmpegPCMAudio(track_table.stream_url(track.youtube_search), **FFMPEG_OPTIONS)
+            player.play(source, after=on_end)
 
     async def stop(self, guild_id: int) -> None:
         player = self._players.get(guild_id)
@@ -6,6 +6,7 @@ from typing import Dict
 import discord
 
 from core.audio.backend import AudioBackend, OnTrackEnd
+from core.metrics import tracer
 from core.model.music_application import MusicApplication
 
 
@@ -51,12 +52,13 @@ class LavalinkBackend(AudioBackend):
         if player is None or not (player.is_connected() if callable(player.is_connected) else player.is_connected):
             raise RuntimeError("Lavalink player is not connected.")
 
-        if hasattr(player, "get_tracks"):
-            results = await player.get_tracks(query=track.youtube_search.video_url)
-        else:
-            if self._node is None:
-                raise RuntimeError("Lavalink node is not ready.")
-            results = await self._node.get_tracks(query=track.youtube_search.video_url)
+        with tracer.span("lavalink.get_tracks"):
+            if hasattr(player, "get_tracks"):
+                results = await player.get_tracks(query=track.youtube_search.video_url)
+            else:
+                if self._node is None:
+                    raise RuntimeError("Lavalink node is not ready.")
+                results = await self._node.get_tracks(query=track.youtube_search.video_url)
         if results is None:
             raise RuntimeError("No Lavalink tracks found.")
 
@@ -70,7 +72,8 @@ class LavalinkBackend(AudioBackend):
         if not tracks:
             raise RuntimeError("No Lavalink tracks found.")
 
-        await player.play(track=tracks[0])
+        with tracer.span("lavalink.player.play"):
+            await player.play(track=tracks[0])
         self._start_monitor(guild_id, player, on_end)
 
     def _start_monitor(self, guild_id: int, player, on_end: OnTrackEnd) -> None:
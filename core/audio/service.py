@@ -3,18 +3,47 @@ from __future__ import annotations
 import asyncio
 import random
 import time
-from typing import Awaitable, Callable, Dict, Iterable, Optional
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set
 
 import discord
 
 from core.audio.backend import AudioBackend
 from core.audio.models import AudioState, AudioStatus
+from core.metrics import metrics, tracer
 from core.model.music_application import MusicApplication
-from core.util import log_event
+from core.network.youtube.track_table import track_table
+from core.util import logger
 from core.config import AUDIO_BACKEND
 
 
+PLAYBACK_START_SECONDS = metrics.histogram(
+    "playback_start_seconds", "Time from enqueue on an idle guild to backend.play returning", ("engine",)
+)
+TRANSITION_GAP_SECONDS = metrics.histogram(
+    "track_transition_gap_seconds", "Time from a track ending to the next track starting", ("engine",)
+)
+PLAY_FAILURES = metrics.counter("play_failures_total", "backend.play failures", ("engine",))
+STREAM_REFRESH_TOTAL = metrics.counter(
+    "stream_refresh_total", "Stream URL re-resolutions right before playback", ("reason", "result")
+)
+STREAM_EARLY_EXIT_TOTAL = metrics.counter(
+    "stream_early_exit_total", "Tracks that ended right after starting without a skip", ("action",)
+)
+ACTIVE_GUILDS = metrics.gauge("audio_active_guilds", "Guilds with an audio state")
+PLAYING_GUILDS = metrics.gauge("audio_playing_guilds", "Guilds with a track now playing")
+QUEUED_TRACKS = metrics.gauge("audio_queued_tracks", "Tracks waiting in all guild queues")
+SHARD_ACTIVE_GUILDS = metrics.gauge("audio_shard_active_guilds", "Guilds with an audio state per shard", ("shard",))
+SHARD_PLAYING_GUILDS = metrics.gauge("audio_shard_playing_guilds", "Guilds with a track now playing per shard", ("shard",))
+SHARD_QUEUED_TRACKS = metrics.gauge("audio_shard_queued_tracks", "Tracks waiting in guild queues per shard", ("shard",))
+
 OnGuildEvent = Callable[[int], Awaitable[None]]
+# (guild_id, track, played_seconds, skipped) — 재생 경로에서 호출되므로 I/O 없이 바로 반환해야 한다.
+OnTrackFinish = Callable[[int, MusicApplication, float, bool], None]
+# (guild_id, track) — 곡 하나의 스트림 URL 을 다시 해석해 track_table 에 반영하고 성공 여부를 돌려준다.
+StreamRefresher = Callable[[int, MusicApplication], Awaitable[bool]]
+
+# 스킵 없이 이 시간 안에 끝난 곡은 스트림 URL 이 만료/거부(403)되어 FFmpeg 가 바로 종료된 것으로 본다.
+EARLY_EXIT_SECONDS = 3.0
 
 
 class AudioService:
@@ -25,14 +54,40 @@ class AudioService:
         *,
         on_track_start: Optional[OnGuildEvent] = None,
         on_queue_empty: Optional[OnGuildEvent] = None,
+        on_track_finish: Optional[OnTrackFinish] = None,
+        stream_refresher: Optional[StreamRefresher] = None,
+        shard_id: Optional[int] = None,
     ) -> None:
         self.backend = backend
+        self.shard_id = shard_id
         self.loop = loop
         self.states: Dict[int, AudioState] = {}
         self._locks: Dict[int, asyncio.Lock] = {}
         self._play_start_times: Dict[int, float] = {}
+        self._track_started_at: Dict[int, float] = {}
+        # 곡 종료 콜백 시각 (다음 곡까지의 전환 간격 측정용)
+        self._track_ended_at: Dict[int, float] = {}
+        self._playback_start_seconds = PLAYBACK_START_SECONDS.labels(AUDIO_BACKEND)
+        self._transition_gap_seconds = TRANSITION_GAP_SECONDS.labels(AUDIO_BACKEND)
+        self._play_failures = PLAY_FAILURES.labels(AUDIO_BACKEND)
+        if shard_id is None:
+            ACTIVE_GUILDS.set_function(self.active_guild_count)
+            PLAYING_GUILDS.set_function(self.playing_guild_count)
+            QUEUED_TRACKS.set_function(self.queued_track_count)
+        else:
+            # 샤드 파티션이면 전체 합계는 ShardedAudioService 가 노출한다.
+            SHARD_ACTIVE_GUILDS.labels(str(shard_id)).set_function(self.active_guild_count)
+            SHARD_PLAYING_GUILDS.labels(str(shard_id)).set_function(self.playing_guild_count)
+            SHARD_QUEUED_TRACKS.labels(str(shard_id)).set_function(self.queued_track_count)
+        # skip/stop/disconnect 로 중단된 길드 (다음 곡 종료 시 skipped 로 기록)
+        self._interrupted: Set[int] = set()
+        # 바로 끝나서 한 번 다시 해석해 재시도 중인 곡 (길드당 하나)
+        self._stream_retried: Dict[int, MusicApplication] = {}
         self.on_track_start = on_track_start
         self.on_queue_empty = on_queue_empty
+        self.on_track_finish = on_track_finish
+        # None 이면 스트림 URL 을 검사하지 않는다 (Lavalink 는 재생할 때 직접 해석한다).
+        self.stream_refresher = stream_refresher
 
     async def connect(self, bot: discord.Client) -> None:
         await self.backend.connect(bot)
@@ -47,9 +102,21 @@ class AudioService:
     def has_state(self, guild_id: int) -> bool:
         return guild_id in self.states
 
+    def active_guild_count(self) -> int:
+        return len(self.states)
+
+    def playing_guild_count(self) -> int:
+        return sum(1 for s in self.states.values() if s.now_playing is not None)
+
+    def queued_track_count(self) -> int:
+        return sum(len(s.queue) for s in self.states.values())
+
     async def ensure_state(self, guild_id: int, voice_channel: discord.VoiceChannel) -> AudioState:
-        await self.backend.ensure_player(guild_id, voice_channel)
+        with tracer.span("backend.ensure_player"):
+            await self.backend.ensure_player(guild_id, voice_channel)
+        return self._state_for(guild_id, voice_channel)
 
+    def _state_for(self, guild_id: int, voice_channel: discord.VoiceChannel) -> AudioState:
         state = self.states.get(guild_id)
         if state is None or state.voice_channel_id != voice_channel.id:
             state = AudioState(
@@ -87,17 +154,25 @@ class AudioService:
         voice_channel: discord.VoiceChannel,
         tracks: Iterable[MusicApplication],
     ) -> None:
-        async with self._get_lock(guild_id):
-            state = await self.ensure_state(guild_id, voice_channel)
-            state.queue.extend(tracks)
-            should_start = state.now_playing is None
-            if should_start:
-                self._play_start_times[guild_id] = time.monotonic()
+        # 음성 연결(ensure_player)은 수 초가 걸릴 수 있으므로 락 밖에서 하고, 큐 변경만 직렬화한다.
+        # 길드 락 안에서는 await 하지 않으므로 pause/resume 같은 컨트롤이 연결을 기다리지 않는다.
+        with tracer.span("backend.ensure_player"):
+            await self.backend.ensure_player(guild_id, voice_channel)
+        with tracer.span("audio.enqueue"):
+            async with self._get_lock(guild_id):
+                state = self._state_for(guild_id, voice_channel)
+                state.queue.extend(tracks)
+                should_start = state.now_playing is None
+                if should_start:
+                    self._play_start_times[guild_id] = time.monotonic()
 
         if should_start:
-            await self.play_next(guild_id)
+            with tracer.span("audio.play_next"):
+                await self.play_next(guild_id)
 
     async def play_next(self, guild_id: int, previous: Optional[MusicApplication] = None) -> None:
+        if previous is not None:
+            self._finish_track(guild_id, previous)
         while True:
             queue_empty_callback = None
             next_track = None
@@ -114,6 +189,7 @@ class AudioService:
                     state.is_paused = False
                     queue_empty_callback = self.on_queue_empty
                     self._play_start_times.pop(guild_id, None)
+                    self._track_ended_at.pop(guild_id, None)
                 else:
                     next_track = state.queue.pop(0)
             if next_track is None:
@@ -126,17 +202,31 @@ class AudioService:
                     state = self.states.get(guild_id)
                     if state is not None:
                         state.queue.insert(0, next_track)
-                log_event(f"play_next skipped: already playing, re-queued track guild_id={guild_id}")
+                logger.info("play_next_skipped", reason="already_playing", guild_id=guild_id)
                 return
 
+            if not await self._ensure_fresh_stream(guild_id, next_track):
+                previous = None
+                continue
+
             try:
-                await self.backend.play(guild_id, next_track, self._on_track_end(guild_id, next_track))
+                with tracer.span("backend.play"):
+                    await self.backend.play(guild_id, next_track, self._on_track_end(guild_id, next_track))
+                now = time.monotonic()
                 start_time = self._play_start_times.pop(guild_id, None)
                 if start_time is not None:
-                    elapsed_ms = (time.monotonic() - start_time) * 1000
-                    log_event(
-                        f"playback_start engine={AUDIO_BACKEND} guild_id={guild_id} elapsed_ms={elapsed_ms:.1f}"
+                    self._playback_start_seconds.observe(now - start_time)
+                    logger.info(
+                        "playback_start",
+                        engine=AUDIO_BACKEND,
+                        guild_id=guild_id,
+                        elapsed_ms=round((now - start_time) * 1000, 1),
                     )
+                ended_at = self._track_ended_at.pop(guild_id, None)
+                if ended_at is not None:
+                    self._transition_gap_seconds.observe(now - ended_at)
+                self._track_started_at[guild_id] = now
+                self._interrupted.discard(guild_id)
                 async with self._get_lock(guild_id):
                     state = self.states.get(guild_id)
                     if state is not None:
@@ -146,7 +236,8 @@ class AudioService:
                     await self.on_track_start(guild_id)
                 return
             except Exception as exc:
-                log_event(f"play_next failed: {exc}")
+                self._play_failures.inc()
+                logger.error("play_next_failed", guild_id=guild_id, error=repr(exc))
                 async with self._get_lock(guild_id):
                     state = self.states.get(guild_id)
                     if state is not None and state.now_playing == next_track:
@@ -160,9 +251,83 @@ class AudioService:
                 previous = None
                 continue
 
+    def _finish_track(self, guild_id: int, track: MusicApplication) -> None:
+        started_at = self._track_started_at.pop(guild_id, None)
+        skipped = guild_id in self._interrupted
+        self._interrupted.discard(guild_id)
+        if started_at is None or self.on_track_finish is None:
+            return
+        try:
+            self.on_track_finish(guild_id, track, time.monotonic() - started_at, skipped)
+        except Exception as exc:
+            logger.error("on_track_finish_failed", guild_id=guild_id, error=repr(exc))
+
+    async def _ensure_fresh_stream(self, guild_id: int, track: MusicApplication) -> bool:
+        """
+        재생 직전에 스트림 URL 이 만료되었거나 무효화되었으면 그 곡만 다시 해석합니다.
+        다시 해석하지 못하면 False 이고, 그 곡은 FFmpeg 를 띄우지 않고 건너뛴다.
+        """
+        if self.stream_refresher is None or not track_table.is_stale(track.youtube_search):
+            return True
+        reason = "early_exit" if self._stream_retried.get(guild_id) is track else "expired"
+        try:
+            with tracer.span("audio.refresh_stream"):
+                refreshed = await self.stream_refresher(guild_id, track)
+        except Exception as exc:
+            logger.error("stream_refresh_error", guild_id=guild_id, error=repr(exc))
+            refreshed = False
+        STREAM_REFRESH_TOTAL.labels(reason, "ok" if refreshed else "failed").inc()
+        if not refreshed:
+            self._stream_retried.pop(guild_id, None)
+            logger.warning(
+                "stream_refresh_failed",
+                guild_id=guild_id,
+                video_id=track.youtube_search.video_id,
+                reason=reason,
+            )
+        return refreshed
+
+    async def _after_track(self, guild_id: int, previous: MusicApplication, error: Optional[Exception]) -> None:
+        started_at = self._track_started_at.get(guild_id)
+        ended_at = self._track_ended_at.get(guild_id, time.monotonic())
+        duration = previous.youtube_search.duration or 0
+        early_exit = (
+            self.stream_refresher is not None
+            and started_at is not None
+            and guild_id not in self._interrupted
+            and (error is not None or (ended_at - started_at < EARLY_EXIT_SECONDS and duration > 2 * EARLY_EXIT_SECONDS))
+        )
+        retried = self._stream_retried.pop(guild_id, None)
+        if early_exit and retried is not previous:
+            # 스트림 URL 을 무효화하고 같은 곡을 맨 앞에 다시 넣는다. play_next 가 다시 해석한 뒤 재생한다.
+            STREAM_EARLY_EXIT_TOTAL.labels("retry").inc()
+            logger.warning(
+                "stream_early_exit",
+                guild_id=guild_id,
+                video_id=previous.youtube_search.video_id,
+                played_ms=round((ended_at - started_at) * 1000, 1),
+                error=repr(error) if error else None,
+            )
+            track_table.invalidate(previous.youtube_search.video_id)
+            self._track_started_at.pop(guild_id, None)
+            async with self._get_lock(guild_id):
+                state = self.states.get(guild_id)
+                if state is None:
+                    return
+                state.queue.insert(0, previous)
+            self._stream_retried[guild_id] = previous
+            await self.play_next(guild_id)
+            return
+        if early_exit:
+            STREAM_EARLY_EXIT_TOTAL.labels("gave_up").inc()
+            logger.warning("stream_early_exit_gave_up", guild_id=guild_id, video_id=previous.youtube_search.video_id)
+        await self.play_next(guild_id, previous)
+
     def _on_track_end(self, guild_id: int, previous: MusicApplication):
-        def _callback(_: Optional[Exception] = None) -> None:
-            asyncio.run_coroutine_threadsafe(self.play_next(guild_id, previous), self.loop)
+        def _callback(error: Optional[Exception] = None) -> None:
+            # FFmpeg 재생 스레드에서 호출될 수 있으므로 시각만 남기고 처리는 루프로 넘긴다.
+            self._track_ended_at[guild_id] = time.monotonic()
+            asyncio.run_coroutine_threadsafe(self._after_track(guild_id, previous, error), self.loop)
 
         return _callback
 
@@ -191,14 +356,18 @@ class AudioService:
             state.now_playing = None
             state.is_paused = False
             self._play_start_times.pop(guild_id, None)
+            self._interrupted.add(guild_id)
         await self.backend.stop(guild_id)
+        self._track_ended_at.pop(guild_id, None)
 
     async def skip(self, guild_id: int) -> None:
+        self._interrupted.add(guild_id)
         await self.backend.skip(guild_id)
 
     async def disconnect(self, guild_id: int) -> None:
         async with self._get_lock(guild_id):
             self.states.pop(guild_id, None)
+            self._interrupted.add(guild_id)
             self._play_start_times.pop(guild_id, None)
         await self.backend.disconnect(guild_id)
 
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, Dict, Iterable, Iterator, Mapping, Optional
+
+import discord
+
+from core.audio.backend import AudioBackend
+from core.audio.models import AudioState, AudioStatus
+from core.audio.service import (
+    ACTIVE_GUILDS,
+    PLAYING_GUILDS,
+    QUEUED_TRACKS,
+    AudioService,
+    OnGuildEvent,
+    OnTrackFinish,
+    StreamRefresher,
+)
+from core.model.music_application import MusicApplication
+from core.util import shard_id_for
+
+
+class _ShardedStates(Mapping[int, AudioState]):
+    """샤드별 states 를 하나의 읽기 전용 dict 처럼 보여줍니다. get() 은 해당 샤드만 찾습니다."""
+
+    def __init__(self, service: "ShardedAudioService") -> None:
+        self._service = service
+
+    def __getitem__(self, guild_id: int) -> AudioState:
+        return self._service.partition(guild_id).states[guild_id]
+
+    def get(self, guild_id: int, default=None):
+        return self._service.partition(guild_id).states.get(guild_id, default)
+
+    def __contains__(self, guild_id: object) -> bool:
+        return isinstance(guild_id, int) and guild_id in self._service.partition(guild_id).states
+
+    def __iter__(self) -> Iterator[int]:
+        for partition in list(self._service.partitions.values()):
+            yield from partition.states
+
+    def __len__(self) -> int:
+        return sum(len(partition.states) for partition in self._service.partitions.values())
+
+
+class ShardedAudioService:
+    """
+    AudioService 를 샤드 단위로 나눕니다. 길드는 Discord 와 같은 규칙으로 샤드에 배정되고,
+    샤드마다 별도의 AudioService(상태, 락, 샤드 라벨이 붙은 게이지)를 둡니다.
+    백엔드(FFmpeg 음성 클라이언트 / Lavalink 노드)는 모든 샤드가 공유합니다.
+    AudioService 와 같은 메서드를 제공하므로 cog 는 어느 쪽인지 신경 쓰지 않습니다.
+    """
+
+    def __init__(
+        self,
+        backend: AudioBackend,
+        loop: asyncio.AbstractEventLoop,
+        shard_count: Callable[[], int],
+    ) -> None:
+        self.backend = backend
+        self.loop = loop
+        self.partitions: Dict[int, AudioService] = {}
+        # AutoShardedBot 은 로그인 후에야 샤드 수를 알 수 있으므로 호출 시점에 읽는다.
+        self._shard_count = shard_count
+        self._on_track_start: Optional[OnGuildEvent] = None
+        self._on_queue_empty: Optional[OnGuildEvent] = None
+        self._on_track_finish: Optional[OnTrackFinish] = None
+        self._stream_refresher: Optional[StreamRefresher] = None
+        self.states = _ShardedStates(self)
+        ACTIVE_GUILDS.set_function(lambda: sum(p.active_guild_count() for p in self.partitions.values()))
+        PLAYING_GUILDS.set_function(lambda: sum(p.playing_guild_count() for p in self.partitions.values()))
+        QUEUED_TRACKS.set_function(lambda: sum(p.queued_track_count() for p in self.partitions.values()))
+
+    def partition(self, guild_id: int) -> AudioService:
+        shard_id = shard_id_for(guild_id, self._shard_count())
+        partition = self.partitions.get(shard_id)
+        if partition is None:
+            partition = AudioService(
+                self.backend,
+                self.loop,
+                on_track_start=self._on_track_start,
+                on_queue_empty=self._on_queue_empty,
+                on_track_finish=self._on_track_finish,
+                stream_refresher=self._stream_refresher,
+                shard_id=shard_id,
+            )
+            self.partitions[shard_id] = partition
+        return partition
+
+    @property
+    def on_track_start(self) -> Optional[OnGuildEvent]:
+        return self._on_track_start
+
+    @on_track_start.setter
+    def on_track_start(self, callback: Optional[OnGuildEvent]) -> None:
+        self._on_track_start = callback
+        for partition in self.partitions.values():
+            partition.on_track_start = callback
+
+    @property
+    def on_queue_empty(self) -> Optional[OnGuildEvent]:
+        return self._on_queue_empty
+
+    @on_queue_empty.setter
+    def on_queue_empty(self, callback: Optional[OnGuildEvent]) -> None:
+        self._on_queue_empty = callback
+        for partition in self.partitions.values():
+            partition.on_queue_empty = callback
+
+    @property
+    def on_track_finish(self) -> Optional[OnTrackFinish]:
+        return self._on_track_finish
+
+    @on_track_finish.setter
+    def on_track_finish(self, callback: Optional[OnTrackFinish]) -> None:
+        self._on_track_finish = callback
+        for partition in self.partitions.values():
+            partition.on_track_finish = callback
+
+    @property
+    def stream_refresher(self) -> Optional[StreamRefresher]:
+        return self._stream_refresher
+
+    @stream_refresher.setter
+    def stream_refresher(self, refresher: Optional[StreamRefresher]) -> None:
+        self._stream_refresher = refresher
+        for partition in self.partitions.values():
+            partition.stream_refresher = refresher
+
+    async def connect(self, bot: discord.Client) -> None:
+        await self.backend.connect(bot)
+
+    def has_state(self, guild_id: int) -> bool:
+        return self.partition(guild_id).has_state(guild_id)
+
+    def active_guild_count(self) -> int:
+        return sum(partition.active_guild_count() for partition in self.partitions.values())
+
+    def playing_guild_count(self) -> int:
+        return sum(partition.playing_guild_count() for partition in self.partitions.values())
+
+    def queued_track_count(self) -> int:
+        return sum(partition.queued_track_count() for partition in self.partitions.values())
+
+    async def ensure_state(self, guild_id: int, voice_channel: discord.VoiceChannel) -> AudioState:
+        return await self.partition(guild_id).ensure_state(guild_id, voice_channel)
+
+    async def get_status(self, guild_id: int) -> Optional[AudioStatus]:
+        return await self.partition(guild_id).get_status(guild_id)
+
+    async def enqueue(self, guild_id: int, tracks: Iterable[MusicApplication]) -> None:
+        await self.partition(guild_id).enqueue(guild_id, tracks)
+
+    async def enqueue_and_play(
+        self,
+        guild_id: int,
+        voice_channel: discord.VoiceChannel,
+        tracks: Iterable[MusicApplication],
+    ) -> None:
+        await self.partition(guild_id).enqueue_and_play(guild_id, voice_channel, tracks)
+
+    async def play_next(self, guild_id: int, previous: Optional[MusicApplication] = None) -> None:
+        await self.partition(guild_id).play_next(guild_id, previous)
+
+    async def pause(self, guild_id: int) -> None:
+        await self.partition(guild_id).pause(guild_id)
+
+    async def resume(self, guild_id: int) -> None:
+        await self.partition(guild_id).resume(guild_id)
+
+    async def stop(self, guild_id: int) -> None:
+        await self.partition(guild_id).stop(guild_id)
+
+    async def skip(self, guild_id: int) -> None:
+        await self.partition(guild_id).skip(guild_id)
+
+    async def disconnect(self, guild_id: int) -> None:
+        await self.partition(guild_id).disconnect(guild_id)
+
+    async def toggle_loop(self, guild_id: int) -> bool:
+        return await self.partition(guild_id).toggle_loop(guild_id)
+
+    async def shuffle(self, guild_id: int) -> None:
+        await self.partition(guild_id).shuffle(guild_id)
@@ -0,0 +1,3 @@
+from .client import ClusterClient
+from .protocol import IpcConnection, IpcError
+from .supervisor import ClusterSupervisor, WorkerProcess, fetch_recommended_shards, split_shards
\ No newline at end of file
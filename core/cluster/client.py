@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Dict, Optional
+
+from core.cluster.protocol import STREAM_LIMIT, Handler, IpcConnection, IpcError
+from core.util import logger
+
+
+class ClusterClient:
+    """
+    worker 쪽 IPC 연결입니다. supervisor 에 접속해 cluster_id 를 알리고,
+    supervisor 가 보내는 요청(stats 등)은 handlers 로 처리합니다.
+    """
+
+    def __init__(self, ipc_path: str, cluster_id: int) -> None:
+        self.ipc_path = ipc_path
+        self.cluster_id = cluster_id
+        self.handlers: Dict[str, Handler] = {}
+        self.shard_count: Optional[int] = None
+        self.workers: Optional[int] = None
+        self._connection: Optional[IpcConnection] = None
+        self._serve_task: Optional[asyncio.Task] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None and not self._connection.closed
+
+    async def connect(self, *, attempts: int = 10, delay: float = 0.5) -> None:
+        for attempt in range(attempts):
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.ipc_path, limit=STREAM_LIMIT)
+                break
+            except (FileNotFoundError, ConnectionError):
+                if attempt == attempts - 1:
+                    raise
+                await asyncio.sleep(delay)
+        self._connection = IpcConnection(reader, writer, self.handlers)
+        self._serve_task = asyncio.create_task(self._connection.serve(), name="cluster-ipc")
+        hello = await self._connection.request("hello", {"cluster_id": self.cluster_id, "pid": os.getpid()})
+        self.shard_count = hello["shard_count"]
+        self.workers = hello["workers"]
+        logger.info("cluster_connected", cluster_id=self.cluster_id, workers=self.workers)
+
+    async def request(self, op: str, data: Any = None, *, timeout: float = 10.0) -> Any:
+        if not self.connected:
+            raise IpcError("not connected to the cluster supervisor")
+        return await self._connection.request(op, data, timeout=timeout)
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+        if self._serve_task is not None:
+            await asyncio.gather(self._serve_task, return_exceptions=True)
+        self._connection = None
+        self._serve_task = None
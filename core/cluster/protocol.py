@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from core.util import logger
+
+# 요청 데이터를 받아 JSON 으로 직렬화 가능한 결과를 돌려준다.
+Handler = Callable[[Any], Awaitable[Any]]
+
+# 통계 응답에 샤드별 정보가 들어가므로 기본 64KiB 보다 넉넉하게 둔다.
+STREAM_LIMIT = 1 << 20
+
+
+class IpcError(Exception):
+    pass
+
+
+class IpcConnection:
+    """
+    supervisor 와 worker 사이의 Unix 소켓 연결 하나입니다. 메시지는 한 줄에 JSON 하나이며
+    양쪽 모두 요청을 보낼 수 있습니다.
+
+    - 요청: {"id": 1, "op": "stats", "data": ...}
+    - 응답: {"id": 1, "reply": true, "data": ...} 또는 {"id": 1, "reply": true, "error": "..."}
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        handlers: Optional[Dict[str, Handler]] = None,
+    ) -> None:
+        self.handlers: Dict[str, Handler] = handlers if handlers is not None else {}
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.closed = False
+
+    async def request(self, op: str, data: Any = None, *, timeout: float = 5.0) -> Any:
+        if self.closed:
+            raise IpcError("connection closed")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._send({"id": request_id, "op": op, "data": data})
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def serve(self) -> None:
+        """연결이 끊길 때까지 메시지를 읽습니다. 요청은 태스크로 처리하므로 느린 핸들러가 응답 수신을 막지 않습니다."""
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    logger.warning("ipc_bad_message", size=len(line))
+                    continue
+                if message.get("reply"):
+                    future = self._pending.get(message.get("id"))
+                    if future is not None and not future.done():
+                        if "error" in message:
+                            future.set_exception(IpcError(message["error"]))
+                        else:
+                            future.set_result(message.get("data"))
+                    continue
+                task = asyncio.create_task(self._dispatch(message))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            await self.close()
+
+    async def _dispatch(self, message: Dict[str, Any]) -> None:
+        reply: Dict[str, Any] = {"id": message.get("id"), "reply": True}
+        handler = self.handlers.get(message.get("op"))
+        if handler is None:
+            reply["error"] = f"unknown op: {message.get('op')}"
+        else:
+            try:
+                reply["data"] = await handler(message.get("data"))
+            except Exception as exc:
+                reply["error"] = repr(exc)
+        try:
+            await self._send(reply)
+        except (ConnectionError, IpcError):
+            pass
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        if self.closed:
+            raise IpcError("connection closed")
+        self._writer.write(json.dumps(message, ensure_ascii=False, default=str).encode() + b"\n")
+        await self._writer.drain()
+
+    async def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(IpcError("connection closed"))
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except Exception:
+            pass
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from core.cluster.protocol import STREAM_LIMIT, IpcConnection, IpcError
+from core.util import logger
+
+GATEWAY_BOT_URL = "https://discord.com/api/v10/gateway/bot"
+
+
+def split_shards(shard_count: int, workers: int) -> List[List[int]]:
+    """샤드를 worker 수만큼 연속 구간으로 나눕니다. 앞쪽 worker 가 하나씩 더 가질 수 있습니다."""
+    workers = max(1, min(workers, shard_count))
+    size, extra = divmod(shard_count, workers)
+    ranges = []
+    start = 0
+    for index in range(workers):
+        end = start + size + (1 if index < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+async def fetch_recommended_shards(token: str) -> int:
+    import aiohttp
+
+    async with aiohttp.ClientSession() as session:
+        async with session.get(GATEWAY_BOT_URL, headers={"Authorization": f"Bot {token}"}) as response:
+            response.raise_for_status()
+            payload = await response.json()
+    return int(payload["shards"])
+
+
+@dataclass
+class WorkerProcess:
+    cluster_id: int
+    shard_ids: List[int]
+    process: Optional[asyncio.subprocess.Process] = None
+    connection: Optional[IpcConnection] = None
+    started_at: float = 0.0
+    restarts: int = 0
+
+    @property
+    def shard_spec(self) -> str:
+        return f"{self.shard_ids[0]}-{self.shard_ids[-1]}"
+
+
+class ClusterSupervisor:
+    """
+    worker 프로세스(app.py) N 개를 띄우고 각자 연속된 샤드 구간을 맡깁니다.
+
+    - worker 가 죽으면 지수 백오프(restart_backoff)로 다시 띄웁니다. stable_after 초 이상 살아 있었다면 백오프를 초기화합니다.
+    - Unix 소켓(ipc_path)으로 worker 들과 연결을 유지하고, owner 명령용 요청(cluster_stats, restart)을 처리합니다.
+    - SIGINT/SIGTERM 을 받으면 worker 들에 SIGTERM 을 보내 정상 종료(로컬 DB flush 포함)를 기다립니다.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        *,
+        shard_count: int,
+        workers: int,
+        ipc_path: str,
+        metrics_port: int = 0,
+        restart_backoff: Sequence[float] = (1.0, 60.0),
+        stable_after: float = 60.0,
+        shutdown_timeout: float = 15.0,
+    ) -> None:
+        self.command = list(command)
+        self.shard_count = shard_count
+        self.ipc_path = ipc_path
+        self.metrics_port = metrics_port
+        self.restart_backoff = restart_backoff
+        self.stable_after = stable_after
+        self.shutdown_timeout = shutdown_timeout
+        self.workers = [
+            WorkerProcess(cluster_id, shard_ids)
+            for cluster_id, shard_ids in enumerate(split_shards(shard_count, workers))
+        ]
+        self._stopping = asyncio.Event()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stop)
+        if os.path.exists(self.ipc_path):
+            os.unlink(self.ipc_path)
+        self._server = await asyncio.start_unix_server(self._on_connect, self.ipc_path, limit=STREAM_LIMIT)
+        logger.info(
+            "cluster_start",
+            shard_count=self.shard_count,
+            workers=[worker.shard_spec for worker in self.workers],
+            ipc_path=self.ipc_path,
+        )
+        watchers = [asyncio.create_task(self._watch(worker)) for worker in self.workers]
+        await self._stopping.wait()
+        await asyncio.gather(*(self._terminate(worker) for worker in self.workers))
+        for watcher in watchers:
+            watcher.cancel()
+        await asyncio.gather(*watchers, return_exceptions=True)
+        self._server.close()
+        await self._server.wait_closed()
+        if os.path.exists(self.ipc_path):
+            os.unlink(self.ipc_path)
+        logger.info("cluster_stop")
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def _worker_env(self, worker: WorkerProcess) -> Dict[str, str]:
+        env = dict(os.environ)
+        env.update(
+            SHARD_COUNT=str(self.shard_count),
+            SHARD_IDS=worker.shard_spec,
+            CLUSTER_ID=str(worker.cluster_id),
+            CLUSTER_IPC_PATH=self.ipc_path,
+        )
+        if self.metrics_port:
+            env["METRICS_PORT"] = str(self.metrics_port + worker.cluster_id)
+        return env
+
+    async def _watch(self, worker: WorkerProcess) -> None:
+        base, ceiling = self.restart_backoff
+        delay = base
+        while not self._stopping.is_set():
+            worker.process = await asyncio.create_subprocess_exec(*self.command, env=self._worker_env(worker))
+            worker.started_at = time.monotonic()
+            logger.info("cluster_worker_started", cluster_id=worker.cluster_id, pid=worker.process.pid, shards=worker.shard_spec)
+            returncode = await worker.process.wait()
+            uptime = time.monotonic() - worker.started_at
+            if self._stopping.is_set():
+                return
+            worker.restarts += 1
+            if uptime >= self.stable_after:
+                delay = base
+            logger.error(
+                "cluster_worker_exited",
+                cluster_id=worker.cluster_id,
+                returncode=returncode,
+                uptime_s=round(uptime, 1),
+                restart_in_s=delay,
+            )
+            try:
+                await asyncio.wait_for(self._stopping.wait(), delay)
+                return
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, ceiling)
+
+    async def _terminate(self, worker: WorkerProcess) -> None:
+        process = worker.process
+        if process is None or process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), self.shutdown_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("cluster_worker_kill", cluster_id=worker.cluster_id, pid=process.pid)
+            process.kill()
+            await process.wait()
+
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = IpcConnection(reader, writer, {"cluster_stats": self._cluster_stats, "restart": self._restart})
+
+        async def hello(data: Dict[str, Any]) -> Dict[str, Any]:
+            worker = self.workers[int(data["cluster_id"])]
+            if worker.connection is not None and worker.connection is not connection:
+                await worker.connection.close()
+            worker.connection = connection
+            return {"shard_count": self.shard_count, "workers": len(self.workers)}
+
+        connection.handlers["hello"] = hello
+        await connection.serve()
+
+    async def _cluster_stats(self, _: Any = None) -> List[Dict[str, Any]]:
+        async def collect(worker: WorkerProcess) -> Dict[str, Any]:
+            base = {
+                "cluster_id": worker.cluster_id,
+                "shards": worker.shard_spec,
+                "restarts": worker.restarts,
+                "uptime_s": round(time.monotonic() - worker.started_at, 1) if worker.started_at else 0.0,
+            }
+            if worker.connection is None or worker.connection.closed:
+                return {**base, "error": "not connected"}
+            try:
+                return {**base, **await worker.connection.request("stats", timeout=3.0)}
+            except (IpcError, asyncio.TimeoutError) as exc:
+                return {**base, "error": repr(exc)}
+
+        return list(await asyncio.gather(*(collect(worker) for worker in self.workers)))
+
+    async def _restart(self, data: Dict[str, Any]) -> str:
+        cluster_id = int(data["cluster_id"])
+        if not 0 <= cluster_id < len(self.workers):
+            raise ValueError(f"unknown cluster id {cluster_id}")
+        worker = self.workers[cluster_id]
+        # 요청한 worker 자신일 수도 있으므로 응답을 먼저 보내고 종료한다.
+        asyncio.get_running_loop().call_later(0.5, lambda: asyncio.ensure_future(self._terminate(worker)))
+        return f"restarting cluster {cluster_id} ({worker.shard_spec})"
+
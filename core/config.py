@@ -6,3 +6,65 @@ LAVALINK_HOST = os.getenv("LAVALINK_HOST", "127.0.0.1")
 LAVALINK_PORT = int(os.getenv("LAVALINK_PORT", "2333"))
 LAVALINK_PASSWORD = os.getenv("LAVALINK_PASSWORD", "youshallnotpass")
 LAVALINK_IDENTIFIER = os.getenv("LAVALINK_IDENTIFIER", "main")
+
+# 해석(yt-dlp / Lavalink 검색) 결과 녹화/재생: off | record | replay
+RESOLVER_CASSETTE_MODE = os.getenv("RESOLVER_CASSETTE_MODE", "off").strip().lower()
+RESOLVER_CASSETTE_PATH = os.getenv("RESOLVER_CASSETTE_PATH", "./cassettes/resolver.json.gz")
+# recorded | none | fixed:<ms> | uniform:<min_ms>,<max_ms> | lognormal:<median_ms>,<sigma>
+RESOLVER_CASSETTE_LATENCY = os.getenv("RESOLVER_CASSETTE_LATENCY", "recorded").strip().lower()
+# record 모드에서 녹화 파일을 다시 쓰는 최소 간격(초). 종료할 때 남은 변경을 저장한다.
+RESOLVER_CASSETTE_SAVE_INTERVAL = float(os.getenv("RESOLVER_CASSETTE_SAVE_INTERVAL", "5"))
+
+# Prometheus text format 메트릭 엔드포인트 (0 이면 비활성화)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+# 구조화 로그 (JSON lines)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "info").strip().lower()
+LOG_FILE = os.getenv("LOG_FILE", "")
+# 이벤트별 샘플링 비율, 예: "control=0.1,lavalink_search=0.5"
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
+# 이벤트 루프 지연 감시 (owner 명령 -watchdog 으로 켜고 끌 수 있다)
+LOOP_WATCHDOG = os.getenv("LOOP_WATCHDOG", "on").strip().lower() not in ("0", "off", "false")
+LOOP_WATCHDOG_INTERVAL_MS = float(os.getenv("LOOP_WATCHDOG_INTERVAL_MS", "250"))
+LOOP_WATCHDOG_THRESHOLD_MS = float(os.getenv("LOOP_WATCHDOG_THRESHOLD_MS", "100"))
+LOOP_WATCHDOG_STACK_SAMPLE_RATE = float(os.getenv("LOOP_WATCHDOG_STACK_SAMPLE_RATE", "1.0"))
+
+# 검색/해석 스케줄러: 전역 동시 실행 수, 길드별 동시 실행 수, 길드별 대기열 길이
+RESOLVE_CONCURRENCY = int(os.getenv("RESOLVE_CONCURRENCY", "4"))
+RESOLVE_GUILD_CONCURRENCY = int(os.getenv("RESOLVE_GUILD_CONCURRENCY", "2"))
+RESOLVE_GUILD_QUEUE = int(os.getenv("RESOLVE_GUILD_QUEUE", "5"))
+
+# 컨트롤 버튼 응답(ack) 지연 SLO (interaction_ack_slo_total{result="breach"} 로 집계)
+INTERACTION_ACK_SLO_MS = float(os.getenv("INTERACTION_ACK_SLO_MS", "500"))
+
+# 샤딩: 비우면 게이트웨이 연결 하나(commands.Bot), auto 면 Discord 권장 샤드 수, 숫자면 고정 샤드 수
+SHARD_COUNT = os.getenv("SHARD_COUNT", "").strip().lower()
+# 이 프로세스가 맡을 샤드 id, 예: "0-3" 또는 "0,2,4" (비우면 전체, SHARD_COUNT 가 숫자일 때만)
+SHARD_IDS = os.getenv("SHARD_IDS", "").strip()
+
+# 클러스터 모드 (python cluster.py): worker 프로세스 수와 supervisor IPC 소켓 경로
+CLUSTER_WORKERS = int(os.getenv("CLUSTER_WORKERS") or os.cpu_count() or 1)
+CLUSTER_IPC_PATH = os.getenv("CLUSTER_IPC_PATH", "./cluster.sock")
+# supervisor 가 worker 에 지정한다. 직접 설정하지 않는다.
+CLUSTER_ID = os.getenv("CLUSTER_ID", "")
+
+# yt-dlp 해석 sidecar (python resolver.py). 비우면 항상 봇 프로세스 안에서 해석한다.
+RESOLVER_SOCKET = os.getenv("RESOLVER_SOCKET", "")
+RESOLVER_WORKERS = int(os.getenv("RESOLVER_WORKERS") or 4)
+RESOLVER_CACHE_TTL = float(os.getenv("RESOLVER_CACHE_TTL") or 1800)
+# 해석 실패 캐시(초)와 요청 제한 감지 차단기: window 초 안에 threshold 번 제한/오류면 cooldown 초부터 두 배씩 멈춘다.
+RESOLVE_NEGATIVE_TTL = float(os.getenv("RESOLVE_NEGATIVE_TTL") or 300)
+RESOLVE_BREAKER_THRESHOLD = int(os.getenv("RESOLVE_BREAKER_THRESHOLD") or 5)
+RESOLVE_BREAKER_WINDOW = float(os.getenv("RESOLVE_BREAKER_WINDOW") or 30)
+RESOLVE_BREAKER_COOLDOWN = float(os.getenv("RESOLVE_BREAKER_COOLDOWN") or 15)
+# 해석 마감 시간(초). 플레이리스트는 따로 둔다. RESOLVE_HEDGE=on 이면 느린 단일 곡 해석에 두 번째 시도를 띄운다.
+RESOLVE_TIMEOUT = float(os.getenv("RESOLVE_TIMEOUT") or 20)
+RESOLVE_PLAYLIST_TIMEOUT = float(os.getenv("RESOLVE_PLAYLIST_TIMEOUT") or 120)
+RESOLVE_HEDGE = os.getenv("RESOLVE_HEDGE", "on").strip().lower() not in ("0", "off", "false")
+# 플레이리스트 항목을 동시에 해석할 수(길드 동시 실행 수 RESOLVE_GUILD_CONCURRENCY 를 넘지 않는다)와 임베드 진행률 갱신 간격(초)
+PLAYLIST_RESOLVE_WORKERS = int(os.getenv("PLAYLIST_RESOLVE_WORKERS") or 2)
+PLAYLIST_PROGRESS_INTERVAL = float(os.getenv("PLAYLIST_PROGRESS_INTERVAL") or 2)
+# 첨부 파일/여러 줄 메시지로 한 번에 추가할 수 있는 최대 곡 수 (중복을 뺀 뒤 기준)
+TRACK_LIST_MAX_TRACKS = int(os.getenv("TRACK_LIST_MAX_TRACKS") or 100)
\ No newline at end of file
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+from itertools import groupby
+from typing import Any, List, Optional, Sequence, Tuple
+
+import aiosqlite
+
+from core.local.path import db_path
+from core.util import log_event
+
+WRITE_BATCH_SIZE = 256
+
+Params = Sequence[Any]
+
+
+class LocalDatabase:
+    """
+    프로세스 전체에서 공유하는 단일 aiosqlite 연결입니다.
+    쓰기는 write-behind 큐에 쌓였다가 한 트랜잭션으로 묶여 커밋됩니다.
+    """
+
+    def __init__(self, path: str, *, batch_size: int = WRITE_BATCH_SIZE) -> None:
+        self._path = path
+        self._batch_size = batch_size
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._queue: Optional[asyncio.Queue[Tuple[str, Params]]] = None
+        self._writer_task: Optional[asyncio.Task] = None
+
+    async def connection(self) -> aiosqlite.Connection:
+        if self._conn is not None:
+            return self._conn
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._conn is None:
+                conn = await aiosqlite.connect(self._path)
+                conn.row_factory = aiosqlite.Row
+                await conn.execute("PRAGMA journal_mode=WAL")
+                await conn.execute("PRAGMA synchronous=NORMAL")
+                self._queue = asyncio.Queue()
+                self._writer_task = asyncio.create_task(self._write_loop(conn))
+                self._conn = conn
+        return self._conn
+
+    async def execute(self, query: str, params: Params = ()) -> None:
+        """즉시 실행하고 커밋합니다. 스키마 변경처럼 순서가 중요한 작업에 사용합니다."""
+        await self.flush()
+        conn = await self.connection()
+        await conn.execute(query, params)
+        await conn.commit()
+
+    async def write(self, query: str, params: Params = ()) -> None:
+        """쓰기를 큐에 넣고 바로 반환합니다. 커밋은 writer 태스크가 묶어서 처리합니다."""
+        await self.connection()
+        self._queue.put_nowait((query, params))
+
+    async def fetchone(self, query: str, params: Params = ()) -> Optional[aiosqlite.Row]:
+        await self.flush()
+        conn = await self.connection()
+        async with conn.execute(query, params) as cursor:
+            return await cursor.fetchone()
+
+    async def fetchall(self, query: str, params: Params = ()) -> List[aiosqlite.Row]:
+        await self.flush()
+        conn = await self.connection()
+        async with conn.execute(query, params) as cursor:
+            return list(await cursor.fetchall())
+
+    async def flush(self) -> None:
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        if self._conn is None:
+            return
+        await self.flush()
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            self._writer_task = None
+        await self._conn.close()
+        self._conn = None
+        self._queue = None
+
+    async def _write_loop(self, conn: aiosqlite.Connection) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self._batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                # 같은 쿼리가 연속되면 executemany 한 번으로 스레드 왕복을 줄인다.
+                for query, group in groupby(batch, key=lambda item: item[0]):
+                    params = [p for _, p in group]
+                    if len(params) == 1:
+                        await conn.execute(query, params[0])
+                    else:
+                        await conn.executemany(query, params)
+                await conn.commit()
+            except Exception as exc:
+                log_event(f"local write batch failed size={len(batch)}: {exc}")
+                try:
+                    await conn.rollback()
+                except Exception:
+                    pass
+                await self._write_one_by_one(conn, batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    @staticmethod
+    async def _write_one_by_one(conn: aiosqlite.Connection, batch: List[Tuple[str, Params]]) -> None:
+        """
+        묶음이 실패하면 하나씩 다시 실행합니다. 제약 조건 위반 같은 오류는 SQLite 가 그 문장만 되돌리므로
+        다른 길드의 upsert/기록은 같은 트랜잭션으로 그대로 커밋되고, 실패한 문장만 버려진다.
+        """
+        failed = 0
+        for query, params in batch:
+            try:
+                await conn.execute(query, params)
+            except Exception as exc:
+                failed += 1
+                log_event(f"local write dropped: {exc} query={query!r}")
+        try:
+            await conn.commit()
+        except Exception as exc:
+            log_event(f"local write retry commit failed size={len(batch)}: {exc}")
+            try:
+                await conn.rollback()
+            except Exception:
+                pass
+            return
+        log_event(f"local write batch retried one by one size={len(batch)} dropped={failed}")
+
+
+database = LocalDatabase(db_path)
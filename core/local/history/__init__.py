@@ -0,0 +1,2 @@
+from .play_history_data_source import PlayHistoryDataSource
+from .play_history import PlayHistory, play_history
\ No newline at end of file
@@ -0,0 +1,2 @@
+from .play_record import PlayRecord
+from .track_rollup import TrackRollup
\ No newline at end of file
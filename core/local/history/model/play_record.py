@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class PlayRecord:
+    guild_id: int
+    video_id: str
+    title: str
+    requester_id: int
+    played_at: float # unix timestamp (재생 시작)
+    played_seconds: float
+    skipped: bool
\ No newline at end of file
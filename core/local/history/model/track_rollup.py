@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class TrackRollup:
+    guild_id: int # 0 이면 전체 길드 합산
+    week: int
+    video_id: str
+    title: str
+    play_count: int
+    skip_count: int
+    played_seconds: float
\ No newline at end of file
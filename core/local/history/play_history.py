@@ -0,0 +1,116 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+from core.local.history.model import PlayRecord, TrackRollup
+from core.local.history.play_history_data_source import GLOBAL_GUILD_ID, PlayHistoryDataSource, week_of
+from core.model.music_application import MusicApplication
+from core.util import log_event
+
+HISTORY_FLUSH_INTERVAL = 5.0
+HISTORY_FLUSH_SIZE = 500
+
+
+class PlayHistory:
+    """
+    재생 기록을 메모리 버퍼에 모았다가 한 번에 기록합니다.
+    record 는 동기 함수이며 I/O 를 하지 않으므로 재생 경로에 지연을 추가하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        *,
+        flush_interval: float = HISTORY_FLUSH_INTERVAL,
+        flush_size: int = HISTORY_FLUSH_SIZE,
+    ) -> None:
+        self._flush_interval = flush_interval
+        self._flush_size = flush_size
+        self._buffer: List[PlayRecord] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def record_track(
+        self,
+        guild_id: int,
+        track: MusicApplication,
+        played_seconds: float,
+        skipped: bool,
+    ) -> None:
+        video_id = track.youtube_search.video_id
+        if not video_id:
+            return
+        self.record(PlayRecord(
+            guild_id=guild_id,
+            video_id=video_id,
+            title=track.youtube_search.title,
+            requester_id=track.user_id,
+            played_at=time.time() - played_seconds,
+            played_seconds=played_seconds,
+            skipped=skipped,
+        ))
+
+    def record(self, record: PlayRecord) -> None:
+        self._buffer.append(record)
+        if len(self._buffer) >= self._flush_size:
+            asyncio.get_running_loop().create_task(self.flush())
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._flush_interval)
+        await self.flush()
+
+    async def flush(self) -> None:
+        if not self._buffer:
+            return
+        records, self._buffer = self._buffer, []
+        try:
+            await PlayHistoryDataSource.append(records)
+            await PlayHistoryDataSource.add_rollups(self._aggregate(records))
+        except Exception as exc:
+            log_event(f"play history flush failed size={len(records)}: {exc}")
+
+    async def top_tracks(
+        self,
+        guild_id: Optional[int] = None,
+        *,
+        week: Optional[int] = None,
+        limit: int = 10,
+    ) -> List[TrackRollup]:
+        """guild_id 가 None 이면 전체 길드 기준, week 가 None 이면 이번 주 기준입니다."""
+        await self.flush()
+        return await PlayHistoryDataSource.top_tracks(
+            GLOBAL_GUILD_ID if guild_id is None else guild_id,
+            week_of(time.time()) if week is None else week,
+            limit,
+        )
+
+    async def close(self) -> None:
+        # 대기 중인 지연 flush 는 버퍼가 비어 있으면 아무것도 하지 않으므로 취소하지 않는다.
+        await self.flush()
+
+    @staticmethod
+    def _aggregate(records: List[PlayRecord]) -> List[TrackRollup]:
+        rollups: Dict[Tuple[int, int, str], TrackRollup] = {}
+        for record in records:
+            week = week_of(record.played_at)
+            for guild_id in (record.guild_id, GLOBAL_GUILD_ID):
+                key = (guild_id, week, record.video_id)
+                rollup = rollups.get(key)
+                if rollup is None:
+                    rollup = TrackRollup(
+                        guild_id=guild_id,
+                        week=week,
+                        video_id=record.video_id,
+                        title=record.title,
+                        play_count=0,
+                        skip_count=0,
+                        played_seconds=0.0,
+                    )
+                    rollups[key] = rollup
+                rollup.play_count += 1
+                rollup.skip_count += int(record.skipped)
+                rollup.played_seconds += record.played_seconds
+        return list(rollups.values())
+
+
+play_history = PlayHistory()
@@ -0,0 +1,99 @@
+from typing import Iterable, List
+
+from core.local.database import database
+from core.local.history.model import PlayRecord, TrackRollup
+
+# 전체 길드 합산 rollup 에 사용하는 guild_id (디스코드 snowflake 는 0 이 될 수 없다)
+GLOBAL_GUILD_ID = 0
+WEEK_SECONDS = 7 * 24 * 60 * 60
+
+
+def week_of(timestamp: float) -> int:
+    return int(timestamp // WEEK_SECONDS)
+
+
+class PlayHistoryDataSource:
+
+    @staticmethod
+    async def init_table():
+        # append-only 재생 기록
+        await database.execute("""
+                        CREATE TABLE IF NOT EXISTS tbl_play_history (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            guild_id INTEGER NOT NULL,
+                            video_id TEXT NOT NULL,
+                            requester_id INTEGER,
+                            played_at REAL NOT NULL,
+                            played_seconds REAL NOT NULL,
+                            skipped INTEGER NOT NULL
+                        )
+                    """)
+        await database.execute(
+            "CREATE INDEX IF NOT EXISTS idx_play_history_guild ON tbl_play_history (guild_id, played_at)"
+        )
+        # 주 단위 곡별 집계. 기록이 쌓일 때마다 증분으로 갱신된다.
+        await database.execute("""
+                        CREATE TABLE IF NOT EXISTS tbl_play_rollup (
+                            guild_id INTEGER NOT NULL,
+                            week INTEGER NOT NULL,
+                            video_id TEXT NOT NULL,
+                            title TEXT,
+                            play_count INTEGER NOT NULL,
+                            skip_count INTEGER NOT NULL,
+                            played_seconds REAL NOT NULL,
+                            PRIMARY KEY (guild_id, week, video_id)
+                        )
+                    """)
+        await database.execute(
+            "CREATE INDEX IF NOT EXISTS idx_play_rollup_rank ON tbl_play_rollup (guild_id, week, play_count DESC)"
+        )
+
+    @staticmethod
+    async def append(records: Iterable[PlayRecord]) -> None:
+        query = (
+            "INSERT INTO tbl_play_history (guild_id, video_id, requester_id, played_at, played_seconds, skipped) "
+            "VALUES (?, ?, ?, ?, ?, ?)"
+        )
+        for record in records:
+            tu = (
+                record.guild_id,
+                record.video_id,
+                record.requester_id,
+                record.played_at,
+                record.played_seconds,
+                int(record.skipped),
+            )
+            await database.write(query, tu)
+
+    @staticmethod
+    async def add_rollups(rollups: Iterable[TrackRollup]) -> None:
+        query = (
+            "INSERT INTO tbl_play_rollup (guild_id, week, video_id, title, play_count, skip_count, played_seconds) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(guild_id, week, video_id) DO UPDATE SET "
+            "title = excluded.title, "
+            "play_count = play_count + excluded.play_count, "
+            "skip_count = skip_count + excluded.skip_count, "
+            "played_seconds = played_seconds + excluded.played_seconds"
+        )
+        for rollup in rollups:
+            tu = (
+                rollup.guild_id,
+                rollup.week,
+                rollup.video_id,
+                rollup.title,
+                rollup.play_count,
+                rollup.skip_count,
+                rollup.played_seconds,
+            )
+            await database.write(query, tu)
+
+    @staticmethod
+    async def top_tracks(guild_id: int, week: int, limit: int) -> List[TrackRollup]:
+        query = (
+            "SELECT * FROM tbl_play_rollup WHERE guild_id = ? AND week = ? "
+            "ORDER BY play_count DESC LIMIT ?"
+        )
+        tu = (guild_id, week, limit)
+        rows = await database.fetchall(query, tu)
+        return [TrackRollup(**row) for row in rows] if rows else []
@@ -1,8 +1,23 @@
-from core.local.music import MusicDataSource
+from core.local.database import LocalDatabase, database
+from core.local.history import PlayHistory, PlayHistoryDataSource, play_history
+from core.local.meta import MetaDataSource
+from core.local.music import MusicChannelRepository, MusicDataSource, music_channel_repository
 
 
 class LocalCore:
 
+    database: LocalDatabase = database
+    music_channels: MusicChannelRepository = music_channel_repository
+    play_history: PlayHistory = play_history
+
     @staticmethod
     async def init_table():
-        await MusicDataSource.init_table()
\ No newline at end of file
+        await LocalCore.database.connection()
+        await MusicDataSource.init_table()
+        await PlayHistoryDataSource.init_table()
+        await MetaDataSource.init_table()
+
+    @staticmethod
+    async def close():
+        await LocalCore.play_history.close()
+        await LocalCore.database.close()
\ No newline at end of file
@@ -0,0 +1 @@
+from .meta_data_source import MetaDataSource
\ No newline at end of file
@@ -0,0 +1,31 @@
+from typing import Optional
+
+from core.local.database import database
+
+
+class MetaDataSource:
+    """
+    봇 자체의 상태 값을 key-value 로 보관합니다. (예: 마지막으로 sync 한 명령어 트리 해시)
+    """
+
+    @staticmethod
+    async def init_table():
+        await database.execute("""
+                        CREATE TABLE IF NOT EXISTS tbl_meta (
+                            key TEXT PRIMARY KEY,
+                            value TEXT
+                        )
+                    """)
+
+    @staticmethod
+    async def get(key: str) -> Optional[str]:
+        row = await database.fetchone("SELECT value FROM tbl_meta WHERE key = ?", (key,))
+        return row["value"] if row else None
+
+    @staticmethod
+    async def set(key: str, value: str) -> None:
+        query = (
+            "INSERT INTO tbl_meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+        )
+        await database.write(query, (key, value))
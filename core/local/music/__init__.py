@@ -1 +1,2 @@
-from .music_data_source import MusicDataSource
\ No newline at end of file
+from .music_data_source import MusicDataSource
+from .music_channel_repository import MusicChannelRepository, music_channel_repository
\ No newline at end of file
@@ -0,0 +1,85 @@
+from typing import Dict, Iterable, List, Optional
+
+from core.local.music.model import MusicModel
+from core.local.music.music_data_source import MusicDataSource
+
+
+class MusicChannelRepository:
+    """
+    길드별 음악 채널 설정의 단일 원본입니다.
+    읽기는 항상 메모리에서 처리하고, 변경은 메모리에 먼저 반영한 뒤 MusicDataSource 로 기록합니다.
+    """
+
+    def __init__(self) -> None:
+        # Key: guild_id
+        self._by_guild: Dict[int, MusicModel] = {}
+        # Key: channel_id, Value: guild_id (on_message 라우팅용 역색인)
+        self._guild_by_channel: Dict[int, int] = {}
+        self._loaded = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    async def load(self, *, force: bool = False) -> None:
+        if self._loaded and not force:
+            return
+        models = await MusicDataSource.get_all()
+        self._by_guild.clear()
+        self._guild_by_channel.clear()
+        for model in models:
+            self._put(model)
+        self._loaded = True
+
+    def seed(self, models: Iterable[MusicModel]) -> None:
+        """DB 를 거치지 않고 메모리 캐시만 채웁니다. 오프라인 벤치마크에서 사용합니다."""
+        for model in models:
+            self._put(model)
+        self._loaded = True
+
+    def get(self, guild_id: int) -> Optional[MusicModel]:
+        return self._by_guild.get(guild_id)
+
+    def is_music_channel(self, channel_id: int) -> bool:
+        return channel_id in self._guild_by_channel
+
+    def guild_id_for_channel(self, channel_id: int) -> Optional[int]:
+        return self._guild_by_channel.get(channel_id)
+
+    def channel_ids(self) -> List[int]:
+        return list(self._guild_by_channel)
+
+    def all(self) -> List[MusicModel]:
+        return list(self._by_guild.values())
+
+    def __len__(self) -> int:
+        return len(self._by_guild)
+
+    async def set_channel(self, guild_id: int, channel_id: int, message_id: int) -> MusicModel:
+        model = MusicModel(guild_id=guild_id, channel_id=channel_id, message_id=message_id)
+        self._put(model)
+        await MusicDataSource.upsert(guild_id=guild_id, channel_id=channel_id, message_id=message_id)
+        return model
+
+    async def update_message_id(self, guild_id: int, message_id: int) -> None:
+        model = self._by_guild.get(guild_id)
+        if model is None:
+            return
+        model.message_id = message_id
+        await MusicDataSource.update_message_id(guild_id=guild_id, message_id=message_id)
+
+    async def delete(self, guild_id: int) -> None:
+        model = self._by_guild.pop(guild_id, None)
+        if model is not None:
+            self._guild_by_channel.pop(model.channel_id, None)
+        await MusicDataSource.delete(guild_id)
+
+    def _put(self, model: MusicModel) -> None:
+        previous = self._by_guild.get(model.guild_id)
+        if previous is not None and previous.channel_id != model.channel_id:
+            self._guild_by_channel.pop(previous.channel_id, None)
+        self._by_guild[model.guild_id] = model
+        self._guild_by_channel[model.channel_id] = model.guild_id
+
+
+music_channel_repository = MusicChannelRepository()
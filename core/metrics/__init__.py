@@ -0,0 +1,5 @@
+from .registry import Counter, Gauge, Histogram, MetricsRegistry, metrics
+from .exporter import MetricsServer
+from .watchdog import LoopStall, LoopWatchdog
+from .tracing import Span, Trace, Tracer, tracer
+from .shards import ShardMetrics
\ No newline at end of file
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# 초 단위 지연 시간용 기본 버킷 (5ms ~ 60s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, _Metric] = {}
+
+    def labels(self, *values: str):
+        """라벨 값별 하위 메트릭을 돌려줍니다. 호출부에서 결과를 보관해 두면 조회 비용도 없앨 수 있습니다."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._new_child()
+            self._children[values] = child
+        return child
+
+    def _new_child(self) -> "_Metric":
+        raise NotImplementedError
+
+    def _samples(self) -> Iterator[Tuple[LabelValues, "_Metric"]]:
+        if self.labelnames:
+            yield from self._children.items()
+        else:
+            yield (), self
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, metric in self._samples():
+            lines.extend(metric._expose_sample(self.name, self.labelnames, values))
+        return lines
+
+    def _expose_sample(self, name: str, labelnames: Sequence[str], values: LabelValues) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str = "", documentation: str = "", labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.value = 0.0
+
+    def _new_child(self) -> "Counter":
+        return Counter()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def _expose_sample(self, name, labelnames, values) -> List[str]:
+        return [f"{name}{_format_labels(labelnames, values)} {_format_value(self.value)}"]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str = "", documentation: str = "", labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def _new_child(self) -> "Gauge":
+        return Gauge()
+
+    @property
+    def value(self) -> float:
+        if self._function is not None:
+            try:
+                return float(self._function())
+            except Exception:
+                return float("nan")
+        return self._value
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._value -= amount
+
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        """값을 수집 시점에 계산합니다. 큐 길이처럼 이미 어딘가에 있는 상태를 노출할 때 사용합니다."""
+        self._function = function
+
+    def _expose_sample(self, name, labelnames, values) -> List[str]:
+        return [f"{name}{_format_labels(labelnames, values)} {_format_value(self.value)}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str = "",
+        documentation: str = "",
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 마지막 칸은 +Inf
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def _new_child(self) -> "Histogram":
+        return Histogram(buckets=self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """버킷 경계 사이를 선형 보간한 근사 분위수입니다."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        lower = 0.0
+        for index, bucket_count in enumerate(self.counts):
+            upper = self.buckets[index] if index < len(self.buckets) else self.buckets[-1]
+            if cumulative + bucket_count >= rank and bucket_count > 0:
+                if index == len(self.buckets):
+                    return upper
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+            lower = upper
+        return self.buckets[-1]
+
+    def _expose_sample(self, name, labelnames, values) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip((*self.buckets, float("inf")), self.counts):
+            cumulative += bucket_count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{name}_bucket{_format_labels(labelnames, values, le)} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labelnames, values)} {_format_value(self.sum)}")
+        lines.append(f"{name}_count{_format_labels(labelnames, values)} {self.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    프로세스 내 메트릭 저장소입니다. 이벤트 루프 스레드에서만 갱신한다고 가정하므로 락이 없습니다.
+    같은 이름으로 다시 등록하면 기존 메트릭을 돌려주므로 cog reload 후에도 값이 이어집니다.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = cls(name, documentation, labelnames, **kwargs)
+            self._metrics[name] = metric
+        elif not isinstance(metric, cls):
+            raise ValueError(f"{name} is already registered as {metric.kind}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def total(self, name: str) -> float:
+        """모든 라벨의 합. 카운터는 값, 히스토그램은 관측 건수를 더합니다. 없는 메트릭은 0."""
+        metric = self._metrics.get(name)
+        if metric is None:
+            return 0.0
+        return float(
+            sum(sample.count if isinstance(sample, Histogram) else sample.value for _, sample in metric._samples())
+        )
+
+    def expose(self) -> str:
+        """Prometheus text exposition format (0.0.4)"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """owner 명령용 요약. 히스토그램은 건수와 근사 p50/p99 를 ms 로 보여줍니다."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            for values, sample in metric._samples():
+                label = metric.name + (_format_labels(metric.labelnames, values) if values else "")
+                if isinstance(sample, Histogram):
+                    if sample.count == 0:
+                        continue
+                    lines.append(
+                        f"{label} n={sample.count} p50={sample.quantile(0.5) * 1000:.0f}ms "
+                        f"p99={sample.quantile(0.99) * 1000:.0f}ms"
+                    )
+                else:
+                    lines.append(f"{label} {_format_value(sample.value)}")
+        return "\n".join(lines) if lines else "no metrics"
+
+
+metrics = MetricsRegistry()
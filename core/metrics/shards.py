@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Tuple
+
+import discord
+
+from core.metrics.registry import MetricsRegistry
+
+
+class ShardMetrics:
+    """
+    AutoShardedBot 의 샤드별 부하를 기록합니다.
+
+    - shard_events_total{shard,event}: 샤드별로 처리한 길드 이벤트 수 (rate() 로 events/s)
+    - shard_gateway_latency_seconds{shard}: heartbeat 지연. 한 샤드만 느려지면 여기서 보인다.
+    - shard_connection_events_total{shard,event}: connect / disconnect / resume 횟수
+    같은 프로세스의 샤드들은 이벤트 루프 하나를 공유하므로 루프 지연은 event_loop_lag_seconds 하나로 봅니다.
+    """
+
+    EVENTS = ("message", "interaction", "voice_state_update")
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self._events_total = registry.counter(
+            "shard_events_total", "Guild gateway events handled per shard", ("shard", "event")
+        )
+        self._latency = registry.gauge(
+            "shard_gateway_latency_seconds", "Gateway heartbeat latency per shard", ("shard",)
+        )
+        self._connection_events = registry.counter(
+            "shard_connection_events_total", "Shard connect/disconnect/resume events", ("shard", "event")
+        )
+        # (shard_id, event) -> 이번 프로세스에서 센 수 (-shards 출력용)
+        self.counts: Dict[Tuple[int, str], int] = {}
+        self.started_at = time.monotonic()
+
+    def install(self, bot: discord.AutoShardedClient) -> None:
+        async def on_message(message: discord.Message) -> None:
+            if message.guild is not None:
+                self.observe(message.guild.shard_id, "message")
+
+        async def on_interaction(interaction: discord.Interaction) -> None:
+            if interaction.guild is not None:
+                self.observe(interaction.guild.shard_id, "interaction")
+
+        async def on_voice_state_update(member: discord.Member, before, after) -> None:
+            self.observe(member.guild.shard_id, "voice_state_update")
+
+        async def on_shard_connect(shard_id: int) -> None:
+            self._connection_events.labels(str(shard_id), "connect").inc()
+            self._latency.labels(str(shard_id)).set_function(lambda: bot.get_shard(shard_id).latency)
+
+        async def on_shard_disconnect(shard_id: int) -> None:
+            self._connection_events.labels(str(shard_id), "disconnect").inc()
+
+        async def on_shard_resumed(shard_id: int) -> None:
+            self._connection_events.labels(str(shard_id), "resume").inc()
+
+        for listener in (
+            on_message,
+            on_interaction,
+            on_voice_state_update,
+            on_shard_connect,
+            on_shard_disconnect,
+            on_shard_resumed,
+        ):
+            bot.add_listener(listener)
+
+    def observe(self, shard_id: int, event: str) -> None:
+        key = (shard_id, event)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self._events_total.labels(str(shard_id), event).inc()
+
+    def events_per_second(self, shard_id: int) -> float:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return sum(self.counts.get((shard_id, event), 0) for event in self.EVENTS) / elapsed
+
+    def status(self, bot: discord.AutoShardedClient, active_players: Dict[int, int]) -> str:
+        lines: List[str] = [f"shards={bot.shard_count} in this process={len(bot.shards)}"]
+        guild_counts: Dict[int, int] = {}
+        for guild in bot.guilds:
+            guild_counts[guild.shard_id] = guild_counts.get(guild.shard_id, 0) + 1
+        for shard_id, shard in sorted(bot.shards.items()):
+            latency = shard.latency
+            latency_text = f"{latency * 1000:.0f}ms" if latency == latency and latency != float("inf") else "-"
+            lines.append(
+                f"#{shard_id} latency={latency_text} guilds={guild_counts.get(shard_id, 0)} "
+                f"players={active_players.get(shard_id, 0)} events/s={self.events_per_second(shard_id):.2f}"
+                f"{' closed' if shard.is_closed() else ''}"
+            )
+        return "\n".join(lines)
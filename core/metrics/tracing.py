@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import itertools
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+
+from core.metrics.registry import MetricsRegistry, metrics
+
+WATERFALL_WIDTH = 24
+
+
+class Span:
+    """
+    trace 안의 한 단계입니다. with 문으로 사용하며, 중첩 깊이는 출력 시점에 구간 포함 관계로 계산합니다.
+    요청마다 여러 개 만들어지므로 객체 하나만 할당하도록 속성 dict 는 set() 을 부를 때 만듭니다.
+    """
+
+    __slots__ = ("name", "attrs", "start", "end", "_trace")
+
+    def __init__(self, trace: Optional["Trace"], name: str) -> None:
+        self.name = name
+        self.attrs: Optional[Dict[str, Any]] = None
+        self.start = 0.0
+        self.end: Optional[float] = None
+        self._trace = trace
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def set(self, key: str, value: Any) -> None:
+        if self._trace is None:
+            return
+        if self.attrs is None:
+            self.attrs = {}
+        self.attrs[key] = value
+
+    def __enter__(self) -> "Span":
+        if self._trace is not None:
+            self.start = time.perf_counter()
+            self._trace.spans.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._trace is None:
+            return
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.set("error", exc_type.__name__)
+
+
+class Trace:
+    """요청 하나입니다. with 문 안에서만 현재 trace 로 설정됩니다."""
+
+    __slots__ = ("trace_id", "name", "attrs", "started_at", "start", "end", "spans", "_tracer", "_token")
+
+    def __init__(self, tracer: "Tracer", trace_id: int, name: str, attrs: Dict[str, Any]) -> None:
+        self.trace_id = trace_id
+        self.name = name
+        self.attrs = attrs
+        self.started_at = time.time()
+        self.start = 0.0
+        self.end: Optional[float] = None
+        self.spans: List[Span] = []
+        self._tracer = tracer
+        self._token = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def __enter__(self) -> "Trace":
+        self.start = time.perf_counter()
+        self._token = _current_trace.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        _current_trace.reset(self._token)
+        self._token = None
+        self._tracer._finish(self)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+# trace 밖에서 쓰는 공용 no-op span (set/with 모두 아무것도 하지 않는다)
+_NOOP_SPAN = Span(None, "")
+
+
+class Tracer:
+    """
+    메시지/인터랙션 하나를 trace 로, 그 안의 단계를 span 으로 기록합니다.
+    현재 trace 는 contextvar 로 전달되므로 await 와 create_task 를 따라 자동으로 이어지고,
+    trace 밖(곡 전환 콜백 등)에서의 span() 호출은 아무것도 하지 않습니다.
+    끝난 trace 는 최근 recent 개를 보관하며 그중 가장 느린 것들을 owner 명령으로 볼 수 있습니다.
+    """
+
+    def __init__(self, registry: MetricsRegistry = metrics, *, recent: int = 256) -> None:
+        self.recent: Deque[Trace] = deque(maxlen=recent)
+        self._ids = itertools.count(1)
+        self._trace_seconds = registry.histogram(
+            "request_trace_seconds", "End-to-end duration of traced requests", ("name",)
+        )
+
+    def start_trace(self, name: str, **attrs: Any) -> Trace:
+        return Trace(self, next(self._ids), name, attrs)
+
+    def span(self, name: str) -> Span:
+        trace = _current_trace.get()
+        if trace is None or trace.end is not None:
+            return _NOOP_SPAN
+        return Span(trace, name)
+
+    @staticmethod
+    def current() -> Optional[Trace]:
+        return _current_trace.get()
+
+    @staticmethod
+    def detach() -> None:
+        """
+        현재 task 를 trace 밖으로 뺍니다. create_task 로 만든 task 안에서 부르면 그 task 의 context 만 바뀐다.
+        요청 하나가 수천 개의 작은 작업을 띄울 때 span 이 trace 에 끝없이 쌓이지 않게 한다.
+        """
+        _current_trace.set(None)
+
+    def _finish(self, trace: Trace) -> None:
+        self.recent.append(trace)
+        self._trace_seconds.labels(trace.name).observe(trace.duration)
+
+    def slowest(self, limit: int = 10) -> List[Trace]:
+        return sorted(self.recent, key=lambda trace: trace.duration, reverse=True)[:limit]
+
+    def get(self, trace_id: int) -> Optional[Trace]:
+        for trace in self.recent:
+            if trace.trace_id == trace_id:
+                return trace
+        return None
+
+    @staticmethod
+    def waterfall(trace: Trace) -> str:
+        total = max(trace.duration, 1e-9)
+        attrs = "".join(f" {key}={value}" for key, value in trace.attrs.items())
+        lines = [
+            f"#{trace.trace_id} {trace.name}{attrs} total={trace.duration * 1000:.1f}ms "
+            f"at {time.strftime('%H:%M:%S', time.localtime(trace.started_at))}"
+        ]
+        # span 은 시작 순서대로 쌓이므로 아직 끝나지 않은 앞선 span 들이 부모가 된다.
+        open_spans: List[Span] = []
+        for span in trace.spans:
+            while open_spans and open_spans[-1].end is not None and open_spans[-1].end <= span.start:
+                open_spans.pop()
+            depth = len(open_spans)
+            open_spans.append(span)
+            offset = span.start - trace.start
+            begin = min(int(offset / total * WATERFALL_WIDTH), WATERFALL_WIDTH - 1)
+            length = max(int(span.duration / total * WATERFALL_WIDTH), 1)
+            bar = " " * begin + "█" * min(length, WATERFALL_WIDTH - begin)
+            span_attrs = "".join(f" {key}={value}" for key, value in (span.attrs or {}).items())
+            lines.append(
+                f"|{bar:<{WATERFALL_WIDTH}}| +{offset * 1000:7.1f}ms {span.duration * 1000:7.1f}ms "
+                f"{'  ' * depth}{span.name}{span_attrs}"
+            )
+        return "\n".join(lines)
+
+
+tracer = Tracer()
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional
+
+from core.metrics.registry import MetricsRegistry
+from core.util import logger
+
+# 루프 지연은 ms 단위부터 보이도록 기본 버킷보다 촘촘하게 둔다.
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+@dataclass
+class LoopStall:
+    started_at: float
+    lag_seconds: float
+    stack: Optional[str]
+
+
+class LoopWatchdog:
+    """
+    이벤트 루프 스케줄링 지연을 계속 재고, 임계값을 넘게 막힌 구간의 스택을 샘플링합니다.
+
+    - probe 태스크가 interval 마다 깨어나며 예정 시각과 실제 시각의 차이(lag)를 기록합니다.
+    - monitor 스레드는 probe 가 예정보다 threshold 이상 늦으면 그 순간 루프 스레드의 스택을 떠 둡니다.
+      막고 있는 콜백/코루틴 스텝이 아직 실행 중일 때 찍으므로 원인 코드가 스택에 남습니다.
+    - 메트릭 갱신과 로그는 probe(루프 스레드)에서만 합니다.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        *,
+        interval: float = 0.25,
+        threshold: float = 0.1,
+        stack_sample_rate: float = 1.0,
+        min_stack_interval: float = 30.0,
+        window: int = 1200,
+    ) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.stack_sample_rate = stack_sample_rate
+        self.min_stack_interval = min_stack_interval
+        self.stall_count = 0
+        self.recent_lags: Deque[float] = deque(maxlen=window)
+        self.recent_stalls: Deque[LoopStall] = deque(maxlen=10)
+        self._lag_seconds = registry.histogram(
+            "event_loop_lag_seconds", "Event loop scheduling lag measured by the watchdog probe", buckets=LAG_BUCKETS
+        )
+        self._stalls_total = registry.counter(
+            "event_loop_stalls_total", "Times the event loop was blocked longer than the watchdog threshold"
+        )
+        self._probe_task: Optional[asyncio.Task] = None
+        self._monitor: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        # probe 가 다음에 깨어나야 하는 시각 (monitor 스레드가 읽는다)
+        self._expected_wake = 0.0
+        self._stack: Optional[str] = None
+        self._last_stack_at = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self._probe_task is not None and not self._probe_task.done()
+
+    def start(self) -> None:
+        """이벤트 루프 스레드에서 호출해야 합니다."""
+        if self.enabled:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._expected_wake = time.monotonic() + self.interval
+        self._stop_event.clear()
+        self._probe_task = asyncio.get_running_loop().create_task(self._probe(), name="loop-watchdog-probe")
+        self._monitor = threading.Thread(target=self._watch, name="loop-watchdog-monitor", daemon=True)
+        self._monitor.start()
+
+    async def stop(self) -> None:
+        self._stop_event.set()
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+            self._probe_task = None
+        self._monitor = None
+
+    async def _probe(self) -> None:
+        while True:
+            self._expected_wake = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(time.monotonic() - self._expected_wake, 0.0)
+            self._lag_seconds.observe(lag)
+            self.recent_lags.append(lag)
+            if lag >= self.threshold:
+                self._record_stall(lag)
+
+    def _record_stall(self, lag: float) -> None:
+        stack, self._stack = self._stack, None
+        self.stall_count += 1
+        self._stalls_total.inc()
+        self.recent_stalls.append(LoopStall(time.time() - lag, lag, stack))
+        logger.warning("event_loop_stall", lag_ms=round(lag * 1000, 1), stack=stack)
+
+    def _watch(self) -> None:
+        # 임계값의 절반 간격으로 확인하므로 threshold 를 넘긴 막힘은 끝나기 전에 한 번은 보게 된다.
+        poll = max(self.threshold / 2, 0.005)
+        captured_for = 0.0
+        while not self._stop_event.wait(poll):
+            expected = self._expected_wake
+            if time.monotonic() - expected < self.threshold or captured_for == expected:
+                continue
+            # 같은 막힘에 대해서는 한 번만 찍는다.
+            captured_for = expected
+            now = time.monotonic()
+            if now - self._last_stack_at < self.min_stack_interval or random.random() >= self.stack_sample_rate:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._last_stack_at = now
+            self._stack = "".join(traceback.format_stack(frame, limit=20))
+
+    def lag_percentiles(self) -> List[float]:
+        """최근 window 개 샘플 기준 p50, p90, p99, max (초)"""
+        if not self.recent_lags:
+            return [0.0, 0.0, 0.0, 0.0]
+        values = sorted(self.recent_lags)
+        last = len(values) - 1
+        return [values[int(last * q)] for q in (0.5, 0.9, 0.99)] + [values[-1]]
+
+    def status(self) -> str:
+        p50, p90, p99, worst = (value * 1000 for value in self.lag_percentiles())
+        lines = [
+            f"watchdog={'on' if self.enabled else 'off'} interval={self.interval * 1000:.0f}ms "
+            f"threshold={self.threshold * 1000:.0f}ms samples={len(self.recent_lags)}",
+            f"lag p50={p50:.1f}ms p90={p90:.1f}ms p99={p99:.1f}ms max={worst:.1f}ms stalls={self.stall_count}",
+        ]
+        if self.recent_stalls:
+            stall = self.recent_stalls[-1]
+            lines.append(f"last stall lag={stall.lag_seconds * 1000:.0f}ms at {time.strftime('%H:%M:%S', time.localtime(stall.started_at))}")
+            if stall.stack:
+                # 가장 안쪽(막고 있던) 프레임 몇 개만 보여준다.
+                lines.extend(stall.stack.rstrip().splitlines()[-6:])
+        return "\n".join(lines)
@@ -1,11 +1,22 @@
 from dataclasses import dataclass
 
+from core.model.requester import Requester
 from core.network import YoutubeSearch
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MusicApplication:
     youtube_search: YoutubeSearch
-    user_name: str
-    user_icon: str
-    user_id: int
\ No newline at end of file
+    requester: Requester
+
+    @property
+    def user_name(self) -> str:
+        return self.requester.name
+
+    @property
+    def user_icon(self) -> str:
+        return self.requester.icon
+
+    @property
+    def user_id(self) -> int:
+        return self.requester.user_id
\ No newline at end of file
@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from typing import Optional
+from weakref import WeakValueDictionary
+
+import discord
+
+
+@dataclass(frozen=True)
+class Requester:
+    """곡을 추가한 사용자입니다. 같은 사용자가 추가한 곡들은 이 객체 하나를 함께 참조합니다."""
+
+    __slots__ = ("user_id", "name", "icon", "__weakref__")
+
+    user_id: int
+    name: str
+    icon: str
+
+
+# Key: user_id — 대기열에 남은 곡이 없으면 자동으로 빠진다.
+_requesters: "WeakValueDictionary[int, Requester]" = WeakValueDictionary()
+
+
+def get_requester(user_id: int, name: str, icon: str) -> Requester:
+    requester: Optional[Requester] = _requesters.get(user_id)
+    if requester is None or requester.name != name or requester.icon != icon:
+        # 이름/아바타가 바뀌면 새 객체로 교체한다. 이미 큐에 있는 곡은 이전 값을 유지한다.
+        requester = Requester(user_id=user_id, name=name, icon=icon)
+        _requesters[user_id] = requester
+    return requester
+
+
+def requester_of(user: discord.abc.User) -> Requester:
+    return get_requester(user.id, user.name, user.display_avatar.url)
\ No newline at end of file
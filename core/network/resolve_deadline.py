@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from core.metrics import metrics
+from core.metrics.registry import Histogram
+
+T = TypeVar("T")
+
+RESOLVE_TIMEOUT_TOTAL = metrics.counter(
+    "resolve_timeout_total", "Resolutions abandoned at their deadline", ("source", "kind")
+)
+RESOLVE_HEDGE_TOTAL = metrics.counter(
+    "resolve_hedge_total", "Hedged resolutions: launched, and which attempt answered first", ("kind", "result")
+)
+
+
+class ResolveTimeout(Exception):
+    def __init__(self, source: str, kind: str, seconds: float) -> None:
+        super().__init__(f"{source} {kind} resolution exceeded {seconds:g}s")
+        self.source = source
+        self.kind = kind
+        self.seconds = seconds
+
+
+def deadline_for(kind: str) -> float:
+    from core.config import RESOLVE_PLAYLIST_TIMEOUT, RESOLVE_TIMEOUT
+
+    return RESOLVE_PLAYLIST_TIMEOUT if kind == "playlist" else RESOLVE_TIMEOUT
+
+
+async def with_deadline(awaitable: Awaitable[T], source: str, kind: str, seconds: Optional[float] = None) -> T:
+    """
+    seconds 안에 끝나지 않으면 취소하고 ResolveTimeout 을 올립니다.
+    executor 스레드에서 도는 yt-dlp 는 취소되지 않으므로 스레드는 socket_timeout 까지 남을 수 있다.
+    """
+    seconds = deadline_for(kind) if seconds is None else seconds
+    try:
+        return await asyncio.wait_for(awaitable, seconds)
+    except asyncio.TimeoutError as exc:
+        RESOLVE_TIMEOUT_TOTAL.labels(source, kind).inc()
+        raise ResolveTimeout(source, kind, seconds) from exc
+
+
+class Hedger:
+    """
+    첫 시도가 최근 p95 지연 안에 끝나지 않으면 두 번째 시도를 띄우고 먼저 성공한 쪽을 씁니다.
+
+    - 지연은 해당 종류의 resolve_seconds 히스토그램 p95 를 [min_delay, max_delay] 로 자른 값이다.
+      표본이 min_samples 보다 적으면 max_delay 를 쓴다.
+    - 동시에 떠 있는 두 번째 시도는 max_in_flight 개로 제한한다. 업스트림이 전체적으로 느릴 때 부하를 두 배로 만들지 않는다.
+    - 한쪽이 실패하면 다른 쪽을 기다리고, 둘 다 실패하면 먼저 난 오류를 올린다.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_in_flight: int = 2,
+        min_delay: float = 0.5,
+        max_delay: float = 5.0,
+        min_samples: int = 20,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.in_flight = 0
+
+    def delay_for(self, latency: Histogram) -> float:
+        if latency.count < self.min_samples:
+            return self.max_delay
+        return min(self.max_delay, max(self.min_delay, latency.quantile(0.95)))
+
+    async def run(
+        self,
+        kind: str,
+        primary: Callable[[], Awaitable[T]],
+        backup: Callable[[], Awaitable[T]],
+        delay: float,
+    ) -> T:
+        first = asyncio.ensure_future(primary())
+        second: Optional[asyncio.Future] = None
+        hedged = False
+        try:
+            done, _ = await asyncio.wait({first}, timeout=delay)
+            if done or self.in_flight >= self.max_in_flight:
+                return await first
+            hedged = True
+            self.in_flight += 1
+            RESOLVE_HEDGE_TOTAL.labels(kind, "launched").inc()
+            second = asyncio.ensure_future(backup())
+            pending = {first, second}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        RESOLVE_HEDGE_TOTAL.labels(kind, "hedge_won" if task is second else "primary_won").inc()
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            if hedged:
+                self.in_flight -= 1
+            for task in (first, second):
+                if task is not None and not task.done():
+                    task.cancel()
+
+
+resolve_hedger = Hedger()
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import random
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Hashable, Optional, Tuple
+
+from core.metrics import metrics
+from core.util import logger
+
+CLOSED = 0
+HALF_OPEN = 1
+OPEN = 2
+STATE_NAMES = ("closed", "half_open", "open")
+
+NEGATIVE_CACHE_TOTAL = metrics.counter(
+    "resolve_negative_cache_total", "Negative cache lookups and stores for failed resolutions", ("result",)
+)
+NEGATIVE_CACHE_ENTRIES = metrics.gauge("resolve_negative_cache_entries", "Queries currently negative-cached")
+BREAKER_STATE = metrics.gauge("resolve_breaker_state", "Resolution circuit breaker state (0 closed, 1 half-open, 2 open)")
+BREAKER_TRANSITIONS = metrics.counter(
+    "resolve_breaker_transitions_total", "Resolution circuit breaker state changes", ("state",)
+)
+BREAKER_REJECTED = metrics.counter("resolve_breaker_rejected_total", "Resolutions refused while the breaker is open")
+
+# yt-dlp 오류 메시지 중 업스트림이 요청을 제한하고 있다는 신호
+THROTTLE_MARKERS = (
+    "429",
+    "too many requests",
+    "rate-limit",
+    "rate limit",
+    "not a bot",
+    "http error 403",
+)
+
+
+# 그 영상/검색어 자체를 해석할 수 없다는 신호. 다시 보내도 같은 결과이므로 negative cache 에 넣는다.
+# 시간 초과, 5xx, URL 오류처럼 여기에 없는 DownloadError 는 업스트림 실패로 센다.
+UNRESOLVABLE_MARKERS = (
+    "video unavailable",
+    "this video is unavailable",
+    "is not available",
+    "private video",
+    "video is private",
+    "has been removed",
+    "has been terminated",
+    "does not exist",
+    "sign in to confirm your age",
+    "age-restricted",
+    "inappropriate for some users",
+    "not available in your country",
+    "blocked it in your country",
+    "geo restriction",
+    "members-only",
+    "join this channel",
+    "premieres in",
+    "live event will begin",
+    "copyright",
+    "unsupported url",
+    "is not a valid url",
+    "no video formats found",
+)
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    message = str(exc).lower()
+    return any(marker in message for marker in THROTTLE_MARKERS)
+
+
+def is_unresolvable_error(exc: BaseException) -> bool:
+    """영상/검색어만의 실패(비공개, 연령 제한, 지역 차단 등)면 True. 요청 제한이나 전송 오류는 False 다."""
+    if is_throttle_error(exc):
+        return False
+    message = str(exc).lower()
+    return any(marker in message for marker in UNRESOLVABLE_MARKERS)
+
+
+class ResolveCircuitOpen(Exception):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"resolution circuit is open, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class NegativeCache:
+    """
+    찾지 못했거나 해석할 수 없었던(연령 제한, 지역 차단, 비공개 등) 검색어를 ttl 초 동안 기억합니다.
+    같은 검색어를 다시 보내면 yt-dlp 를 부르지 않고 바로 "못 찾음" 으로 끝낸다.
+    """
+
+    def __init__(self, ttl: float = 300.0, size: int = 5000) -> None:
+        self.ttl = ttl
+        self.size = size
+        # Key: (kind, query), Value: 만료 시각
+        self._entries: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._hits = NEGATIVE_CACHE_TOTAL.labels("hit")
+        self._stores = NEGATIVE_CACHE_TOTAL.labels("store")
+        NEGATIVE_CACHE_ENTRIES.set_function(lambda: len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def hit(self, key: Hashable) -> bool:
+        """기억하고 있는 실패면 True (hit 으로 센다)"""
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False
+        self._hits.inc()
+        return True
+
+    def add(self, key: Hashable, ttl: Optional[float] = None) -> None:
+        if self.ttl <= 0:
+            return
+        self._entries[key] = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries.move_to_end(key)
+        self._stores.inc()
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class CircuitBreaker:
+    """
+    업스트림(YouTube)의 요청 제한을 감지하면 모든 해석을 잠시 멈춥니다.
+
+    - window 초 안에 제한 신호(429, 봇 확인 등)나 전송 오류가 threshold 번 쌓이면 열린다(OPEN).
+    - 열려 있는 동안 before_call() 은 ResolveCircuitOpen 을 올린다. 닫히기까지의 시간은
+      cooldown 에서 시작해 연속으로 열릴 때마다 두 배(max_cooldown 까지)이며 ±20% jitter 를 더한다.
+    - 시간이 지나면 HALF_OPEN 으로 요청 하나만 통과시키고, 성공하면 닫히고 실패하면 더 길게 다시 연다.
+      시험 요청이 probe_timeout 안에 끝나지 않으면 다음 요청을 시험으로 보낸다.
+      시험 요청이 결과 없이 취소되면 release_probe() 로 바로 다음 요청에 넘긴다.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: int = 5,
+        window: float = 30.0,
+        cooldown: float = 15.0,
+        max_cooldown: float = 300.0,
+        probe_timeout: float = 60.0,
+    ) -> None:
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.probe_timeout = probe_timeout
+        self.state = CLOSED
+        self.trips = 0
+        self._failures: Deque[float] = deque()
+        self._open_until = 0.0
+        self._probe_started: Optional[float] = None
+        BREAKER_STATE.set(CLOSED)
+
+    @property
+    def retry_after(self) -> float:
+        return max(0.0, self._open_until - time.monotonic())
+
+    def before_call(self) -> bool:
+        """
+        :return: 이 호출이 HALF_OPEN 시험 요청이면 True
+        :raise ResolveCircuitOpen: 열려 있거나 다른 시험 요청이 진행 중일 때
+        """
+        if self.state == CLOSED:
+            return False
+        now = time.monotonic()
+        if self.state == OPEN:
+            if now < self._open_until:
+                BREAKER_REJECTED.inc()
+                raise ResolveCircuitOpen(self._open_until - now)
+            self._set_state(HALF_OPEN)
+        if self._probe_started is not None and now - self._probe_started < self.probe_timeout:
+            BREAKER_REJECTED.inc()
+            raise ResolveCircuitOpen(0.0)
+        self._probe_started = now
+        return True
+
+    def release_probe(self) -> None:
+        """시험 요청이 성공/실패를 남기지 못하고 끝났을 때(취소) 다음 요청이 시험할 수 있게 한다."""
+        if self.state == HALF_OPEN:
+            self._probe_started = None
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            self.trips = 0
+            self._failures.clear()
+            self._probe_started = None
+            self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        now = time.monotonic()
+        if self.state == HALF_OPEN:
+            self._open(now)
+            return
+        if self.state == OPEN:
+            return
+        self._failures.append(now)
+        while self._failures and self._failures[0] <= now - self.window:
+            self._failures.popleft()
+        if len(self._failures) >= self.threshold:
+            self._open(now)
+
+    def status(self) -> Tuple[str, float]:
+        return STATE_NAMES[self.state], self.retry_after
+
+    def _open(self, now: float) -> None:
+        self.trips += 1
+        cooldown = min(self.max_cooldown, self.cooldown * 2 ** (self.trips - 1)) * random.uniform(0.8, 1.2)
+        self._open_until = now + cooldown
+        self._failures.clear()
+        self._probe_started = None
+        self._set_state(OPEN)
+        logger.warning("resolve_breaker_open", trips=self.trips, cooldown_s=round(cooldown, 1))
+
+    def _set_state(self, state: int) -> None:
+        self.state = state
+        BREAKER_STATE.set(state)
+        BREAKER_TRANSITIONS.labels(STATE_NAMES[state]).inc()
+
+
+def _create_guards() -> Tuple[NegativeCache, CircuitBreaker]:
+    from core.config import (
+        RESOLVE_BREAKER_COOLDOWN,
+        RESOLVE_BREAKER_THRESHOLD,
+        RESOLVE_BREAKER_WINDOW,
+        RESOLVE_NEGATIVE_TTL,
+    )
+
+    return (
+        NegativeCache(RESOLVE_NEGATIVE_TTL),
+        CircuitBreaker(
+            threshold=RESOLVE_BREAKER_THRESHOLD,
+            window=RESOLVE_BREAKER_WINDOW,
+            cooldown=RESOLVE_BREAKER_COOLDOWN,
+        ),
+    )
+
+
+negative_cache, resolve_breaker = _create_guards()
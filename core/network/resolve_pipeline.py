@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, Optional, Sequence, TypeVar
+
+from core.metrics import tracer
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def resolve_in_order(
+    items: Sequence[T],
+    resolve: Callable[[T], Awaitable[R]],
+    *,
+    workers: int,
+    lookahead: Optional[int] = None,
+) -> AsyncIterator[R]:
+    """
+    items 를 최대 workers 개씩 동시에 해석하고, 결과는 items 순서대로 하나씩 내보냅니다.
+
+    - 앞쪽 항목이 먼저 슬롯을 받으므로 첫 결과는 첫 항목 하나를 해석하는 시간 만에 나온다.
+    - 아직 내보내지 않은 결과는 lookahead 개(기본 workers * 4)까지만 미리 해석한다.
+      소비자가 멈추면 해석도 멈춘다.
+    - resolve 가 예외를 올리면 그 자리에서 다시 올리고 나머지 작업은 취소한다.
+      항목 하나의 실패를 건너뛰려면 resolve 가 None 같은 값을 돌려주면 된다.
+    - 소비자가 중간에 그만두면(aclose, break 후 정리) 남은 작업을 취소한다.
+    """
+    semaphore = asyncio.Semaphore(max(1, workers))
+    lookahead = max(1, lookahead or workers * 4)
+
+    async def run(item: T) -> R:
+        # 항목마다 span 을 남기면 큰 플레이리스트 하나가 trace 를 수천 개의 span 으로 채운다.
+        tracer.detach()
+        async with semaphore:
+            return await resolve(item)
+
+    pending: Deque[asyncio.Future] = deque()
+    position = 0
+    try:
+        while position < len(items) or pending:
+            while position < len(items) and len(pending) < lookahead:
+                pending.append(asyncio.ensure_future(run(items[position])))
+                position += 1
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+        for task in pending:
+            if task.done() and not task.cancelled():
+                # 끝났지만 읽지 않은 예외가 "never retrieved" 경고로 남지 않게 한다.
+                task.exception()
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, List, Optional
+
+from core.metrics import metrics, tracer
+
+INTERACTIVE = 0
+BULK = 1
+PRIORITY_NAMES = ("interactive", "bulk")
+
+RESOLVE_QUEUE_WAIT_SECONDS = metrics.histogram(
+    "resolve_queue_wait_seconds", "Time a resolution waited for a scheduler slot", ("priority",)
+)
+RESOLVE_QUEUE_REJECTED = metrics.counter(
+    "resolve_queue_rejected_total", "Resolutions rejected because the guild queue was full", ("priority",)
+)
+RESOLVE_QUEUE_WAITING = metrics.gauge("resolve_queue_waiting", "Resolutions waiting for a scheduler slot")
+RESOLVE_IN_FLIGHT = metrics.gauge("resolve_in_flight", "Resolutions currently running")
+
+
+class ResolveQueueFull(Exception):
+    def __init__(self, guild_id: int) -> None:
+        super().__init__(f"resolve queue is full for guild {guild_id}")
+        self.guild_id = guild_id
+
+
+class _Waiter:
+    __slots__ = ("guild_id", "priority", "future", "enqueued_at", "limited")
+
+    def __init__(self, guild_id: int, priority: int, future: asyncio.Future, limited: bool) -> None:
+        self.guild_id = guild_id
+        self.priority = priority
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        # 길드 대기열 길이(guild_queue)에 세는 대기자인지
+        self.limited = limited
+
+
+class ResolveScheduler:
+    """
+    검색/해석 작업(yt-dlp, Lavalink loadtracks)의 전역 동시 실행 수를 제한하고 길드 간에 공평하게 나눕니다.
+
+    - 같은 우선순위 안에서는 길드 단위 round-robin 입니다. 한 길드가 링크 20개를 붙여 넣어도
+      다른 길드의 요청은 한 바퀴마다 차례가 돌아옵니다.
+    - 단일 곡 검색(INTERACTIVE)을 플레이리스트 확장(BULK)보다 먼저 처리하되,
+      interactive_weight 번 연속으로 처리한 뒤에는 BULK 에 한 번 양보해 굶지 않게 합니다.
+    - 길드별 동시 실행 수(guild_concurrency)와 대기열 길이(guild_queue)를 제한합니다.
+      limit_queue=False 인 대기자(플레이리스트/곡 목록 worker, 재생 직전 재해석)는 거절하지 않고
+      guild_queue 에도 세지 않는다. 이런 대기자 수는 호출하는 쪽의 worker 수로 정해진다.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        *,
+        guild_concurrency: int = 2,
+        guild_queue: int = 5,
+        interactive_weight: int = 3,
+    ) -> None:
+        self.concurrency = concurrency
+        self.guild_concurrency = guild_concurrency
+        self.guild_queue = guild_queue
+        self.interactive_weight = interactive_weight
+        self.rejected = 0
+        self._queues: List["OrderedDict[int, Deque[_Waiter]]"] = [OrderedDict(), OrderedDict()]
+        self._running: Dict[int, int] = {}
+        self._waiting: Dict[int, int] = {}
+        self._active = 0
+        self._waiting_total = 0
+        self._interactive_streak = 0
+        self._wait_seconds = [RESOLVE_QUEUE_WAIT_SECONDS.labels(name) for name in PRIORITY_NAMES]
+        RESOLVE_QUEUE_WAITING.set_function(lambda: self._waiting_total)
+        RESOLVE_IN_FLIGHT.set_function(lambda: self._active)
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting_total
+
+    @asynccontextmanager
+    async def slot(self, guild_id: int, priority: int = INTERACTIVE, *, limit_queue: bool = True) -> AsyncIterator[None]:
+        with tracer.span("resolve_queue") as span:
+            span.set("priority", PRIORITY_NAMES[priority])
+            await self.acquire(guild_id, priority, limit_queue=limit_queue)
+        try:
+            yield
+        finally:
+            self.release(guild_id)
+
+    async def acquire(self, guild_id: int, priority: int = INTERACTIVE, *, limit_queue: bool = True) -> None:
+        """
+        슬롯을 받을 때까지 기다립니다. limit_queue=False 면 길드 대기열이 차 있어도 거절하지 않고 줄을 서며
+        그 대기열 길이에도 세지 않는다 (사용자가 다시 보낼 수 없는 요청, 예: 재생 직전 스트림 URL 재해석,
+        플레이리스트 항목).
+        :raise ResolveQueueFull: limit_queue 이고 길드 대기열이 가득 찼을 때
+        """
+        if (
+            self._waiting_total == 0
+            and self._active < self.concurrency
+            and self._running.get(guild_id, 0) < self.guild_concurrency
+        ):
+            self._grant(guild_id)
+            self._wait_seconds[priority].observe(0.0)
+            return
+
+        if limit_queue and self._waiting.get(guild_id, 0) >= self.guild_queue:
+            self.rejected += 1
+            RESOLVE_QUEUE_REJECTED.labels(PRIORITY_NAMES[priority]).inc()
+            raise ResolveQueueFull(guild_id)
+
+        waiter = _Waiter(guild_id, priority, asyncio.get_running_loop().create_future(), limit_queue)
+        self._queues[priority].setdefault(guild_id, deque()).append(waiter)
+        if limit_queue:
+            self._waiting[guild_id] = self._waiting.get(guild_id, 0) + 1
+        self._waiting_total += 1
+        # 다른 길드가 기다리고 있어도 남는 슬롯이 있으면 바로 나눠 준다.
+        # (기다리는 쪽이 길드별 상한에 걸려 있으면 release 가 올 때까지 아무도 깨우지 않게 된다.)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 슬롯을 받은 직후 취소되었으면 돌려준다.
+                self.release(guild_id)
+            else:
+                self._remove(waiter)
+            raise
+        self._wait_seconds[priority].observe(time.monotonic() - waiter.enqueued_at)
+
+    def release(self, guild_id: int) -> None:
+        self._active -= 1
+        running = self._running.get(guild_id, 1) - 1
+        if running > 0:
+            self._running[guild_id] = running
+        else:
+            self._running.pop(guild_id, None)
+        self._dispatch()
+
+    def _grant(self, guild_id: int) -> None:
+        self._active += 1
+        self._running[guild_id] = self._running.get(guild_id, 0) + 1
+
+    def _dispatch(self) -> None:
+        while self._active < self.concurrency and self._waiting_total:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            self._forget(waiter)
+            self._grant(waiter.guild_id)
+            waiter.future.set_result(None)
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        prefer_bulk = self._interactive_streak >= self.interactive_weight
+        order = (BULK, INTERACTIVE) if prefer_bulk else (INTERACTIVE, BULK)
+        for priority in order:
+            waiter = self._pop_round_robin(self._queues[priority])
+            if waiter is not None:
+                self._interactive_streak = self._interactive_streak + 1 if priority == INTERACTIVE else 0
+                return waiter
+        return None
+
+    def _pop_round_robin(self, queue: "OrderedDict[int, Deque[_Waiter]]") -> Optional[_Waiter]:
+        for guild_id, waiters in queue.items():
+            if self._running.get(guild_id, 0) >= self.guild_concurrency:
+                continue
+            waiter = waiters.popleft()
+            if waiters:
+                # 이번에 차례를 받은 길드는 맨 뒤로 보낸다.
+                queue.move_to_end(guild_id)
+            else:
+                del queue[guild_id]
+            return waiter
+        return None
+
+    def _remove(self, waiter: _Waiter) -> None:
+        queue = self._queues[waiter.priority]
+        waiters = queue.get(waiter.guild_id)
+        if waiters is None or waiter not in waiters:
+            return
+        waiters.remove(waiter)
+        if not waiters:
+            del queue[waiter.guild_id]
+        self._forget(waiter)
+
+    def _forget(self, waiter: _Waiter) -> None:
+        self._waiting_total -= 1
+        if not waiter.limited:
+            return
+        waiting = self._waiting.get(waiter.guild_id, 1) - 1
+        if waiting > 0:
+            self._waiting[waiter.guild_id] = waiting
+        else:
+            self._waiting.pop(waiter.guild_id, None)
+
+
+def _create_scheduler() -> ResolveScheduler:
+    from core.config import RESOLVE_CONCURRENCY, RESOLVE_GUILD_CONCURRENCY, RESOLVE_GUILD_QUEUE
+
+    return ResolveScheduler(
+        RESOLVE_CONCURRENCY,
+        guild_concurrency=RESOLVE_GUILD_CONCURRENCY,
+        guild_queue=RESOLVE_GUILD_QUEUE,
+    )
+
+
+resolve_scheduler = _create_scheduler()
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import math
+import os
+import random
+import time
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from core.util import log_event, logger
+
+CASSETTE_VERSION = 1
+
+# dict_to_youtube_search 와 플레이리스트 처리에 필요한 yt-dlp info dict 필드만 남긴다.
+# _type/id 는 flat 플레이리스트 항목(아직 해석하지 않은 곡)을 알아보는 데 쓴다.
+YTDLP_FIELDS = (
+    "_type",
+    "id",
+    "title",
+    "url",
+    "thumbnail",
+    "duration",
+    "duration_string",
+    "display_id",
+    "webpage_url",
+    "uploader_id",
+    "uploader",
+    "uploader_url",
+)
+# _search_tracks_lavalink 가 읽는 pomice Track 속성
+LAVALINK_TRACK_FIELDS = ("title", "uri", "identifier", "length", "author", "thumbnail")
+
+
+class LatencyModel:
+    """
+    재생 모드에서 응답 전에 기다릴 시간을 정합니다.
+    recorded | none | fixed:<ms> | uniform:<min_ms>,<max_ms> | lognormal:<median_ms>,<sigma>
+    """
+
+    def __init__(self, spec: str = "recorded") -> None:
+        self.spec = spec
+        kind, _, args = spec.partition(":")
+        values = [float(x) for x in args.split(",") if x.strip()]
+        if kind == "fixed" and len(values) == 1:
+            self._sample = lambda recorded_ms: values[0]
+        elif kind == "uniform" and len(values) == 2:
+            self._sample = lambda recorded_ms: random.uniform(values[0], values[1])
+        elif kind == "lognormal" and len(values) == 2:
+            mu = math.log(max(values[0], 0.001))
+            self._sample = lambda recorded_ms: random.lognormvariate(mu, values[1])
+        elif kind in ("none", "0"):
+            self._sample = lambda recorded_ms: 0.0
+        elif kind == "recorded":
+            self._sample = lambda recorded_ms: recorded_ms
+        else:
+            raise ValueError(f"Unknown cassette latency spec: {spec}")
+
+    def sample_ms(self, recorded_ms: float) -> float:
+        return max(self._sample(recorded_ms), 0.0)
+
+    async def wait(self, recorded_ms: float) -> None:
+        delay_ms = self.sample_ms(recorded_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+
+def compact_ytdlp_info(data: Optional[dict]) -> Optional[dict]:
+    if data is None:
+        return None
+    compact = {key: data[key] for key in YTDLP_FIELDS if key in data}
+    if data.get("entries") is not None:
+        # entries 가 generator 면 호출자도 읽을 수 있도록 list 로 고정한다.
+        data["entries"] = list(data["entries"])
+        compact["entries"] = [compact_ytdlp_info(entry) for entry in data["entries"]]
+    return compact
+
+
+def dump_lavalink_result(results: Any) -> Optional[dict]:
+    def dump_track(track) -> dict:
+        return {key: getattr(track, key, None) for key in LAVALINK_TRACK_FIELDS}
+
+    if results is None:
+        return None
+    if isinstance(results, list):
+        return {"type": "list", "tracks": [dump_track(t) for t in results]}
+    if hasattr(results, "tracks"):
+        playlist_info = getattr(results, "playlist_info", None)
+        name = None
+        if playlist_info is not None:
+            name = getattr(playlist_info, "name", None) or getattr(playlist_info, "title", None)
+        name = name or getattr(results, "name", None)
+        return {"type": "playlist", "name": name, "tracks": [dump_track(t) for t in results.tracks]}
+    return {"type": "track", "track": dump_track(results)}
+
+
+def load_lavalink_result(data: Optional[dict]) -> Any:
+    if data is None:
+        return None
+    if data["type"] == "list":
+        return [SimpleNamespace(**t) for t in data["tracks"]]
+    if data["type"] == "playlist":
+        return SimpleNamespace(
+            tracks=[SimpleNamespace(**t) for t in data["tracks"]],
+            playlist_info=SimpleNamespace(name=data["name"]),
+            name=data["name"],
+        )
+    return SimpleNamespace(**data["track"])
+
+
+class ResolverCassette:
+    """
+    해석 경로(yt-dlp extract_info, Lavalink loadtracks)의 입력/출력을 녹화하거나 재생합니다.
+    mode 가 off 이면 fetch 를 그대로 호출합니다.
+    """
+
+    def __init__(
+        self,
+        mode: str = "off",
+        path: Optional[str] = None,
+        latency: Optional[LatencyModel] = None,
+        *,
+        save_interval: float = 5.0,
+    ) -> None:
+        if mode not in ("off", "record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.mode = mode
+        self.path = path
+        self.latency = latency or LatencyModel()
+        self.misses = 0
+        self.save_interval = save_interval
+        self._entries: Dict[str, dict] = {}
+        self._dirty = False
+        self._save_task: Optional[asyncio.Task] = None
+        self._save_lock: Optional[asyncio.Lock] = None
+        if mode != "off" and path and os.path.exists(path):
+            self._entries = self._read(path)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self):
+        return list(self._entries)
+
+    async def ytdlp(self, kind: str, query: str, fetch: Callable[[], Awaitable[Optional[dict]]]) -> Optional[dict]:
+        return await self._run(f"ytdlp:{kind}:{query}", fetch, compact_ytdlp_info, lambda data: data)
+
+    async def lavalink(self, query: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        return await self._run(f"lavalink:{query}", fetch, dump_lavalink_result, load_lavalink_result)
+
+    async def _run(self, key: str, fetch, dump, load):
+        if self.mode == "off":
+            return await fetch()
+
+        if self.mode == "replay":
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                logger.warning("cassette_miss", key=key)
+                return None
+            await self.latency.wait(entry["elapsed_ms"])
+            return load(entry["data"])
+
+        start_time = time.monotonic()
+        result = await fetch()
+        self._entries[key] = {
+            "elapsed_ms": round((time.monotonic() - start_time) * 1000, 1),
+            "data": dump(result),
+        }
+        # 해석할 때마다 파일 전체를 gzip 으로 다시 쓰면 이벤트 루프가 멈추므로
+        # 표시만 해 두고 save_interval 마다 한 번, 스레드에서 저장한다.
+        self._dirty = True
+        if self._save_task is None:
+            self._save_task = asyncio.create_task(self._save_later())
+        return result
+
+    async def _save_later(self) -> None:
+        try:
+            await asyncio.sleep(self.save_interval)
+        finally:
+            self._save_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """변경된 내용이 있으면 executor 에서 저장합니다."""
+        if not self._dirty or not self.path:
+            return
+        if self._save_lock is None:
+            self._save_lock = asyncio.Lock()
+        async with self._save_lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            # 저장하는 동안 새 항목이 들어와도 되도록 얕은 복사본을 넘긴다 (항목은 한 번 쓰면 바뀌지 않는다).
+            entries = dict(self._entries)
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self._write, self.path, entries)
+            except Exception as exc:
+                self._dirty = True
+                log_event(f"resolver cassette save failed path={self.path}: {exc}")
+
+    async def close(self) -> None:
+        """대기 중인 저장을 취소하고 남은 변경을 바로 저장합니다."""
+        if self._save_task is not None:
+            self._save_task.cancel()
+            self._save_task = None
+        await self.flush()
+
+    def save(self) -> None:
+        if self.path:
+            self._write(self.path, self._entries)
+            self._dirty = False
+
+    @staticmethod
+    def _write(path: str, entries: Dict[str, dict]) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump({"version": CASSETTE_VERSION, "entries": entries}, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read(path: str) -> Dict[str, dict]:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+        if payload.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version: {payload.get('version')}")
+        return payload["entries"]
+
+
+_resolver_cassette: Optional[ResolverCassette] = None
+
+
+def get_resolver_cassette() -> ResolverCassette:
+    # 설정은 첫 사용 시점에 읽는다 (app.py 의 load_dotenv 이후).
+    global _resolver_cassette
+    if _resolver_cassette is None:
+        from core.config import (
+            RESOLVER_CASSETTE_LATENCY,
+            RESOLVER_CASSETTE_MODE,
+            RESOLVER_CASSETTE_PATH,
+            RESOLVER_CASSETTE_SAVE_INTERVAL,
+        )
+
+        _resolver_cassette = ResolverCassette(
+            RESOLVER_CASSETTE_MODE,
+            RESOLVER_CASSETTE_PATH,
+            LatencyModel(RESOLVER_CASSETTE_LATENCY),
+            save_interval=RESOLVER_CASSETTE_SAVE_INTERVAL,
+        )
+        if _resolver_cassette.mode != "off":
+            log_event(
+                f"resolver cassette mode={_resolver_cassette.mode} path={RESOLVER_CASSETTE_PATH} "
+                f"entries={len(_resolver_cassette)} latency={RESOLVER_CASSETTE_LATENCY}"
+            )
+    return _resolver_cassette
+
+
+def set_resolver_cassette(cassette: Optional[ResolverCassette]) -> None:
+    global _resolver_cassette
+    _resolver_cassette = cassette
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from core.cluster.protocol import STREAM_LIMIT, IpcConnection, IpcError
+from core.metrics import metrics
+from core.network.resolver_cassette import compact_ytdlp_info
+from core.network.youtube.track_table import stream_expires_at
+from core.util import logger
+
+SIDECAR_REQUESTS_TOTAL = metrics.counter(
+    "resolver_sidecar_requests_total", "yt-dlp resolutions sent to the resolver sidecar", ("kind", "result")
+)
+
+# 스트림 URL 이 만료되기 이 시간 전에는 캐시에서 내린다.
+STREAM_EXPIRY_MARGIN = 600.0
+# 재생에 실패한 뒤 다시 해석하는 요청은 캐시를 읽지 않는다. 캐시에 남은 URL 이 거부된 것일 수 있다.
+UNCACHED_KINDS = ("stream",)
+
+CacheKey = Tuple[str, str]
+
+
+class SidecarUnavailable(Exception):
+    """sidecar 에 연결할 수 없거나 응답이 없을 때. 호출자는 프로세스 안에서 직접 해석합니다."""
+
+
+def _min_stream_expiry(info: Optional[dict]) -> Optional[int]:
+    if info is None:
+        return None
+    expiries = [stream_expires_at(info.get("url"))]
+    expiries.extend(stream_expires_at(entry.get("url")) for entry in info.get("entries") or () if entry)
+    expiries = [expiry for expiry in expiries if expiry is not None]
+    return min(expiries) if expiries else None
+
+
+class ResolverSidecarServer:
+    """
+    yt-dlp 해석을 전담하는 별도 프로세스입니다. 같은 호스트의 모든 봇 프로세스(클러스터 worker 포함)가
+    Unix 소켓으로 붙어 요청을 보내고, 결과는 여기서 한 번만 해석해 공유 캐시에 둡니다.
+
+    - 연결마다 요청을 여러 개 동시에 보낼 수 있고(pipelining), 응답은 끝나는 순서대로 갑니다.
+    - 같은 (kind, query) 가 동시에 들어오면 해석은 한 번만 하고 결과를 나눠 줍니다.
+    - 응답은 매퍼가 읽는 필드만 남긴 compact dict 입니다. 캐시 수명은 cache_ttl 과
+      스트림 URL 의 expire 중 빠른 쪽입니다.
+    """
+
+    def __init__(self, path: str, *, workers: int = 4, cache_ttl: float = 1800.0, cache_size: int = 5000) -> None:
+        self.path = path
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resolver")
+        # Key: (kind, query), Value: (만료 시각, compact info)
+        self._cache: "OrderedDict[CacheKey, Tuple[float, Optional[dict]]]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self._connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._on_connect, self.path, limit=STREAM_LIMIT)
+        logger.info("resolver_sidecar_start", path=self.path, workers=self._executor._max_workers)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections += 1
+        try:
+            await IpcConnection(reader, writer, {"ytdlp": self._ytdlp, "stats": self._stats}).serve()
+        finally:
+            self._connections -= 1
+
+    async def _stats(self, _: Any = None) -> Dict[str, Any]:
+        return {
+            "connections": self._connections,
+            "cache_entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "inflight": len(self._inflight),
+        }
+
+    async def _ytdlp(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        해석 실패는 예외로 올리지 않고 {"error": ...} 로 돌려준다. IpcError 응답은 클라이언트가
+        연결 문제로 볼 수 있으므로 요청 하나의 실패가 같은 연결의 다른 요청까지 끊지 않게 한다.
+        """
+        try:
+            return await self._resolve(data)
+        except Exception as exc:
+            self.errors += 1
+            logger.warning("resolver_sidecar_error", error=repr(exc))
+            return {"error": repr(exc)}
+
+    async def _resolve(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        key = (data["kind"], data["query"])
+        cached = self._cache.get(key) if key[0] not in UNCACHED_KINDS else None
+        if cached is not None and cached[0] > time.time():
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return {"info": cached[1]}
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._extract(key)
+            future.set_result(result)
+            return result
+        except Exception as exc:
+            future.set_exception(exc)
+            # 기다리는 쪽이 없으면 "exception was never retrieved" 경고가 남지 않도록 읽어 둔다.
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _extract(self, key: CacheKey) -> Dict[str, Any]:
+        import yt_dlp
+
+        from core.network.youtube.youtube_service import FLAT_KINDS, YoutubeService
+
+        kind, query = key
+        loop = asyncio.get_running_loop()
+        try:
+            info = await loop.run_in_executor(
+                self._executor, YoutubeService._extract_info_sync, query, kind in FLAT_KINDS
+            )
+        except (yt_dlp.utils.ExtractorError, yt_dlp.utils.DownloadError) as exc:
+            # 해석 실패는 전송 오류와 구분해 돌려준다. 호출자는 같은 예외로 다시 올린다.
+            self.errors += 1
+            return {"error": str(exc)}
+        compact = compact_ytdlp_info(info)
+        expires_at = time.time() + self.cache_ttl
+        stream_expiry = _min_stream_expiry(compact)
+        if stream_expiry is not None:
+            expires_at = min(expires_at, stream_expiry - STREAM_EXPIRY_MARGIN)
+        self._cache[key] = (expires_at, compact)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return {"info": compact}
+
+
+class SidecarResolver:
+    """
+    봇 프로세스 쪽 클라이언트입니다. 처음 요청할 때 연결하고, 연결이 끊기거나 실패하면
+    retry_interval 동안은 시도하지 않고 바로 SidecarUnavailable 을 올려 호출자가 직접 해석하게 합니다.
+    """
+
+    def __init__(self, path: str, *, timeout: float = 30.0, retry_interval: float = 30.0) -> None:
+        self.path = path
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self._connection: Optional[IpcConnection] = None
+        self._serve_task: Optional[asyncio.Task] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._retry_at = 0.0
+
+    @property
+    def available(self) -> bool:
+        return (self._connection is not None and not self._connection.closed) or time.monotonic() >= self._retry_at
+
+    async def _connect(self) -> IpcConnection:
+        if self._connection is not None and not self._connection.closed:
+            return self._connection
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._connection is None or self._connection.closed:
+                reader, writer = await asyncio.open_unix_connection(self.path, limit=STREAM_LIMIT)
+                self._connection = IpcConnection(reader, writer)
+                self._serve_task = asyncio.create_task(self._connection.serve(), name="resolver-sidecar")
+        return self._connection
+
+    async def extract(self, kind: str, query: str) -> Optional[dict]:
+        import yt_dlp
+
+        if not self.available:
+            raise SidecarUnavailable("waiting to retry")
+        try:
+            connection = await self._connect()
+            reply = await connection.request("ytdlp", {"kind": kind, "query": query}, timeout=self.timeout)
+        except asyncio.TimeoutError as exc:
+            # 이 요청만 포기한다. 같은 연결의 다른 요청은 계속 기다린다.
+            SIDECAR_REQUESTS_TOTAL.labels(kind, "timeout").inc()
+            raise SidecarUnavailable("timed out") from exc
+        except IpcError as exc:
+            if self._connection is not None and not self._connection.closed:
+                # 서버가 이 요청에만 오류로 답했다. 연결과 다른 요청은 그대로 둔다.
+                SIDECAR_REQUESTS_TOTAL.labels(kind, "error").inc()
+                raise SidecarUnavailable(repr(exc)) from exc
+            SIDECAR_REQUESTS_TOTAL.labels(kind, "unavailable").inc()
+            self._retry_at = time.monotonic() + self.retry_interval
+            raise SidecarUnavailable(repr(exc)) from exc
+        except OSError as exc:
+            SIDECAR_REQUESTS_TOTAL.labels(kind, "unavailable").inc()
+            self._retry_at = time.monotonic() + self.retry_interval
+            if self._connection is not None:
+                await self._connection.close()
+            raise SidecarUnavailable(repr(exc)) from exc
+        if "error" in reply:
+            SIDECAR_REQUESTS_TOTAL.labels(kind, "error").inc()
+            raise yt_dlp.utils.DownloadError(reply["error"])
+        SIDECAR_REQUESTS_TOTAL.labels(kind, "ok").inc()
+        return reply["info"]
+
+
+_sidecar: Optional[SidecarResolver] = None
+
+
+def get_sidecar_resolver() -> Optional[SidecarResolver]:
+    """RESOLVER_SOCKET 이 비어 있으면 None (항상 프로세스 안에서 해석)."""
+    global _sidecar
+    if _sidecar is None:
+        from core.config import RESOLVER_SOCKET
+
+        if not RESOLVER_SOCKET:
+            return None
+        _sidecar = SidecarResolver(RESOLVER_SOCKET)
+    return _sidecar
+
+
+async def main() -> None:
+    from core.config import RESOLVER_CACHE_TTL, RESOLVER_SOCKET, RESOLVER_WORKERS
+
+    server = ResolverSidecarServer(
+        os.path.abspath(RESOLVER_SOCKET or "./resolver.sock"),
+        workers=RESOLVER_WORKERS,
+        cache_ttl=RESOLVER_CACHE_TTL,
+    )
+    await server.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+        logger.flush()
+
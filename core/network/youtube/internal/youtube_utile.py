@@ -30,6 +30,11 @@ def get_song_url(url: str) -> Optional[str]:
         return f"https://www.youtube.com/watch?v={video_id}"
     return None
 
+def get_video_id(url: str) -> Optional[str]:
+    # watch?v=, youtu.be/, live/, shorts/ 링크의 11자리 video id (추가 파라미터는 무시)
+    match = re.search(r"(?:[?&]v=|youtu\.be/|/live/|/shorts/)([A-Za-z0-9_-]{11})", url)
+    return match.group(1) if match and is_youtube_url(url) else None
+
 if __name__ == '__main__':
     print(is_youtube_url("https://www.youtube.com/playlist?list=PLg3uhUAs7P6o_mdJI3T2XZsGVTmn3g7g6"))
     print(is_playlist_url("https://www.youtube.com/playlist?list=PLg3uhUAs7P6o_mdJI3T2XZsGVTmn3g7g6"))
@@ -37,4 +42,5 @@ if __name__ == '__main__':
     print(is_playlist_url("https://www.youtube.com/watch?v=htALtC8nZiQ"))
     print(get_song_url("https://www.youtube.com/watch?v=mBXBOLG06Wc&list=PLg3uhUAs7P6o_mdJI3T2XZsGVTmn3g7g6&index=1"))
     print(get_song_url("https://youtu.be/mBXBOLG06Wc?si=rOtXyr4ST31MJvzK"))
-    print(get_song_url("https://www.youtube.com/live/4Df04ViiX5U"))
\ No newline at end of file
+    print(get_song_url("https://www.youtube.com/live/4Df04ViiX5U"))
+    print(get_video_id("https://youtu.be/mBXBOLG06Wc?si=rOtXyr4ST31MJvzK"))
\ No newline at end of file
@@ -1,10 +1,12 @@
 from typing import Optional
 import traceback
 from core.network.youtube import YoutubeSearch
+from core.network.youtube.track_table import track_table
 
 def dict_to_youtube_search(target: dict) -> Optional[YoutubeSearch]:
     try:
-        return YoutubeSearch(
+        # 같은 영상은 모든 길드가 객체 하나를 공유한다.
+        return track_table.intern(YoutubeSearch(
             title=target["title"],
             audio_source=target["url"],
             thumbnail_url=target["thumbnail"],
@@ -15,7 +17,7 @@ def dict_to_youtube_search(target: dict) -> Optional[YoutubeSearch]:
             channel_id=target["uploader_id"],
             channel_name=target["uploader"],
             channel_url=target["uploader_url"],
-        )
+        ))
     except:
         traceback.print_exc()
         return None
\ No newline at end of file
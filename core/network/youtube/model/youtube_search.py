@@ -1,14 +1,91 @@
+import sys
 from dataclasses import dataclass
+from typing import Optional
 
-@dataclass
+_intern = sys.intern
+_set_field = object.__setattr__
+
+THUMBNAIL_PREFIX = "https://i.ytimg.com/vi/"
+WATCH_URL_PREFIX = "https://www.youtube.com/watch?v="
+
+
+@dataclass(init=False, frozen=True)
 class YoutubeSearch:
+    """
+    곡 메타데이터입니다. 대기열과 플레이리스트에 수천 개씩 쌓이므로 slots + frozen 으로 두고,
+    video_id 로 만들 수 있는 썸네일/영상 URL 은 기본 형식과 다를 때만 저장합니다.
+    생성자 인자는 예전 dataclass 필드와 같습니다.
+    같은 영상은 길드와 상관없이 track_table 을 통해 객체 하나를 공유하므로 약한 참조를 허용합니다.
+    """
+
+    __slots__ = (
+        "audio_source",
+        "title",
+        "duration",
+        "duration_string",
+        "video_id",
+        "channel_id",
+        "channel_url",
+        "channel_name",
+        "_thumbnail",
+        "_video_url",
+        "__weakref__",
+    )
+
     audio_source: str #url
     title: str # fulltitle
-    thumbnail_url: str #thumbnail
     duration: int
     duration_string: str # duration_string
     video_id: str # display_id
-    video_url: str
     channel_id: str # @viberefuel
     channel_url: str # uploader_url
-    channel_name: str # uploader
\ No newline at end of file
+    channel_name: str # uploader
+    # i.ytimg.com/vi/<video_id>/ 아래 파일 이름 또는 그 외 전체 URL
+    _thumbnail: Optional[str]
+    # watch?v=<video_id> 와 다를 때만 저장
+    _video_url: Optional[str]
+
+    def __init__(
+        self,
+        audio_source: str,
+        title: str,
+        thumbnail_url: Optional[str],
+        duration: int,
+        duration_string: str,
+        video_id: str,
+        video_url: Optional[str],
+        channel_id: str,
+        channel_url: str,
+        channel_name: str,
+    ) -> None:
+        # 채널 이름/URL 처럼 여러 곡이 공유하는 짧은 문자열은 intern 해 한 벌만 둔다 (None 은 그대로).
+        _set_field(self, "audio_source", audio_source)
+        _set_field(self, "title", title)
+        _set_field(self, "duration", duration)
+        _set_field(self, "duration_string", duration_string and _intern(duration_string))
+        _set_field(self, "video_id", video_id)
+        _set_field(self, "channel_id", channel_id and _intern(channel_id))
+        _set_field(self, "channel_url", channel_url and _intern(channel_url))
+        _set_field(self, "channel_name", channel_name and _intern(channel_name))
+
+        thumbnail = thumbnail_url
+        if video_id and thumbnail:
+            head, _, file_name = thumbnail.rpartition("/")
+            if head == THUMBNAIL_PREFIX + video_id:
+                # hqdefault.jpg, maxresdefault.jpg 등 파일 이름만 남긴다.
+                thumbnail = _intern(file_name)
+        _set_field(self, "_thumbnail", thumbnail)
+        _set_field(self, "_video_url", None if video_id and video_url == WATCH_URL_PREFIX + video_id else video_url)
+
+    @property
+    def thumbnail_url(self) -> Optional[str]:
+        thumbnail = self._thumbnail
+        if thumbnail and not thumbnail.startswith(("http://", "https://")):
+            return f"{THUMBNAIL_PREFIX}{self.video_id}/{thumbnail}"
+        return thumbnail
+
+    @property
+    def video_url(self) -> Optional[str]:
+        if self._video_url is None and self.video_id:
+            return f"{WATCH_URL_PREFIX}{self.video_id}"
+        return self._video_url
\ No newline at end of file
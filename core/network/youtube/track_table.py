@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, Optional, Set
+from urllib.parse import parse_qs, urlsplit
+from weakref import WeakValueDictionary
+
+from core.metrics import metrics
+from core.network.youtube.model import YoutubeSearch
+
+TRACK_INTERN_TOTAL = metrics.counter(
+    "track_intern_total", "YoutubeSearch intern lookups by video id", ("result",)
+)
+TRACK_TABLE_ENTRIES = metrics.gauge("track_table_entries", "Distinct videos referenced by any queue")
+
+
+def stream_expires_at(url: Optional[str]) -> Optional[int]:
+    """googlevideo 스트림 URL 의 expire 쿼리 값 (epoch 초). 없으면 None"""
+    if not url or "expire=" not in url:
+        return None
+    values = parse_qs(urlsplit(url).query).get("expire")
+    if not values or not values[0].isdigit():
+        return None
+    return int(values[0])
+
+
+class TrackTable:
+    """
+    프로세스 전체에서 video id 하나당 YoutubeSearch 하나만 남도록 하는 intern 테이블입니다.
+    값은 약한 참조라 어느 길드 대기열에도 남지 않은 영상은 자동으로 빠집니다.
+
+    메타데이터 객체는 불변이므로 만료되는 스트림 URL 은 여기서 따로 관리합니다.
+    재생할 때는 track.youtube_search.audio_source 대신 stream_url() 을 사용하세요.
+    """
+
+    def __init__(self) -> None:
+        self._searches: "WeakValueDictionary[str, YoutubeSearch]" = WeakValueDictionary()
+        # Key: video_id, Value: 처음 해석한 뒤 갱신된 스트림 URL
+        self._stream_urls: Dict[str, str] = {}
+        # 만료/실패로 무효화되어 다시 해석해야 하는 video_id
+        self._stale: Set[str] = set()
+        self._hits = TRACK_INTERN_TOTAL.labels("hit")
+        self._misses = TRACK_INTERN_TOTAL.labels("miss")
+        TRACK_TABLE_ENTRIES.set_function(lambda: len(self._searches))
+
+    def __len__(self) -> int:
+        return len(self._searches)
+
+    def get(self, video_id: str) -> Optional[YoutubeSearch]:
+        return self._searches.get(video_id)
+
+    def intern(self, search: Optional[YoutubeSearch]) -> Optional[YoutubeSearch]:
+        """
+        같은 video id 의 객체가 이미 있으면 그것을 돌려줍니다.
+        새로 해석한 결과의 스트림 URL 이 다르면 모든 길드가 보도록 중앙에서 갱신합니다.
+        """
+        if search is None or not search.video_id:
+            return search
+        video_id = search.video_id
+        existing = self._searches.get(video_id)
+        if existing is None:
+            self._misses.inc()
+            self._searches[video_id] = search
+            self._stream_urls.pop(video_id, None)
+            self._stale.discard(video_id)
+            return search
+
+        self._hits.inc()
+        if not existing.channel_id and search.channel_id:
+            # Lavalink 검색 미리보기(채널 정보 없음, audio_source 는 영상 URL)보다 나중에 온 yt-dlp 결과를 대표로 둔다.
+            # 객체는 불변이므로 미리보기를 고치지 않는다. 미리보기를 든 대기열도 stream_url() 로 새 스트림 URL 을 쓴다.
+            self._searches[video_id] = search
+            self.refresh_stream(video_id, search.audio_source)
+            return search
+        if search.audio_source and (
+            video_id in self._stale or search.audio_source != self.stream_url(existing)
+        ):
+            self.refresh_stream(video_id, search.audio_source)
+        return existing
+
+    def stream_url(self, search: YoutubeSearch) -> str:
+        return self._stream_urls.get(search.video_id, search.audio_source)
+
+    def refresh_stream(self, video_id: str, url: str) -> None:
+        if video_id not in self._searches:
+            return
+        self._stream_urls[video_id] = url
+        self._stale.discard(video_id)
+        self._prune()
+
+    def invalidate(self, video_id: str) -> None:
+        """이 영상을 대기열에 가진 모든 길드가 다음 재생 때 스트림 URL 을 다시 해석하게 합니다."""
+        self._stream_urls.pop(video_id, None)
+        if video_id in self._searches:
+            self._stale.add(video_id)
+            self._prune()
+
+    def is_stale(self, search: YoutubeSearch, *, now: Optional[float] = None, margin: float = 60.0) -> bool:
+        """무효화되었거나 스트림 URL 의 expire 가 margin 초 안으로 다가왔는지"""
+        if search.video_id in self._stale:
+            return True
+        expires_at = stream_expires_at(self.stream_url(search))
+        if expires_at is None:
+            return False
+        return expires_at - margin <= (time.time() if now is None else now)
+
+    def invalidate_expired(self, *, now: Optional[float] = None, margin: float = 60.0) -> int:
+        """만료가 가까운 스트림 URL 을 한 번에 무효화하고 그 개수를 돌려줍니다."""
+        count = 0
+        for video_id, search in list(self._searches.items()):
+            if video_id not in self._stale and self.is_stale(search, now=now, margin=margin):
+                self.invalidate(video_id)
+                count += 1
+        return count
+
+    def _prune(self) -> None:
+        # 메타데이터가 사라진 영상의 스트림 URL/무효화 표시는 테이블이 커졌을 때만 정리한다.
+        if len(self._stream_urls) + len(self._stale) <= 2 * len(self._searches) + 64:
+            return
+        live = self._searches
+        self._stream_urls = {key: url for key, url in self._stream_urls.items() if key in live}
+        self._stale = {key for key in self._stale if key in live}
+
+
+track_table = TrackTable()
\ No newline at end of file
@@ -1,15 +1,45 @@
 import asyncio
 import time
-from typing import Optional, Union, List
-import yt_dlp
+from contextlib import AbstractAsyncContextManager
+from typing import AsyncIterator, Callable, Optional, Union, List, Tuple, Type
 
 from core import IS_DEBUG
-from core.util import log_event
+from core.config import RESOLVE_HEDGE
+from core.metrics import metrics, tracer
+from core.util import logger
 from core.network import YoutubePlaylist
 from core.network.youtube import YoutubeSearch
 from core.network.youtube.mapper.youtube_search_mapper import dict_to_youtube_search
+from core.network.youtube.track_table import track_table
+from core.network.resolve_deadline import ResolveTimeout, resolve_hedger, with_deadline
+from core.network.resolve_guard import is_unresolvable_error, negative_cache, resolve_breaker
+from core.network.resolve_pipeline import resolve_in_order
+from core.network.resolver_cassette import get_resolver_cassette
+from core.network.resolver_sidecar import SidecarUnavailable, get_sidecar_resolver
 from core.network.youtube.internal.youtube_utile import is_youtube_url, is_playlist_url, get_song_url
 
+RESOLVE_SECONDS = metrics.histogram("resolve_seconds", "Track resolution latency", ("source", "kind"))
+RESOLVE_TOTAL = metrics.counter("resolve_total", "Track resolution attempts", ("source", "kind", "result"))
+# 한 곡짜리 해석만 hedge 한다. 플레이리스트를 두 번 해석하는 비용은 꼬리 지연을 줄이는 이득보다 크다.
+HEDGED_KINDS = ("url", "search", "stream")
+# 플레이리스트는 항목 목록(id, 제목)만 빠르게 받고, 항목은 playlist_entry 로 하나씩 동시에 해석한다.
+FLAT_KINDS = ("playlist",)
+# 재생 직전 재해석은 실패를 기억하지 않는다. 일시적인 실패로 모든 길드가 그 곡을 몇 분 동안 건너뛰게 된다.
+UNCACHED_NEGATIVE_KINDS = ("stream",)
+# 목록에는 남아 있지만 해석할 수 없는 항목
+UNAVAILABLE_ENTRY_TITLES = ("[Private video]", "[Deleted video]")
+PLAYLIST_ENTRIES_TOTAL = metrics.counter(
+    "playlist_entries_total", "Playlist entries resolved one by one after a flat listing", ("result",)
+)
+
+
+def _ytdlp_errors() -> Tuple[Type[Exception], ...]:
+    # yt-dlp 는 import 만 수십 ms 가 걸리므로 실제로 해석하거나 예외를 거를 때 불러온다.
+    import yt_dlp
+
+    return yt_dlp.utils.ExtractorError, yt_dlp.utils.DownloadError
+
+
 class YoutubeService:
 
     YDL_OPTIONS = {
@@ -17,6 +47,8 @@ class YoutubeService:
         "format": "bestaudio[protocol=https]/bestaudio[protocol!=m3u8_native]/bestaudio/best",#"bestaudio/best",
         #"simulate": True,
         "skip_download": True,
+        # 마감 시간이 지나 버려진 해석 스레드가 멈춘 연결에 오래 붙잡혀 있지 않게 한다.
+        "socket_timeout": 10,
         #"postprocessors": [{'key': 'FFmpegExtractAudio','preferredcodec': "mp3",'preferredquality': '192'}],
         'cookiefile': './cookies.txt'
     }
@@ -31,75 +63,204 @@ class YoutubeService:
 
 
     @staticmethod
-    async def url_search(url: str) -> Optional[YoutubeSearch]:
-        loop = asyncio.get_event_loop()
+    def _extract_info_sync(query: str, flat: bool = False) -> Optional[dict]:
+        import yt_dlp
+
+        options = {**YoutubeService.YDL_OPTIONS, "extract_flat": "in_playlist"} if flat else YoutubeService.YDL_OPTIONS
+        with yt_dlp.YoutubeDL(options) as ytdl:
+            ytdl.cookiejar.load('./cookies.txt', ignore_discard=True, ignore_expires=True)
+            return ytdl.extract_info(query, download=False)
+
+    @staticmethod
+    async def _fetch_info(kind: str, query: str) -> Optional[dict]:
+        # sidecar 가 설정되어 있으면 먼저 보내고, 연결할 수 없으면 이 프로세스에서 직접 해석한다.
+        sidecar = get_sidecar_resolver()
+        if sidecar is not None and sidecar.available:
+            try:
+                return await sidecar.extract(kind, query)
+            except SidecarUnavailable as exc:
+                logger.warning("resolver_sidecar_fallback", kind=kind, error=str(exc))
+        return await YoutubeService._fetch_local(query, kind in FLAT_KINDS)
+
+    @staticmethod
+    async def _fetch_local(query: str, flat: bool = False) -> Optional[dict]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, YoutubeService._extract_info_sync, query, flat)
+
+    @staticmethod
+    async def _fetch_hedged(kind: str, query: str) -> Optional[dict]:
+        # 두 번째 시도는 sidecar 를 거치지 않는다. sidecar 는 같은 검색어를 하나로 합치므로 다시 보내도 같은 요청을 기다리게 된다.
+        return await resolve_hedger.run(
+            kind,
+            lambda: YoutubeService._fetch_info(kind, query),
+            lambda: YoutubeService._fetch_local(query),
+            resolve_hedger.delay_for(RESOLVE_SECONDS.labels("ytdlp", kind)),
+        )
+
+    @staticmethod
+    async def _extract_info(kind: str, query: str) -> Optional[dict]:
+        key = (kind, query)
+        # 최근에 못 찾았거나 해석할 수 없었던 검색어는 다시 보내지 않는다.
+        if negative_cache.hit(key):
+            RESOLVE_TOTAL.labels("ytdlp", kind, "negative_cached").inc()
+            return None
+        # 요청 제한으로 차단기가 열려 있으면 ResolveCircuitOpen 을 올린다.
+        probe = resolve_breaker.before_call()
+        fetch = YoutubeService._fetch_hedged if RESOLVE_HEDGE and kind in HEDGED_KINDS else YoutubeService._fetch_info
         start_time = time.monotonic()
         try:
-            with yt_dlp.YoutubeDL(YoutubeService.YDL_OPTIONS) as ytdl:
-                ytdl.cookiejar.load('./cookies.txt', ignore_discard=True, ignore_expires=True)
-                data = await loop.run_in_executor(
-                    None,
-                    lambda: ytdl.extract_info(url, download=False)
+            with tracer.span(f"ytdlp.{kind}"):
+                data = await with_deadline(
+                    get_resolver_cassette().ytdlp(kind, query, lambda: fetch(kind, query)),
+                    "ytdlp",
+                    kind,
                 )
-                elapsed_ms = (time.monotonic() - start_time) * 1000
-                log_event(f"ytdlp_resolve kind=url elapsed_ms={elapsed_ms:.1f}")
-                return dict_to_youtube_search(data)
-        except (yt_dlp.utils.ExtractorError, yt_dlp.utils.DownloadError):
+        except asyncio.CancelledError:
+            # hedge 에서 진 쪽, 플레이리스트/곡 목록 stream 의 aclose(), 정지 등으로 취소된 시험 요청은
+            # 결과를 남기지 않으므로 시험 자리를 돌려준다. 그대로 두면 probe_timeout 동안 모든 해석이 거절된다.
+            if probe:
+                resolve_breaker.release_probe()
+            raise
+        except Exception as exc:
+            RESOLVE_TOTAL.labels("ytdlp", kind, "timeout" if isinstance(exc, ResolveTimeout) else "error").inc()
+            if isinstance(exc, _ytdlp_errors()) and is_unresolvable_error(exc):
+                # 연령 제한, 지역 차단, 비공개 영상 등 그 검색어만의 실패. 업스트림은 응답하고 있다.
+                resolve_breaker.record_success()
+                if kind not in UNCACHED_NEGATIVE_KINDS:
+                    negative_cache.add(key)
+            else:
+                # 요청 제한, 시간 초과, 5xx, URL 오류 등은 업스트림 실패로 센다.
+                resolve_breaker.record_failure()
+            raise
+        resolve_breaker.record_success()
+        RESOLVE_SECONDS.labels("ytdlp", kind).observe(time.monotonic() - start_time)
+        RESOLVE_TOTAL.labels("ytdlp", kind, "ok" if data is not None else "empty").inc()
+        if kind not in UNCACHED_NEGATIVE_KINDS and (
+            data is None or (kind in ("search", "playlist") and not data.get("entries"))
+        ):
+            negative_cache.add(key)
+        return data
+
+    @staticmethod
+    async def url_search(url: str) -> Optional[YoutubeSearch]:
+        start_time = time.monotonic()
+        try:
+            data = await YoutubeService._extract_info("url", url)
+            if data is None:
+                return None
+            elapsed_ms = (time.monotonic() - start_time) * 1000
+            logger.info("ytdlp_resolve", kind="url", elapsed_ms=round(elapsed_ms, 1))
+            return dict_to_youtube_search(data)
+        except _ytdlp_errors():
             return None
 
 
+    @staticmethod
+    async def refresh_stream(search: YoutubeSearch) -> bool:
+        """영상 하나의 스트림 URL 만 다시 해석해 track_table 에 반영합니다. 메타데이터 객체는 그대로 둔다."""
+        try:
+            data = await YoutubeService._extract_info("stream", search.video_url)
+        except _ytdlp_errors():
+            return False
+        if not data or not data.get("url"):
+            return False
+        track_table.refresh_stream(search.video_id, data["url"])
+        return True
+
     @staticmethod
     async def title_search(title: str) -> Optional[YoutubeSearch]:
-        loop = asyncio.get_event_loop()
         start_time = time.monotonic()
         try:
-            with yt_dlp.YoutubeDL(YoutubeService.YDL_OPTIONS) as ytdl:
-                ytdl.cookiejar.load('./cookies.txt', ignore_discard=True, ignore_expires=True)
-                data = await loop.run_in_executor(
-                    None,
-                    lambda: ytdl.extract_info(f"ytsearch:{title}", download=False)
-                )
-                elapsed_ms = (time.monotonic() - start_time) * 1000
-                log_event(f"ytdlp_resolve kind=search elapsed_ms={elapsed_ms:.1f}")
-                return dict_to_youtube_search(data['entries'][0])
-        except (yt_dlp.utils.ExtractorError, yt_dlp.utils.DownloadError):
+            data = await YoutubeService._extract_info("search", f"ytsearch:{title}")
+            if data is None or not data.get('entries'):
+                return None
+            elapsed_ms = (time.monotonic() - start_time) * 1000
+            logger.info("ytdlp_resolve", kind="search", elapsed_ms=round(elapsed_ms, 1))
+            return dict_to_youtube_search(data['entries'][0])
+        except _ytdlp_errors():
             return None
 
     @staticmethod
-    async def playlist_search(playlist_url: str) -> Optional[YoutubePlaylist]:
-        loop = asyncio.get_event_loop()
+    async def playlist_entries(playlist_url: str) -> Optional[Tuple[str, List[dict]]]:
+        """
+        플레이리스트의 제목과 항목 목록만 가져옵니다. 항목은 아직 스트림 URL 이 없는 flat entry 이며
+        playlist_stream 으로 해석한다. 재생할 수 없는 항목은 여기서 거른다.
+        """
+        start_time = time.monotonic()
         try:
-            with yt_dlp.YoutubeDL(YoutubeService.YDL_OPTIONS) as ytdl:
-                ytdl.cookiejar.load('./cookies.txt', ignore_discard=True, ignore_expires=True)
-                data = await loop.run_in_executor(
-                    None,
-                    lambda: ytdl.extract_info(playlist_url, download=False)
-                )
-                # 곡 리스트 추출
-                if 'entries' in data:
-                    songs = data['entries']
-                    mapping_songs = []
-                    # 각 곡 정보 출력
-                    for i in songs:
-                        song = dict_to_youtube_search(i)
-
-                        if song is not None:
-                            mapping_songs.append(song)
-
-                    if len(mapping_songs) == 0:
-                        return None
-
-                    elapsed_ms = (time.monotonic() - start_time) * 1000
-                    log_event(f"ytdlp_resolve kind=playlist elapsed_ms={elapsed_ms:.1f}")
-                    return YoutubePlaylist(
-                        title=data.get('title', '알 수 없음'),
-                        song_cnt=len(mapping_songs),
-                        songs=mapping_songs
-                    )
-                return None
-        except (yt_dlp.utils.ExtractorError, yt_dlp.utils.DownloadError):
+            data = await YoutubeService._extract_info("playlist", playlist_url)
+        except _ytdlp_errors():
+            return None
+        if data is None or not data.get('entries'):
+            return None
+        entries = [
+            entry for entry in data['entries']
+            if entry and entry.get('title') not in UNAVAILABLE_ENTRY_TITLES
+        ]
+        if not entries:
             return None
+        elapsed_ms = (time.monotonic() - start_time) * 1000
+        logger.info("ytdlp_resolve", kind="playlist", elapsed_ms=round(elapsed_ms, 1), entries=len(entries))
+        return data.get('title', '알 수 없음'), entries
 
+    @staticmethod
+    async def entry_search(entry: dict) -> Optional[YoutubeSearch]:
+        """
+        flat entry 하나를 곡으로 해석합니다. 이미 해석된 항목(flat 목록을 주지 않는 추출기,
+        예전에 녹음한 카세트)은 그대로 매핑한다. 그 항목만의 실패와 마감 시간 초과는 None 이다.
+        """
+        if entry.get('_type') not in ("url", "url_transparent"):
+            return dict_to_youtube_search(entry)
+        url = entry.get('url') or f"https://www.youtube.com/watch?v={entry.get('id')}"
+        try:
+            data = await YoutubeService._extract_info("playlist_entry", url)
+        except (ResolveTimeout, *_ytdlp_errors()):
+            PLAYLIST_ENTRIES_TOTAL.labels("failed").inc()
+            return None
+        song = dict_to_youtube_search(data) if data is not None else None
+        PLAYLIST_ENTRIES_TOTAL.labels("ok" if song is not None else "failed").inc()
+        return song
+
+    @staticmethod
+    def playlist_stream(
+        entries: List[dict],
+        *,
+        workers: int,
+        slot: Optional[Callable[[], AbstractAsyncContextManager]] = None,
+    ) -> AsyncIterator[Optional[YoutubeSearch]]:
+        """
+        항목을 workers 개씩 동시에 해석해 플레이리스트 순서대로 내보냅니다. 실패한 항목 자리에는 None 이 온다.
+        slot 이 있으면 항목마다 그 안에서 해석한다 (검색 스케줄러의 길드 슬롯).
+        ResolveCircuitOpen 은 그대로 올라오며 남은 항목은 취소된다.
+        """
+        async def resolve(entry: dict) -> Optional[YoutubeSearch]:
+            if slot is None:
+                return await YoutubeService.entry_search(entry)
+            async with slot():
+                return await YoutubeService.entry_search(entry)
+
+        return resolve_in_order(entries, resolve, workers=workers)
+
+    @staticmethod
+    async def playlist_search(playlist_url: str) -> Optional[YoutubePlaylist]:
+        from core.config import PLAYLIST_RESOLVE_WORKERS
+
+        listing = await YoutubeService.playlist_entries(playlist_url)
+        if listing is None:
+            return None
+        title, entries = listing
+        stream = YoutubeService.playlist_stream(entries, workers=PLAYLIST_RESOLVE_WORKERS)
+        try:
+            mapping_songs = [song async for song in stream if song is not None]
+        finally:
+            await stream.aclose()
+        if len(mapping_songs) == 0:
+            return None
+        return YoutubePlaylist(
+            title=title,
+            song_cnt=len(mapping_songs),
+            songs=mapping_songs
+        )
 
 if __name__ == "__main__":
     async def main():
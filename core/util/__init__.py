@@ -1,3 +1,6 @@
 from .log_util import log_event
+from .sharding import parse_shard_ids, shard_id_for
+from .structured_log import StructuredLogger, logger
+from .track_list import parse_track_list
 
-__all__ = ["log_event"]
+__all__ = ["log_event", "logger", "StructuredLogger", "parse_shard_ids", "shard_id_for", "parse_track_list"]
\ No newline at end of file
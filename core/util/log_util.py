@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-from datetime import datetime
 import sys
 from typing import Any, Optional
 
+from .structured_log import INFO, logger
+
 
 def log_event(user_input: Optional[Any]) -> None:
-    timestamp = datetime.now().isoformat(timespec="seconds")
+    """
+    기존 호출부용 호환 함수입니다. 호출한 함수 이름을 event 로 기록하므로
+    LOG_SAMPLE_RATES 에 함수 이름을 적어 샘플링할 수 있습니다.
+    메시지 문자열 변환은 writer 스레드에서 일어납니다.
+    """
     func_name = sys._getframe(1).f_code.co_name
-    log_input = "-" if user_input is None else str(user_input)
-    print(f"{timestamp} [{func_name}] : {log_input}")
\ No newline at end of file
+    logger.log(INFO, func_name, {"msg": user_input}, func_name)
\ No newline at end of file
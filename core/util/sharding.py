@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+
+def shard_id_for(guild_id: int, shard_count: int) -> int:
+    """Discord 가 길드를 샤드에 배정하는 규칙과 같습니다: (guild_id >> 22) % shard_count"""
+    if shard_count <= 1:
+        return 0
+    return (guild_id >> 22) % shard_count
+
+
+def parse_shard_ids(spec: str) -> Optional[List[int]]:
+    """"0-3" 또는 "0,2,4-5" 형식을 샤드 id 목록으로 바꿉니다. 비어 있으면 None (전체)."""
+    ids: List[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        ids.extend(range(int(start), int(end or start) + 1))
+    return sorted(set(ids)) or None
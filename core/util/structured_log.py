@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import atexit
+import json
+import random
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Mapping, Optional, TextIO, Tuple
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARNING: "warning", ERROR: "error"}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+# (timestamp, level, event, caller, fields)
+LogRecord = Tuple[float, int, str, Optional[str], Mapping[str, Any]]
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """"control=0.1,lavalink_search=0.5" 형식을 {event: rate} 로 바꿉니다."""
+    rates: Dict[str, float] = {}
+    for part in spec.split(","):
+        event, _, rate = part.partition("=")
+        if event.strip() and rate.strip():
+            rates[event.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+class StructuredLogger:
+    """
+    JSON lines 로그를 백그라운드 스레드에서 씁니다.
+    호출 스레드(이벤트 루프)는 레벨/샘플링 검사 후 튜플 하나를 큐에 넣기만 하고,
+    문자열 변환과 json 직렬화, 출력은 모두 writer 스레드에서 합니다.
+    필드 값으로 인자 없는 callable 을 넘기면 실제로 기록될 때만 호출됩니다.
+    """
+
+    def __init__(
+        self,
+        *,
+        level: int = INFO,
+        sample_rates: Optional[Mapping[str, float]] = None,
+        stream: Optional[TextIO] = None,
+        path: Optional[str] = None,
+        max_queue: int = 100_000,
+        batch_size: int = 512,
+        flush_interval: float = 0.1,
+    ) -> None:
+        self.level = level
+        self.sample_rates: Dict[str, float] = dict(sample_rates or {})
+        self.path = path
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._stream = stream
+        # deque.append 는 락 없이 원자적이라 호출 스레드 비용이 가장 작다.
+        self._buffer: Deque[LogRecord] = deque()
+        self._wakeup = threading.Event()
+        self._enqueued = 0
+        self._written = 0
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    def is_enabled(self, level: int, event: str) -> bool:
+        if level < self.level:
+            return False
+        rate = self.sample_rates.get(event)
+        return rate is None or random.random() < rate
+
+    def log(self, level: int, event: str, fields: Mapping[str, Any], caller: Optional[str] = None) -> None:
+        if level < self.level:
+            return
+        rate = self.sample_rates.get(event)
+        if rate is not None and random.random() >= rate:
+            return
+        if self._thread is None:
+            self._start()
+        buffer = self._buffer
+        if len(buffer) >= self.max_queue:
+            # 출력이 밀리면 이벤트 루프를 막는 대신 버린다.
+            self.dropped += 1
+            return
+        buffer.append((time.time(), level, event, caller, fields))
+        self._enqueued += 1
+        # writer 는 flush_interval 마다 깨어나므로 배치가 찼을 때만 깨운다.
+        if len(buffer) == self.batch_size:
+            self._wakeup.set()
+
+    def debug(self, event: str, **fields: Any) -> None:
+        self.log(DEBUG, event, fields)
+
+    def info(self, event: str, **fields: Any) -> None:
+        self.log(INFO, event, fields)
+
+    def warning(self, event: str, **fields: Any) -> None:
+        self.log(WARNING, event, fields)
+
+    def error(self, event: str, **fields: Any) -> None:
+        self.log(ERROR, event, fields)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """지금까지 넣은 레코드가 쓰일 때까지 기다립니다. 이벤트 루프에서는 호출하지 마세요."""
+        if self._thread is None:
+            return
+        target = self._enqueued
+        deadline = time.monotonic() + timeout
+        while self._written < target and time.monotonic() < deadline:
+            self._wakeup.set()
+            time.sleep(0.001)
+
+    def _start(self) -> None:
+        with self._thread_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name="structured-log-writer", daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def _open_stream(self) -> TextIO:
+        if self._stream is not None:
+            return self._stream
+        if self.path:
+            self._stream = open(self.path, "a", encoding="utf-8", buffering=1 << 16)
+            return self._stream
+        # 벤치마크의 redirect_stdout 을 따르도록 쓰는 시점의 sys.stdout 을 사용한다.
+        return sys.stdout
+
+    def _run(self) -> None:
+        buffer = self._buffer
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            while buffer:
+                batch = []
+                while buffer and len(batch) < self.batch_size:
+                    batch.append(buffer.popleft())
+                try:
+                    stream = self._open_stream()
+                    stream.write("".join([self.format(record) for record in batch]))
+                    stream.flush()
+                except Exception as exc:
+                    sys.stderr.write(f"structured log write failed size={len(batch)}: {exc}\n")
+                self._written += len(batch)
+
+    @staticmethod
+    def format(record: LogRecord) -> str:
+        timestamp, level, event, caller, fields = record
+        payload: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(timestamp).isoformat(timespec="milliseconds"),
+            "level": LEVEL_NAMES.get(level, str(level)),
+            "event": event,
+        }
+        if caller:
+            payload["func"] = caller
+        for key, value in fields.items():
+            if callable(value):
+                try:
+                    value = value()
+                except Exception as exc:
+                    value = f"<lazy field failed: {exc}>"
+            payload[key] = value
+        return json.dumps(payload, ensure_ascii=False, default=str) + "\n"
+
+
+def _create_logger() -> StructuredLogger:
+    from core.config import LOG_FILE, LOG_LEVEL, LOG_SAMPLE_RATES
+
+    return StructuredLogger(
+        level=LEVELS.get(LOG_LEVEL, INFO),
+        sample_rates=parse_sample_rates(LOG_SAMPLE_RATES),
+        path=LOG_FILE or None,
+    )
+
+
+logger = _create_logger()
+atexit.register(logger.flush)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import csv
+import re
+from typing import List
+
+# 붙여 넣은 목록의 앞머리 ("1. ", "2) ", "- ", "• ")
+_BULLET = re.compile(r"^(?:[-*•]|\d+[.)])\s+")
+# CSV 첫 줄이 이 이름들로만 되어 있으면 머리글로 보고 건너뛴다.
+_HEADER_NAMES = {"url", "link", "links", "title", "query", "song", "songs", "artist", "제목", "링크", "곡", "가수"}
+
+
+def _clean(line: str) -> str:
+    line = _BULLET.sub("", line.strip())
+    # Discord 미리보기를 막으려고 <https://...> 로 감싼 링크
+    if line.startswith("<") and line.endswith(">"):
+        line = line[1:-1]
+    return line.strip()
+
+
+def _is_url(text: str) -> bool:
+    return text.startswith(("http://", "https://"))
+
+
+def parse_track_list(text: str, *, csv_format: bool = False) -> List[str]:
+    """
+    한 줄에 하나씩 적힌 링크/검색어 목록을 검색어 리스트로 바꿉니다. 빈 줄과 # 주석은 건너뛴다.
+    csv_format 이면 줄마다 링크가 있는 칸을, 없으면 채워진 칸을 이어 붙인 것을 쓴다 ("제목,가수" → "제목 가수").
+    """
+    lines = [line for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+    if not csv_format:
+        return [query for query in map(_clean, lines) if query]
+
+    queries: List[str] = []
+    for index, row in enumerate(csv.reader(lines)):
+        cells = [_clean(cell) for cell in row if cell.strip()]
+        if not cells:
+            continue
+        if index == 0 and all(cell.lower() in _HEADER_NAMES for cell in cells):
+            continue
+        url = next((cell for cell in cells if _is_url(cell)), None)
+        queries.append(url or " ".join(cells))
+    return queries
@@ -0,0 +1,13 @@
+import asyncio
+
+from dotenv import load_dotenv
+
+# core.config 는 import 시점에 환경변수를 읽으므로 core 보다 먼저 .env 를 불러온다.
+load_dotenv()
+
+from core.network.resolver_sidecar import main
+
+try:
+    asyncio.run(main())
+except KeyboardInterrupt:
+    pass
@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+
+from core.network.resolve_scheduler import BULK, INTERACTIVE, ResolveQueueFull, ResolveScheduler
+
+
+class ResolveSchedulerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_free_slot_is_granted_while_other_guild_waits(self):
+        scheduler = ResolveScheduler(4, guild_concurrency=2, guild_queue=5)
+        # 길드 A 가 길드별 상한(2)을 채우고 하나를 더 기다린다.
+        await scheduler.acquire(1)
+        await scheduler.acquire(1)
+        waiting_a = asyncio.ensure_future(scheduler.acquire(1))
+        await asyncio.sleep(0)
+        self.assertFalse(waiting_a.done())
+
+        # 전역 슬롯이 2개 남아 있으므로 길드 B 는 기다리지 않는다.
+        await asyncio.wait_for(scheduler.acquire(2), 0.1)
+        self.assertEqual(scheduler.active, 3)
+        self.assertEqual(scheduler.waiting, 1)
+
+        scheduler.release(1)
+        await asyncio.wait_for(waiting_a, 0.1)
+        self.assertEqual(scheduler.waiting, 0)
+
+    async def test_guild_queue_limit(self):
+        scheduler = ResolveScheduler(1, guild_concurrency=1, guild_queue=1)
+        await scheduler.acquire(1)
+        waiter = asyncio.ensure_future(scheduler.acquire(1))
+        await asyncio.sleep(0)
+        with self.assertRaises(ResolveQueueFull):
+            await scheduler.acquire(1)
+        # 재생 직전 재해석처럼 거절하면 안 되는 요청은 상한과 상관없이 줄을 선다.
+        unlimited = asyncio.ensure_future(scheduler.acquire(1, limit_queue=False))
+        await asyncio.sleep(0)
+        self.assertEqual(scheduler.waiting, 2)
+        scheduler.release(1)
+        await asyncio.wait_for(waiter, 0.1)
+        scheduler.release(1)
+        await asyncio.wait_for(unlimited, 0.1)
+
+    async def test_unlimited_waiters_do_not_fill_guild_queue(self):
+        scheduler = ResolveScheduler(1, guild_concurrency=1, guild_queue=1)
+        await scheduler.acquire(1)
+        # 플레이리스트 worker 처럼 상한 없이 줄 선 대기자는 그 길드의 검색 자리를 차지하지 않는다.
+        bulk = [asyncio.ensure_future(scheduler.acquire(1, BULK, limit_queue=False)) for _ in range(3)]
+        await asyncio.sleep(0)
+        interactive = asyncio.ensure_future(scheduler.acquire(1))
+        await asyncio.sleep(0)
+        self.assertEqual(scheduler.waiting, 4)
+        with self.assertRaises(ResolveQueueFull):
+            await scheduler.acquire(1)
+
+        scheduler.release(1)
+        await asyncio.wait_for(interactive, 0.1)
+        for waiter in bulk:
+            self.assertFalse(waiter.done())
+            scheduler.release(1)
+            await asyncio.wait_for(waiter, 0.1)
+        self.assertEqual(scheduler.waiting, 0)
+
+    async def test_interactive_before_bulk(self):
+        scheduler = ResolveScheduler(1, guild_concurrency=1, guild_queue=5)
+        await scheduler.acquire(1)
+        order = []
+
+        async def request(guild_id: int, priority: int) -> None:
+            await scheduler.acquire(guild_id, priority)
+            order.append(priority)
+            scheduler.release(guild_id)
+
+        tasks = [asyncio.ensure_future(request(2, BULK)), asyncio.ensure_future(request(3, INTERACTIVE))]
+        await asyncio.sleep(0)
+        scheduler.release(1)
+        await asyncio.wait_for(asyncio.gather(*tasks), 0.1)
+        self.assertEqual(order, [INTERACTIVE, BULK])
+
+
+if __name__ == "__main__":
+    unittest.main()
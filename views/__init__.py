@@ -1 +1 @@
-from .music_view import get_music_view
\ No newline at end of file
+from .music_view import get_music_view, register_music_views
\ No newline at end of file
@@ -1,15 +1,52 @@
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
 import discord
 
+MusicViewHandler = Callable[[discord.Interaction, str], Awaitable[None]]
+
+
+class MusicControlButton(discord.ui.Button):
+    async def callback(self, interaction: discord.Interaction) -> None:
+        view = self.view
+        if isinstance(view, MusicView) and view.handler is not None:
+            await view.handler(interaction, self.custom_id)
+
+
+class MusicView(discord.ui.View):
+    def __init__(self, is_paused: bool = False, loop_enabled: bool = False) -> None:
+        # timeout=None + 고정 custom_id 로 재시작 후에도 버튼이 동작하는 persistent view
+        super().__init__(timeout=None)
+        self.handler: Optional[MusicViewHandler] = None
+        self.add_item(MusicControlButton(label="⏹️ 정지", style=discord.ButtonStyle.red, custom_id="stop"))
+        if is_paused:
+            self.add_item(MusicControlButton(label="▶️ 재개", style=discord.ButtonStyle.blurple, custom_id="resume"))
+        else:
+            self.add_item(MusicControlButton(label="⏸️ 일시정지", style=discord.ButtonStyle.blurple, custom_id="pause"))
+        self.add_item(MusicControlButton(label="⏭️ 스킵", style=discord.ButtonStyle.green, custom_id="skip"))
+        loop_style = discord.ButtonStyle.green if loop_enabled else discord.ButtonStyle.gray
+        self.add_item(MusicControlButton(label="🔁 반복", style=loop_style, custom_id="loop"))
+        self.add_item(MusicControlButton(label="🔀 셔플", style=discord.ButtonStyle.gray, custom_id="shuffle"))
+
+
+# Key: (is_paused, loop_enabled), 프로세스당 한 번만 생성해 cog reload 후에도 재사용한다.
+_music_views: Dict[Tuple[bool, bool], MusicView] = {}
+
+
+def _get_music_views() -> Dict[Tuple[bool, bool], MusicView]:
+    if not _music_views:
+        for is_paused in (False, True):
+            for loop_enabled in (False, True):
+                _music_views[(is_paused, loop_enabled)] = MusicView(is_paused, loop_enabled)
+    return _music_views
+
+
+def register_music_views(bot: discord.Client, handler: MusicViewHandler) -> None:
+    registered = bot.persistent_views
+    for view in _get_music_views().values():
+        view.handler = handler
+        if view not in registered:
+            bot.add_view(view)
+
 
 def get_music_view(is_paused: bool = False, loop_enabled: bool = False) -> discord.ui.View:
-    view = discord.ui.View()
-    view.add_item(discord.ui.Button(label="⏹️ 정지", style=discord.ButtonStyle.red, custom_id="stop"))
-    if is_paused:
-        view.add_item(discord.ui.Button(label="▶️ 재개", style=discord.ButtonStyle.blurple, custom_id="resume"))
-    else:
-        view.add_item(discord.ui.Button(label="⏸️ 일시정지", style=discord.ButtonStyle.blurple, custom_id="pause"))
-    view.add_item(discord.ui.Button(label="⏭️ 스킵", style=discord.ButtonStyle.green, custom_id="skip"))
-    loop_style = discord.ButtonStyle.green if loop_enabled else discord.ButtonStyle.gray
-    view.add_item(discord.ui.Button(label="🔁 반복", style=loop_style, custom_id="loop"))
-    view.add_item(discord.ui.Button(label="🔀 셔플", style=discord.ButtonStyle.gray, custom_id="shuffle"))
-    return view
+    return _get_music_views()[(is_paused, loop_enabled)]